@@ -0,0 +1,182 @@
+"""
+Asset Cache
+Imaginile din assets/ decodate o singură dată: varianta folosită de filtre (BGRA
+premultiplicat, opțional deja scalată pentru rezoluția de ieșire) se scrie în
+assets/.cache ca .npy și se citește cu memory map la pornirile următoare, fără
+cv2.imread / resize. O intrare e invalidată când fișierul sursă se schimbă (mtime și
+mărime, apoi hash-ul conținutului). În proces, toți consumatorii aceleiași variante
+primesc același buffer (read-only).
+"""
+import hashlib
+import json
+import os
+import threading
+
+import cv2
+import numpy as np
+
+from core.FilterPlugin import ASSETS_DIR
+
+
+def _sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def premultiply(image):
+    """BGRA (sau BGR, considerat opac) -> BGRA cu culorile înmulțite cu alpha."""
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGRA)
+    elif image.shape[2] == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
+    alpha = cv2.cvtColor(image[:, :, 3], cv2.COLOR_GRAY2BGR)
+    result = image.copy()
+    result[:, :, :3] = cv2.multiply(image[:, :, :3], alpha, scale=1 / 255)
+    return result
+
+
+def fit_size(width, height, max_width, max_height):
+    """Dimensiunea micșorată (niciodată mărită) care încape în max_width x max_height, cu același aspect."""
+    scale = min(1.0, max_width / width, max_height / height)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+class AssetCache:
+    def __init__(self, assets_dir=ASSETS_DIR, cache_dir=None):
+        """
+        Args:
+            assets_dir (str): Directorul față de care se rezolvă numele relative
+            cache_dir (str): Unde se scriu variantele .npy; implicit assets_dir/.cache.
+                             Dacă nu se poate scrie, variantele rămân doar în memorie
+        """
+        self.assets_dir = assets_dir
+        self.cache_dir = cache_dir or os.path.join(assets_dir, ".cache")
+        self._arrays = {}   # cheie -> array (memmap read-only), comun tuturor consumatorilor
+        self._lock = threading.Lock()  # Filtrele se încarcă pe thread-uri din background
+        self.builds_total = 0       # Variante calculate din sursă (decode + premultiplicare + resize)
+        self.disk_loads_total = 0   # Variante citite din .npy
+
+    def path(self, name):
+        return os.path.join(self.assets_dir, name)
+
+    def image(self, name, fit=None):
+        """
+        O imagine BGRA premultiplicată.
+
+        Args:
+            name (str): Fișier din assets/ (sau cale absolută)
+            fit (tuple): (lățime, înălțime) maximă; imaginea se micșorează (INTER_AREA) să încapă
+
+        Returns:
+            np.ndarray: (h, w, 4) uint8, read-only
+        """
+        key = "premultiplied" if fit is None else f"premultiplied-fit{fit[0]}x{fit[1]}"
+
+        def build():
+            image = cv2.imread(self.path(name), cv2.IMREAD_UNCHANGED)
+            if image is None:
+                raise FileNotFoundError(f"Nu am putut încărca imaginea din: {self.path(name)}")
+            image = premultiply(image)
+            if fit is not None:
+                size = fit_size(image.shape[1], image.shape[0], *fit)
+                if size != (image.shape[1], image.shape[0]):
+                    image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+            return image
+
+        return self.derived(f"{os.path.splitext(os.path.basename(name))[0]}-{key}", [name], build)
+
+    def derived(self, key, names, build):
+        """
+        Un array calculat din fișierele `names`, păstrat în memorie și pe disc.
+
+        Args:
+            key (str): Numele variantei (unic împreună cu căile surselor)
+            names (list): Fișierele sursă care o invalidează
+            build: Funcție fără argumente care calculează array-ul
+
+        Returns:
+            np.ndarray: Read-only; același obiect pentru toți cei care cer aceeași variantă
+        """
+        paths = [os.path.abspath(self.path(name)) for name in names]
+        key = f"{key}-{hashlib.sha1(chr(0).join(paths).encode()).hexdigest()[:10]}"
+        with self._lock:
+            array = self._arrays.get(key)
+            if array is None:
+                array = self._load(key, paths)
+                if array is None:
+                    array = build()
+                    self.builds_total += 1
+                    array = self._store(key, paths, array)
+                array.flags.writeable = False
+                self._arrays[key] = array
+            return array
+
+    def _load(self, key, paths):
+        """Varianta de pe disc, dacă sursele n-au fost modificate; altfel None."""
+        npy = os.path.join(self.cache_dir, key + ".npy")
+        index = os.path.join(self.cache_dir, key + ".json")
+        try:
+            with open(index, encoding="utf-8") as f:
+                sources = json.load(f)["sources"]
+            if [source["path"] for source in sources] != paths:
+                return None
+            touched = False
+            for source in sources:
+                stat = os.stat(source["path"])
+                if stat.st_mtime_ns == source["mtime_ns"] and stat.st_size == source["size"]:
+                    continue
+                # Doar atinsă (copiată, checkout): conținutul identic păstrează varianta
+                if _sha1(source["path"]) != source["sha1"]:
+                    return None
+                source["mtime_ns"], source["size"] = stat.st_mtime_ns, stat.st_size
+                touched = True
+            array = np.load(npy, mmap_mode="r")
+        except (OSError, ValueError, KeyError):
+            return None
+        if touched:
+            self._write_index(index, sources)
+        self.disk_loads_total += 1
+        return array
+
+    def _store(self, key, paths, array):
+        """Scrie varianta și indexul surselor; returnează memmap-ul scris (sau array-ul, fără disc)."""
+        npy = os.path.join(self.cache_dir, key + ".npy")
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            sources = []
+            for path in paths:
+                stat = os.stat(path)
+                sources.append({"path": path, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                                "sha1": _sha1(path)})
+            temporary = f"{npy}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(temporary, npy)
+            self._write_index(os.path.join(self.cache_dir, key + ".json"), sources)
+            return np.load(npy, mmap_mode="r")
+        except OSError as e:
+            print(f"⚠️ Asset cache not written ({e}); keeping {key} in memory only")
+            return array
+
+    @staticmethod
+    def _write_index(path, sources):
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"sources": sources}, f)
+        os.replace(temporary, path)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_asset_cache():
+    """AssetCache-ul comun al procesului (assets/ și assets/.cache)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = AssetCache()
+        return _default
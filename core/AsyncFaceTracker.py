@@ -0,0 +1,157 @@
+"""
+Async Face Tracker
+FaceTracker cu inferența pe un thread separat: bucla de randare trimite fiecare frame
+și primește imediat cel mai recent rezultat disponibil, fără să aștepte modelul.
+Worker-ul procesează mereu cel mai nou frame (cele nepreluate la timp sunt înlocuite),
+deci FPS-ul de randare urmează camera chiar dacă inferența merge doar la 20-30 Hz.
+Rezultatul e etichetat cu frame-ul din care provine (result_index) și vârsta lui în
+frame-uri (result_age); opțional, landmark-urile sunt extrapolate liniar cu vârsta.
+"""
+import threading
+import time
+import traceback
+
+import numpy as np
+
+from core.FaceTracker import FaceTracker
+from core.LandmarkReplay import ReplayFaceLandmarks, ReplayResults, landmarks_array
+
+
+class AsyncFaceTracker(FaceTracker):
+    def __init__(self, face_mesh, extrapolate=False, max_extrapolation=3, **kwargs):
+        """
+        Args:
+            face_mesh: Obiect cu process(rgb) -> results (FaceMesh MediaPipe sau replay)
+            extrapolate (bool): Mută landmark-urile cu viteza dintre ultimele două inferențe,
+                                proporțional cu vârsta rezultatului
+            max_extrapolation (int): Câte frame-uri se extrapolează cel mult (peste atât
+                                     mișcarea e mai degrabă zgomot decât predicție)
+            **kwargs: inference_scale, skip_frames, motion_threshold, motion_max_age (FaceTracker)
+        """
+        super().__init__(face_mesh, **kwargs)
+        self.extrapolate = extrapolate
+        self.max_extrapolation = max_extrapolation
+
+        self._cond = threading.Condition()
+        self._pending = None        # (buffer, frame_index, epoch): ultimul frame netrimis modelului
+        self._free = []             # Buffere RGB refolosite (cel mult două: în lucru + în așteptare)
+        self._epoch = 0             # Crește la reset; rezultatele din epoca veche se ignoră
+        self._worker_epoch = 0
+        self._closed = False
+        self._history = []          # Ultimele două (frame_index, landmarks_array) pentru extrapolare
+        self._front_index = None
+        self._next_index = 0
+
+        self.latest = None          # Cel mai recent rezultat al modelului
+        self.result_index = None    # Frame-ul din care provine self.latest
+        self.result_age = 0         # Frame-uri între self.latest și frame-ul randat acum
+        self.result_time = None     # perf_counter() la care s-a terminat inferența
+        self.dropped_total = 0      # Frame-uri înlocuite înainte să ajungă la model
+
+        self._worker = threading.Thread(target=self._run, name="landmarks", daemon=True)
+        self._worker.start()
+
+    def process(self, rgb_frame, frame_index=None):
+        """
+        Trimite frame-ul worker-ului și returnează imediat cel mai recent rezultat.
+
+        Args:
+            rgb_frame: Imaginea RGB (copiată; bufferul apelantului poate fi refolosit imediat)
+            frame_index (int): Numărul frame-ului; un salt înseamnă că tracker-ul a stat
+                               nefolosit, iar rezultatele vechi nu mai descriu fața
+
+        Returns:
+            results-ul FaceMesh (sau extrapolat), None până la prima inferență
+        """
+        if frame_index is None:
+            frame_index = self._next_index
+        self._next_index = frame_index + 1
+
+        with self._cond:
+            if self._front_index is not None and frame_index != self._front_index + 1:
+                self._reset()
+            self._front_index = frame_index
+
+            if self._pending is not None:
+                buffer = self._pending[0]
+                self.dropped_total += 1
+            else:
+                buffer = self._free.pop() if self._free else None
+            if buffer is None or buffer.shape != rgb_frame.shape:
+                buffer = np.empty_like(rgb_frame)
+            np.copyto(buffer, rgb_frame)
+            self._pending = (buffer, frame_index, self._epoch)
+            self._cond.notify()
+
+            results, result_index, history = self.latest, self.result_index, self._history
+
+        if result_index is None:
+            self.result_age = 0
+            return None
+        self.result_age = frame_index - result_index
+        if self.extrapolate and self.result_age > 0 and len(history) == 2:
+            return self._extrapolated(history, frame_index) or results
+        return results
+
+    def _extrapolated(self, history, frame_index):
+        (index0, points0), (index1, points1) = history
+        if points0 is None or points1 is None or points0.shape != points1.shape or index1 <= index0:
+            return None
+        velocity = (points1 - points0) / (index1 - index0)
+        ahead = min(frame_index - index1, self.max_extrapolation)
+        points = points1 + velocity * ahead
+        return ReplayResults([ReplayFaceLandmarks(face) for face in points])
+
+    def _reset(self):
+        """Apelat cu lock-ul luat: uită rezultatele și frame-ul în așteptare."""
+        self._epoch += 1
+        if self._pending is not None:
+            self._free.append(self._pending[0])
+            self._pending = None
+        self.latest = None
+        self.result_index = None
+        self._history = []
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                buffer, frame_index, epoch = self._pending
+                self._pending = None
+
+            if epoch != self._worker_epoch:
+                # După o pauză rezultatul refolosit, referința MotionGate și crop-ul feței sunt vechi
+                self.last_results = None
+                self.motion_gate.reset()
+                self.roi = None
+                self._worker_epoch = epoch
+
+            # Skip-ul de calitate, MotionGate și inferența micșorată rulează aici, pe worker;
+            # frame_index nu se dă mai departe: frame-urile înlocuite nu înseamnă o pauză
+            try:
+                results = FaceTracker.process(self, buffer)
+                points = landmarks_array(results) if self.extrapolate else None
+            except Exception:
+                # Worker-ul nu trebuie să moară în tăcere: randarea ar rămâne fără landmarks
+                print("⚠️ Landmark inference failed:")
+                traceback.print_exc()
+                results, points = None, None
+
+            with self._cond:
+                self._free.append(buffer)
+                if epoch != self._epoch:
+                    continue  # Tracker-ul a fost resetat cât rula inferența
+                self.latest = results
+                self.result_index = frame_index
+                self.result_time = time.perf_counter()
+                self._history = (self._history + [(frame_index, points)])[-2:]
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._worker.join(timeout=1.0)
+        super().close()
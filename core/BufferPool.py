@@ -0,0 +1,53 @@
+"""
+Buffer Pool
+Buffere numpy refolosite, grupate după (shape, dtype). În regim stabil fiecare frame
+ia și eliberează aceleași buffere, deci nu mai există alocări mari per frame.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+
+class BufferPool:
+    def __init__(self, max_free_bytes=256 * 1024 * 1024):
+        """
+        Args:
+            max_free_bytes (int): Cât pot ocupa bufferele libere; peste limită se renunță
+                                  la cele nefolosite de cel mai mult timp (ex. ROI-uri vechi)
+        """
+        self.max_free_bytes = max_free_bytes
+        self._free = OrderedDict()  # (shape, dtype) -> [arrays], ordinea = ultima folosire
+        self.free_bytes = 0
+        self.allocations = 0
+        self.reuses = 0
+
+    def acquire(self, shape, dtype=np.uint8):
+        """Un buffer cu conținut nedefinit (ca np.empty); trebuie returnat cu release()."""
+        key = (tuple(shape), np.dtype(dtype).str)
+        free = self._free.get(key)
+        if free:
+            array = free.pop()
+            self.free_bytes -= array.nbytes
+            self.reuses += 1
+            return array
+        self.allocations += 1
+        return np.empty(shape, dtype=dtype)
+
+    def like(self, array):
+        return self.acquire(array.shape, array.dtype)
+
+    def release(self, array):
+        if array is None or not array.flags.owndata:
+            return  # View-urile nu se pun în pool: ar ține în viață array-ul părinte
+        key = (array.shape, array.dtype.str)
+        free = self._free.setdefault(key, [])
+        free.append(array)
+        self._free.move_to_end(key)
+        self.free_bytes += array.nbytes
+
+        while self.free_bytes > self.max_free_bytes and self._free:
+            _, oldest = next(iter(self._free.items()))
+            dropped = oldest.pop(0)
+            self.free_bytes -= dropped.nbytes
+            if not oldest:
+                self._free.popitem(last=False)
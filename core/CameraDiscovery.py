@@ -0,0 +1,133 @@
+"""
+Camera Discovery
+Listează camerele fără să le deschidă acolo unde sistemul permite, ține minte
+ultima cameră folosită (fingerprint după nume) și testează porturile în paralel,
+cu timeout, doar când nu există altă sursă de informație.
+"""
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+import cv2
+
+
+class CameraDiscovery:
+    def __init__(self, cache_path=".camera_cache.json"):
+        """
+        Args:
+            cache_path (str): Fișierul în care se salvează ultima cameră selectată
+        """
+        self.cache_path = cache_path
+
+    @staticmethod
+    def backend():
+        """Backend-ul OpenCV potrivit platformei (în loc de CAP_DSHOW peste tot)."""
+        if sys.platform == 'win32':
+            return cv2.CAP_DSHOW
+        if sys.platform == 'darwin':
+            return cv2.CAP_AVFOUNDATION
+        if sys.platform.startswith('linux'):
+            return cv2.CAP_V4L2
+        return cv2.CAP_ANY
+
+    def list_devices(self):
+        """
+        Returns:
+            dict: {index: name} obținut din API-urile sistemului, fără a deschide camerele
+        """
+        camera_list = {}
+
+        # --- WINDOWS LOGIC ---
+        if sys.platform == 'win32':
+            try:
+                from pygrabber.dshow_graph import FilterGraph
+                devices = FilterGraph().get_input_devices()
+                for i, name in enumerate(devices):
+                    camera_list[i] = name
+            except Exception: pass
+
+        # --- MACOS LOGIC ---
+        elif sys.platform == 'darwin':
+            try:
+                cmd = ["system_profiler", "SPCameraDataType"]
+                output = subprocess.check_output(cmd, timeout=5).decode('utf-8')
+                names = [line.strip().replace("Model ID: ", "") for line in output.split("\n") if "Model ID" in line or "Name" in line]
+                for i, name in enumerate(names[:5]):
+                    camera_list[i] = name.split(":")[-1].strip()
+            except Exception: pass
+
+        # --- LINUX LOGIC (sysfs, fără a deschide /dev/video*) ---
+        elif sys.platform.startswith('linux'):
+            for path in sorted(glob.glob("/sys/class/video4linux/video*")):
+                match = re.search(r"video(\d+)$", path)
+                if not match:
+                    continue
+                try:
+                    # Un device USB expune mai multe noduri; doar index 0 e stream-ul de captură
+                    with open(os.path.join(path, "index")) as f:
+                        if f.read().strip() != "0":
+                            continue
+                except OSError:
+                    pass
+                try:
+                    with open(os.path.join(path, "name")) as f:
+                        name = f.read().strip()
+                except OSError:
+                    name = f"Camera Device {match.group(1)}"
+                camera_list[int(match.group(1))] = name
+
+        return camera_list
+
+    def probe(self, indices=range(5), timeout=3.0):
+        """
+        Deschide porturile în paralel și returnează cele care răspund în `timeout` secunde.
+
+        Returns:
+            dict: {index: "Camera Device N"}
+        """
+        backend = self.backend()
+        found = {}
+
+        def try_open(index):
+            cap = cv2.VideoCapture(index, backend)
+            if cap.isOpened():
+                found[index] = f"Camera Device {index}"
+            cap.release()
+
+        # Thread-uri daemon: un device blocat nu ține procesul în viață la ieșire
+        threads = [threading.Thread(target=try_open, args=(i,), daemon=True) for i in indices]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+        return dict(sorted(list(found.items())))
+
+    def _fingerprint(self, name):
+        return f"{sys.platform}:{name}"
+
+    def cached_index(self, camera_list):
+        """Indexul curent al camerei salvate, dacă încă este conectată (indexul se poate schimba)."""
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        for index, name in camera_list.items():
+            if self._fingerprint(name) == cached.get("fingerprint"):
+                return index
+        return None
+
+    def remember(self, index, name):
+        try:
+            with open(self.cache_path, "w") as f:
+                json.dump({"index": index, "name": name, "fingerprint": self._fingerprint(name)}, f)
+        except OSError:
+            pass
@@ -0,0 +1,143 @@
+"""
+Capture Negotiator
+Setează explicit FOURCC (MJPG/YUYV), rezoluția, FPS-ul și buffer-ul camerei,
+verifică ce a acceptat driverul și măsoară FPS-ul livrat real pentru fiecare format.
+"""
+import time
+
+import cv2
+
+
+def fourcc_to_str(value):
+    value = int(value)
+    if value <= 0:
+        return ""
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4))
+
+
+class CaptureNegotiator:
+    # MJPG e comprimat și de obicei singurul care face 1080p60 pe USB 2.0
+    FORMATS = ("MJPG", "YUYV")
+    # Numele sub care driverele raportează același format (DirectShow zice YUY2 pentru YUYV)
+    FOURCC_ALIASES = {
+        "YUYV": {"YUYV", "YUY2"},
+    }
+    # Un format e acceptabil dacă livrează cel puțin această fracțiune din FPS-ul cerut
+    MIN_FPS_RATIO = 0.8
+
+    def __init__(self, cap, width, height, fps, buffer_size=1):
+        """
+        Args:
+            cap: cv2.VideoCapture deja deschis
+            width, height, fps: Configurația cerută (din quality)
+            buffer_size (int): Frame-uri ținute de driver; 1 = latență minimă
+        """
+        self.cap = cap
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.buffer_size = buffer_size
+
+    def apply(self, fourcc=None):
+        """
+        Aplică formatul cerut și returnează ce a acceptat efectiv driverul.
+
+        Args:
+            fourcc (str): "MJPG", "YUYV" sau None pentru a lăsa formatul implicit
+        """
+        cap = self.cap
+        # FOURCC trebuie setat înaintea rezoluției, altfel unele drivere îl ignoră
+        if fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        cap.set(cv2.CAP_PROP_FPS, self.fps)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        return self.accepted()
+
+    def accepted(self):
+        cap = self.cap
+        return {
+            "fourcc": fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": float(cap.get(cv2.CAP_PROP_FPS)),
+            "buffer_size": int(cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+        }
+
+    def matches(self, requested, reported):
+        """True dacă FOURCC-ul raportat de driver e formatul cerut (sau un alias al lui)."""
+        return reported in self.FOURCC_ALIASES.get(requested, {requested})
+
+    def measure(self, seconds=1.0, warmup=5):
+        """FPS-ul livrat efectiv de cap.read() (după câteva frame-uri de încălzire)."""
+        for _ in range(warmup):
+            if not self.cap.read()[0]:
+                return 0.0
+
+        frames = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            if not self.cap.read()[0]:
+                break
+            frames += 1
+        elapsed = time.perf_counter() - start
+        return frames / elapsed if elapsed > 0 else 0.0
+
+    def negotiate(self, formats=FORMATS, probe_seconds=1.0):
+        """
+        Încearcă fiecare format, măsoară FPS-ul real și îl păstrează pe cel mai rapid dintre
+        cele care au rezoluția cerută și cel puțin MIN_FPS_RATIO din FPS-ul cerut.
+
+        Returns:
+            dict: Configurația aleasă (accepted + "delivered_fps"), plus "candidates"
+        """
+        candidates = []
+        last = None  # Candidatul lăsat activ de ultimul apply(); None dacă driverul l-a refuzat
+        for fourcc in formats:
+            accepted = self.apply(fourcc)
+            last = None
+            if accepted["fourcc"] and not self.matches(fourcc, accepted["fourcc"]):
+                print(f"   {fourcc}: rejected by driver (got {accepted['fourcc']})")
+                continue
+            delivered = self.measure(probe_seconds)
+            accepted.update(requested=fourcc, delivered_fps=delivered)
+            candidates.append(accepted)
+            last = accepted
+            print(f"   {fourcc}: {accepted['width']}x{accepted['height']} @ {delivered:.1f} fps delivered "
+                  f"(driver reports {accepted['fps']:.0f})")
+
+        if not candidates:
+            accepted = self.apply(None)
+            accepted.update(requested=None, delivered_fps=self.measure(probe_seconds))
+            candidates.append(accepted)
+            last = accepted
+
+        # Un format coborât de driver (ex. 640x480) nu câștigă doar pentru că livrează un frame în plus
+        usable = [c for c in candidates if (c["width"], c["height"]) == (self.width, self.height)
+                  and c["delivered_fps"] >= self.fps * self.MIN_FPS_RATIO]
+        if usable:
+            best = max(usable, key=lambda c: round(c["delivered_fps"]))
+        else:
+            # Niciun format nu le îndeplinește pe amândouă: cel mai mare FPS livrat; la egalitate,
+            # rezoluția cea mai apropiată de cea cerută
+            best = max(candidates, key=lambda c: (round(c["delivered_fps"]), c["width"] * c["height"] == self.width * self.height))
+        # Și un format refuzat a schimbat setările camerei: se revine la cel ales, apoi se verifică
+        active = self.accepted() if best is last else self.apply(best["requested"])
+        if (best["requested"] and active["fourcc"] and not self.matches(best["requested"], active["fourcc"])) \
+                or (active["width"], active["height"]) != (best["width"], best["height"]):
+            print(f"⚠️ Driver did not restore {best['requested']} {best['width']}x{best['height']} "
+                  f"(now {active['fourcc'] or 'default'} {active['width']}x{active['height']})")
+
+        result = dict(best, candidates=candidates)
+        result.update(fourcc=active["fourcc"], width=active["width"], height=active["height"],
+                      fps=active["fps"], buffer_size=active["buffer_size"])
+        self._log(result)
+        return result
+
+    def _log(self, result):
+        fps_note = ""
+        if result["delivered_fps"] < self.fps * self.MIN_FPS_RATIO:
+            fps_note = f" ⚠️ below the requested {self.fps} fps"
+        print(f"📷 Capture format: {result['fourcc'] or 'default'} {result['width']}x{result['height']} "
+              f"@ {result['delivered_fps']:.1f} fps, buffer {result['buffer_size']}{fps_note}")
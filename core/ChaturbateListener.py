@@ -6,19 +6,30 @@ import time
 import requests
 import threading
 
+from core.TipTrace import TipTrace
+
 
 class ChaturbateListener:
     def __init__(self, api_url, process_tip_callback):
         """
         Args:
             api_url (str): URL-ul endpoint-ului Chaturbate Events API
-            process_tip_callback (callable): Funcția centrală process_tip(amount, username)
+            process_tip_callback (callable): Funcția centrală process_tip(amount, username, trace=None)
         """
         self.api_url = api_url
         self.process_tip = process_tip_callback
         self.running = False
         self.thread = None
 
+        # Statistici citite de MetricsServer
+        self.platform = "chaturbate"
+        self.polls_total = 0
+        self.errors_total = 0
+        self.consecutive_errors = 0
+        self.last_poll_latency = 0.0
+        self.backoff_seconds = 0  # Backoff curent (0 = polling normal)
+        self.last_success = 0.0
+
     def start(self):
         """Pornește thread-ul de ascultare"""
         self.running = True
@@ -32,16 +43,27 @@ class ChaturbateListener:
         if self.thread:
             self.thread.join(timeout=2)
 
+    def _record_error(self, poll_start, retry_delay):
+        """Actualizează statisticile după un poll eșuat"""
+        self.last_poll_latency = time.perf_counter() - poll_start
+        self.errors_total += 1
+        self.consecutive_errors += 1
+        self.backoff_seconds = retry_delay
+
     def _fetch_events(self):
         """Thread principal care interoghează API-ul Chaturbate"""
         retry_delay = 5
         max_retry_delay = 60
         
         while self.running:
+            poll_start = time.perf_counter()
             try:
                 response = requests.get(self.api_url, timeout=5)
+                received = time.perf_counter()
                 response.raise_for_status()
                 data = response.json()
+                self.last_poll_latency = received - poll_start
+                self.polls_total += 1
 
                 # Procesare events
                 for event in data.get('events', []):
@@ -50,29 +72,39 @@ class ChaturbateListener:
                         amount = event.get('object', {}).get('amount', 0)
                         username = event.get('object', {}).get('user', {}).get('username', 'Anonymous')
                         
+                        trace = TipTrace(self.platform, received)
+                        trace.mark("normalized")
+
                         # Trimite către metoda centrală
-                        self.process_tip(amount, username)
+                        self.process_tip(amount, username, trace=trace)
                 
                 # Reset retry delay dacă conexiunea a avut succes
                 retry_delay = 5
+                self.consecutive_errors = 0
+                self.backoff_seconds = 0
+                self.last_success = time.time()
                 time.sleep(1)  # Polling interval
 
             except requests.exceptions.Timeout:
                 print(f"⚠️ Chaturbate API timeout. Retrying in {retry_delay}s...")
+                self._record_error(poll_start, retry_delay)
                 time.sleep(retry_delay)
                 retry_delay = min(retry_delay * 2, max_retry_delay)
                 
             except requests.exceptions.ConnectionError:
                 print(f"⚠️ Chaturbate API connection failed. Retrying in {retry_delay}s...")
+                self._record_error(poll_start, retry_delay)
                 time.sleep(retry_delay)
                 retry_delay = min(retry_delay * 2, max_retry_delay)
                 
             except requests.exceptions.RequestException as e:
                 print(f"⚠️ Chaturbate API error: {str(e)}. Retrying in {retry_delay}s...")
+                self._record_error(poll_start, retry_delay)
                 time.sleep(retry_delay)
                 retry_delay = min(retry_delay * 2, max_retry_delay)
                 
             except Exception as e:
                 print(f"❌ Chaturbate unexpected error: {str(e)}")
+                self._record_error(poll_start, retry_delay)
                 time.sleep(retry_delay)
                 retry_delay = min(retry_delay * 2, max_retry_delay)
@@ -0,0 +1,48 @@
+"""
+Face Budget
+Împarte timpul de randare al unui filtru între fețele din frame, în ordinea priorității
+(FrameContext ordonează fețele: cea principală prima). Fața principală se randează mereu;
+următoarele doar dacă costul lor estimat mai încape în bugetul per frame.
+Costul fiecărei fețe (medie exponențială, pe rang) se raportează în metrics.
+"""
+import time
+
+
+class FaceBudget:
+    def __init__(self, seconds=None, smoothing=0.2):
+        """
+        Args:
+            seconds (float): Timpul per frame pentru toate fețele unui filtru; None = fără limită
+            smoothing (float): Ponderea ultimei măsurători în media costului per față
+        """
+        self.seconds = seconds
+        self.smoothing = smoothing
+        self.costs = {}            # rang (0 = fața principală) -> secunde, medie exponențială
+        self.rendered_total = 0
+        self.skipped_total = 0
+
+    def faces(self, count):
+        """
+        Rangurile fețelor de randat, în ordine; timpul dintre două iterații e costul feței.
+
+        Args:
+            count (int): Câte fețe are frame-ul
+        """
+        start = time.perf_counter()
+        for rank in range(count):
+            now = time.perf_counter()
+            if rank and self.seconds is not None:
+                # Fără măsurătoare pentru rangul ăsta, o față costă cât cea principală
+                predicted = self.costs.get(rank, self.costs.get(0, 0.0))
+                if now - start + predicted > self.seconds:
+                    self.skipped_total += count - rank
+                    if rank in self.costs:
+                        # Un vârf (ex. primul resize) nu trebuie să excludă fața pentru totdeauna:
+                        # estimarea scade cât timp e sărită, până o măsurăm din nou
+                        self.costs[rank] *= 1 - self.smoothing
+                    return
+            yield rank
+            cost = time.perf_counter() - now
+            previous = self.costs.get(rank)
+            self.costs[rank] = cost if previous is None else previous + self.smoothing * (cost - previous)
+            self.rendered_total += 1
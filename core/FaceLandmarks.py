@@ -0,0 +1,34 @@
+"""
+Face Landmarks
+Indicii Face Mesh cu nume, construiți o singură dată la import ca array-uri NumPy.
+Se folosesc ca indexare vectorizată în array-urile din FrameContext
+(landmark_points / landmark_pixels), fără acces punct cu punct la obiectele protobuf.
+"""
+import numpy as np
+from mediapipe.python.solutions import face_mesh_connections as connections
+
+# Puncte individuale
+FOREHEAD = 10
+LEFT_TEMPLE = 234
+RIGHT_TEMPLE = 454
+LEFT_EYE_CENTER = 468   # Centrul irisului (doar cu refine_landmarks=True)
+RIGHT_EYE_CENTER = 473
+EYE_CENTERS = np.array([LEFT_EYE_CENTER, RIGHT_EYE_CENTER], dtype=np.intp)
+
+# Conturul feței, în ordine (poligon închis, pornește din frunte)
+FACE_OVAL = np.array([10, 338, 297, 332, 284, 251, 389, 356, 454, 323, 361, 288,
+                      397, 365, 379, 378, 400, 377, 152, 148, 176, 149, 150, 136,
+                      172, 58, 132, 93, 234, 127, 162, 21, 54, 103, 67, 109], dtype=np.intp)
+
+
+def _feature(edges):
+    """Punctul de start al fiecărei muchii, în ordinea de iterare a setului MediaPipe."""
+    return np.array([start for start, _ in edges], dtype=np.intp)
+
+
+LEFT_EYE = _feature(connections.FACEMESH_LEFT_EYE)
+RIGHT_EYE = _feature(connections.FACEMESH_RIGHT_EYE)
+LIPS = _feature(connections.FACEMESH_LIPS)
+
+# (n_edges, 2): perechile de puncte ale plasei triunghiulare, în ordinea MediaPipe
+TESSELATION = np.array(list(connections.FACEMESH_TESSELATION), dtype=np.intp)
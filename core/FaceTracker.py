@@ -0,0 +1,193 @@
+"""
+Face Tracker
+Wrapper peste sursa de landmarks (FaceMesh / ReplayFaceMesh) cu același process(),
+care poate rula inferența la rezoluție redusă și refolosi rezultatul pe frame-urile sărite
+(la cererea QualityGovernor sau când MotionGate nu vede mișcare).
+Landmark-urile MediaPipe sunt normalizate (0..1), deci nu depind de rezoluția inferenței.
+Cu roi_tracking, după ce fața a fost găsită inferența rulează doar pe un crop în jurul ei
+(mutat doar când fața se apropie de margine), cu revenire la tot frame-ul când se pierde.
+Cu mai multe fețe (max_faces > 1), crop-ul le cuprinde pe toate cele găsite; cât timp sunt
+mai puține decât max_faces, tot frame-ul se recitește periodic ca să apară și fețele noi.
+"""
+import cv2
+import numpy as np
+
+from core.LandmarkReplay import ReplayFaceLandmarks, ReplayResults, landmarks_array
+from core.MotionGate import MotionGate
+
+
+def create_face_mesh(max_num_faces=1):
+    """
+    FaceMesh MediaPipe cu setările folosite de filtre (478 de puncte, cu iris).
+
+    Args:
+        max_num_faces (int): Câte fețe urmărește modelul (aceeași inferență pentru toate)
+    """
+    import mediapipe as mp  # Import lent (~0.6s), făcut doar când e nevoie de model
+    return mp.solutions.face_mesh.FaceMesh(
+        max_num_faces=max_num_faces,
+        refine_landmarks=True,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+
+
+class FaceTracker:
+    # Un crop mai mare de atât din frame nu mai merită (aproape tot frame-ul e fața)
+    ROI_MAX_AREA = 0.5
+
+    def __init__(self, face_mesh, inference_scale=1.0, skip_frames=0, motion_threshold=0.0, motion_max_age=10,
+                 roi_tracking=False, roi_expand=1.8, roi_margin=0.1, max_faces=1, roi_rescan=15):
+        """
+        Args:
+            face_mesh: Obiect cu process(rgb) -> results (FaceMesh MediaPipe sau replay)
+            inference_scale (float): Factorul de micșorare a imaginii trimise modelului
+            skip_frames (int): Câte frame-uri refolosesc ultimul rezultat după fiecare inferență
+            motion_threshold, motion_max_age: Vezi MotionGate; threshold 0 = fără gating
+            roi_tracking (bool): Inferență doar pe crop-ul din jurul feței găsite anterior
+                                 (necesită o sursă care chiar citește imaginea, nu un replay)
+            roi_expand (float): Latura crop-ului față de latura mare a bbox-ului landmark-urilor
+            roi_margin (float): Cât de aproape de marginea crop-ului (fracțiune din latură)
+                                poate ajunge fața înainte ca acesta să fie recentrat
+            max_faces (int): Câte fețe poate găsi face_mesh (max_num_faces al modelului)
+            roi_rescan (int): Cu mai puține fețe decât max_faces, la câte inferențe pe crop
+                              se caută din nou pe tot frame-ul (fețele noi apar în afara crop-ului)
+        """
+        self.face_mesh = face_mesh
+        self.inference_scale = inference_scale
+        self.skip_frames = skip_frames
+        self.motion_gate = MotionGate(motion_threshold, motion_max_age)
+        self.roi_tracking = roi_tracking
+        self.roi_expand = roi_expand
+        self.roi_margin = roi_margin
+        self.roi = None             # (x1, y1, x2, y2) în pixeli, cât timp fața e urmărită
+        self._roi_side = 0.0
+        self._roi_moved = False     # Crop-ul s-a schimbat de la inferența anterioară
+        self.max_faces = max_faces
+        self.roi_rescan = roi_rescan
+        self._roi_faces = 0         # Fețe găsite la ultima inferență
+        self._roi_age = 0           # Inferențe pe crop de la ultima căutare pe tot frame-ul
+
+        self.last_results = None
+        self._since_inference = 0
+        self._last_index = None
+
+        self.inferences_total = 0
+        self.skipped_total = 0          # Sărite de QualityGovernor (landmark_skip)
+        self.motion_skipped_total = 0   # Sărite pentru că imaginea nu s-a mișcat
+        self.roi_inferences_total = 0   # Inferențe pe crop-ul feței
+        self.roi_fallbacks_total = 0    # Crop fără față -> căutare pe tot frame-ul
+        self.roi_rescans_total = 0      # Căutări periodice de fețe noi pe tot frame-ul
+        self.inference_pixels_total = 0
+
+    def set_quality(self, settings):
+        """Aplică un nivel QualityGovernor plus setările MotionGate (dacă sunt în dict)."""
+        self.inference_scale = settings["inference_scale"]
+        self.skip_frames = settings["landmark_skip"]
+        gate = self.motion_gate
+        gate.threshold = settings.get("motion_threshold", gate.threshold)
+        gate.max_age = settings.get("motion_max_age", gate.max_age)
+
+    def process(self, rgb_frame, frame_index=None):
+        """
+        Args:
+            rgb_frame: Imaginea RGB
+            frame_index (int): Numărul frame-ului; dacă nu e consecutiv cu cel anterior
+                               (tracker-ul a stat nefolosit), rezultatul vechi nu se refolosește
+        """
+        if frame_index is not None:
+            if self._last_index is not None and frame_index != self._last_index + 1:
+                self.last_results = None
+                self.motion_gate.reset()
+                self.roi = None
+            self._last_index = frame_index
+
+        if self.last_results is not None and self._since_inference < self.skip_frames:
+            self._since_inference += 1
+            self.skipped_total += 1
+            return self.last_results
+
+        if self.motion_gate.is_still(rgb_frame) and self.last_results is not None:
+            self.motion_skipped_total += 1
+            return self.last_results
+
+        self.last_results = self._infer(rgb_frame)
+        self.motion_gate.refreshed()
+        self._since_inference = 0
+        self.inferences_total += 1
+        return self.last_results
+
+    def _infer(self, rgb_frame):
+        h, w = rgb_frame.shape[:2]
+        if self.roi is not None and self._roi_faces < self.max_faces and self._roi_age >= self.roi_rescan:
+            # Mai încape o față: o căutăm pe tot frame-ul, crop-ul se reface din ce se găsește
+            self.roi = None
+            self.roi_rescans_total += 1
+        if self.roi is not None:
+            x1, y1, x2, y2 = self.roi
+            crop = np.ascontiguousarray(rgb_frame[y1:y2, x1:x2])
+            points = landmarks_array(self._inference(crop))
+            if points is None and self._roi_moved:
+                # MediaPipe caută fața unde era în imaginea anterioară (alte coordonate): primul
+                # frame pe un crop nou poate pierde tracking-ul, a doua oară detecția rulează pe crop
+                points = landmarks_array(self._inference(crop))
+            self._roi_moved = False
+            if points is not None:
+                self.roi_inferences_total += 1
+                self._roi_age += 1
+                # Coordonate normalizate în crop -> normalizate în frame (z are scara lui x)
+                points[..., 0] = (x1 + points[..., 0] * (x2 - x1)) / w
+                points[..., 1] = (y1 + points[..., 1] * (y2 - y1)) / h
+                points[..., 2] *= (x2 - x1) / w
+                self._track(points, w, h)
+                return ReplayResults([ReplayFaceLandmarks(face) for face in points])
+            # Fața a ieșit din crop sau tracking-ul s-a pierdut: o căutăm pe tot frame-ul
+            self.roi = None
+            self.roi_fallbacks_total += 1
+
+        results = self._inference(rgb_frame)
+        self._roi_age = 0
+        if self.roi_tracking:
+            self._track(landmarks_array(results), w, h)
+        return results
+
+    def _inference(self, rgb):
+        scale = self.inference_scale
+        if scale < 1.0:
+            rgb = cv2.resize(rgb, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        self.inference_pixels_total += rgb.shape[0] * rgb.shape[1]
+        return self.face_mesh.process(rgb)
+
+    def _track(self, points, w, h):
+        """Actualizează crop-ul din landmark-urile găsite; rămâne pe loc cât fața e bine în interior."""
+        if points is None:
+            self.roi = None
+            return
+        self._roi_faces = len(points)
+        fx1, fx2 = float(points[..., 0].min()) * w, float(points[..., 0].max()) * w
+        fy1, fy2 = float(points[..., 1].min()) * h, float(points[..., 1].max()) * h
+        side = max(fx2 - fx1, fy2 - fy1) * self.roi_expand
+
+        if self.roi is not None:
+            x1, y1, x2, y2 = self.roi
+            mx, my = (x2 - x1) * self.roi_margin, (y2 - y1) * self.roi_margin
+            inside = fx1 >= x1 + mx and fx2 <= x2 - mx and fy1 >= y1 + my and fy2 <= y2 - my
+            # Crop stabil (MediaPipe își urmărește fața în coordonatele imaginii primite);
+            # se reface doar dacă fața iese spre margine sau s-a micșorat mult (s-a îndepărtat)
+            if inside and side >= self._roi_side * 0.6:
+                return
+
+        cx, cy = (fx1 + fx2) / 2, (fy1 + fy2) / 2
+        roi = (max(0, int(cx - side / 2)), max(0, int(cy - side / 2)),
+               min(w, int(cx + side / 2) + 1), min(h, int(cy + side / 2) + 1))
+        if (roi[2] - roi[0]) * (roi[3] - roi[1]) > self.ROI_MAX_AREA * w * h:
+            self.roi = None
+            return
+        self.roi = roi
+        self._roi_side = side
+        self._roi_moved = True
+
+    def close(self):
+        close = getattr(self.face_mesh, "close", None)
+        if close is not None:
+            close()
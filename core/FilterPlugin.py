@@ -0,0 +1,179 @@
+"""
+Filter Plugin
+Interfața unui filtru: o clasă cu apply(frame, ctx=None, dst=None) (opțional set_quality)
+și un atribut de clasă PLUGIN, un dict literal care descrie filtrul și ce îi trebuie:
+
+    PLUGIN = {
+        "name": "Big Eyes",           # Numele afișat
+        "tokens": 99,                 # Tip-ul care îl pornește
+        "duration": 20,               # Secunde
+        "layer": "warp",              # Vezi FilterStack.LAYERS
+        "landmarks": ("FACE_OVAL",),  # Grupuri / indici core.FaceLandmarks citiți (gol = fără Face Mesh)
+        "rgb": False,                 # Citește ctx.rgb
+        "assets": (),                 # Fișiere din assets/ fără de care nu poate porni
+        "roi_only": True,             # Modifică doar zona feței / overlay-ului, nu tot frame-ul
+        "in_place": True,             # apply(frame, dst=frame) e corect (nu citește ce a scris deja)
+        "cost_ms": 5.0,               # Cost estimat per frame la 1080p, până e măsurat
+    }
+
+Dict-ul e citit din sursă cu ast (ast.literal_eval), fără import: modulul filtrului
+(și mediapipe / modelele lui) se încarcă doar când filtrul chiar rulează.
+
+O clasă poate declara, în loc de "tokens" / "duration", un manifest JSON din assets/
+("manifest": "stickers.json"): fiecare intrare din el devine un filtru separat (tier cu
+tokens, durată și cost proprii) cu "variant" = numele intrării și "group" = numele clasei.
+Toate variantele unui grup împart aceeași instanță, care le randează împreună.
+Filtrele se descoperă din pachetul filters/ și din entry point-urile grupului
+"ar_filters" ale pachetelor instalate ("nume = pachet.modul:Clasă").
+"""
+import ast
+import importlib.util
+import json
+import os
+
+PLUGIN_GROUP = "ar_filters"
+FILTERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "filters")
+ASSETS_DIR = os.path.join(os.path.dirname(FILTERS_DIR), "assets")
+
+# Valorile pentru cheile lipsă; un filtru nedeclarat in_place primește un buffer separat
+DEFAULT_REQUIREMENTS = {
+    "layer": "particles",
+    "landmarks": (),
+    "rgb": False,
+    "assets": (),
+    "roi_only": False,
+    "in_place": False,
+    "cost_ms": 1.0,
+}
+REQUIRED_KEYS = ("name", "tokens", "duration")
+STICKER_KEYS = ("name", "tokens", "duration", "image", "anchor", "scale_reference")
+
+
+def load_manifest(path):
+    """
+    Citește un manifest de stickere (ex. assets/stickers.json):
+
+        {"stickers": [{
+            "name": "Rabbit Ears", "tokens": 50, "duration": 15,
+            "image": "rabbit_ears.png",      # Fișier BGRA din assets/
+            "anchor": [10],                  # Indici Face Mesh; centrul = media lor
+            "scale_reference": [234, 454],   # Doi indici; lățimea = distanța dintre ei * "width"
+            "width": 1.8,
+            "offset": [0, -0.35],            # Deplasarea centrului, în fracțiuni din lățimea / înălțimea stickerului
+            "rotate": false,                 # Se rotește după linia ochilor
+            "cost_ms": 2.5                   # Opțional
+        }]}
+
+    Returns:
+        list: Intrările, cu valorile implicite completate
+    """
+    with open(path, encoding="utf-8") as f:
+        stickers = json.load(f)["stickers"]
+    for sticker in stickers:
+        missing = [key for key in STICKER_KEYS if key not in sticker]
+        if missing:
+            raise ValueError(f"Sticker {sticker.get('name', '?')} in {path} is missing {', '.join(missing)}")
+        sticker.setdefault("width", 1.0)
+        sticker.setdefault("offset", [0, 0])
+        sticker.setdefault("rotate", False)
+    return stickers
+
+
+def _manifest_plugins(declared, assets_dir=ASSETS_DIR):
+    """Un tier per intrare din manifestul declarat; toate cer toate imaginile grupului (un singur atlas)."""
+    stickers = load_manifest(os.path.join(assets_dir, declared["manifest"]))
+    images = tuple(dict.fromkeys(sticker["image"] for sticker in stickers))
+    plugins = []
+    for sticker in stickers:
+        landmarks = list(dict.fromkeys(sticker["anchor"] + sticker["scale_reference"]))
+        if sticker["rotate"]:
+            landmarks.append("EYE_CENTERS")
+        plugins.append(dict(declared, name=sticker["name"], tokens=sticker["tokens"],
+                            duration=sticker["duration"], landmarks=tuple(landmarks), assets=images,
+                            cost_ms=sticker.get("cost_ms", declared.get("cost_ms", DEFAULT_REQUIREMENTS["cost_ms"])),
+                            group=declared["name"], variant=sticker["name"]))
+    return plugins
+
+
+def read_plugins(path, module_name, class_name=None):
+    """
+    Citește declarațiile PLUGIN din sursa unui modul, fără să-l importe.
+
+    Args:
+        path (str): Fișierul .py
+        module_name (str): Numele de import al modulului
+        class_name (str): Doar clasa asta (entry point); implicit toate clasele cu PLUGIN
+
+    Returns:
+        list: Dict-uri PLUGIN completate cu valorile implicite plus "module" și "class"
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    plugins = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef) or class_name not in (None, node.name):
+            continue
+        for statement in node.body:
+            if (isinstance(statement, ast.Assign) and len(statement.targets) == 1
+                    and getattr(statement.targets[0], "id", None) == "PLUGIN"):
+                declared = ast.literal_eval(statement.value)
+                required = ("name", "manifest") if "manifest" in declared else REQUIRED_KEYS
+                missing = [key for key in required if key not in declared]
+                if missing:
+                    raise ValueError(f"{module_name}.{node.name}.PLUGIN is missing {', '.join(missing)}")
+                for plugin in _manifest_plugins(declared) if "manifest" in declared else [declared]:
+                    plugins.append(dict(DEFAULT_REQUIREMENTS, **plugin, module=module_name, **{"class": node.name}))
+    return plugins
+
+
+def _entry_point_sources(group):
+    """(fișier, modul, clasă) pentru entry point-urile grupului, fără să importe modulele."""
+    from importlib.metadata import entry_points
+
+    for entry_point in entry_points(group=group):
+        module_name, _, class_name = entry_point.value.partition(":")
+        spec = importlib.util.find_spec(module_name)  # Importă doar pachetele părinte
+        if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+            print(f"⚠️ Filter plugin '{entry_point.name}' ({entry_point.value}) has no Python source, skipped")
+            continue
+        yield spec.origin, module_name, class_name.strip() or None
+
+
+def discover_filters(directory=FILTERS_DIR, group=PLUGIN_GROUP):
+    """
+    Toate filtrele declarate, din directorul filters/ și din entry point-uri.
+
+    Args:
+        directory (str): Directorul cu modulele filtrelor (importate ca filters.<Modul>)
+        group (str): Grupul de entry point-uri; None = doar directorul
+
+    Returns:
+        dict: tokens -> dict PLUGIN; un filtru invalid sau cu tokens deja luați e sărit cu un avertisment
+    """
+    sources = [(os.path.join(directory, file_name), f"{os.path.basename(directory)}.{file_name[:-3]}", None)
+               for file_name in sorted(os.listdir(directory))
+               if file_name.endswith(".py") and not file_name.startswith("_")]
+    if group:
+        sources += list(_entry_point_sources(group))
+
+    filters = {}
+    for path, module_name, class_name in sources:
+        try:
+            plugins = read_plugins(path, module_name, class_name)
+        except (OSError, SyntaxError, ValueError, KeyError) as e:
+            print(f"⚠️ Skipping filter plugin {module_name}: {e}")
+            continue
+        for plugin in plugins:
+            taken = filters.get(plugin["tokens"])
+            if taken is not None:
+                print(f"⚠️ Filter '{plugin['name']}' ({module_name}) skipped: "
+                      f"{plugin['tokens']} tokens already start '{taken['name']}'")
+                continue
+            filters[plugin["tokens"]] = plugin
+    return dict(sorted(filters.items()))
+
+
+def missing_assets(plugin, assets_dir=ASSETS_DIR):
+    """Fișierele declarate în "assets" care lipsesc din assets/."""
+    return [name for name in plugin["assets"] if not os.path.exists(os.path.join(assets_dir, name))]
@@ -0,0 +1,135 @@
+"""
+Filter Registry
+Ține filtrele (descoperite din declarațiile PLUGIN, vezi core.FilterPlugin) și listener-ii
+ca (modul, clasă) în loc de obiecte deja create, astfel încât mediapipe și modelele
+FaceMesh se încarcă doar când e nevoie de ele (în background, după primul frame sau la primul tip).
+"""
+import importlib
+import inspect
+import threading
+import time
+import traceback
+
+from core.FilterPlugin import discover_filters, missing_assets
+
+LISTENERS = {
+    'chaturbate': ('core.ChaturbateListener', 'ChaturbateListener'),
+    'stripchat': ('core.StripchatListener', 'StripchatListener'),
+    'camsoda': ('core.CamsodaListener', 'CamsodaListener'),
+}
+
+# Un singur load la un moment dat (prefetch în background + tip-uri), ca un modul să nu se importe de două ori
+_load_lock = threading.Lock()
+
+
+def load_class(module_name, class_name):
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class LazyFilter:
+    def __init__(self, plugin, startup_timer=None, shared=None):
+        """
+        Args:
+            plugin (dict): Declarația PLUGIN a filtrului (nume, modul, clasă, cerințe),
+                           din core.FilterPlugin.discover_filters(); pentru tier-urile dintr-un
+                           manifest, oricare dintre ele (instanța e a grupului)
+            startup_timer: StartupTimer în care se raportează durata încărcării
+            shared (dict): {argument: factory} pentru obiecte comune (ex. face_mesh); factory-ul
+                           se apelează doar dacă constructorul filtrului acceptă argumentul
+        """
+        self.plugin = plugin
+        self.name = plugin.get("group", plugin["name"])
+        self.module_name = plugin["module"]
+        self.class_name = plugin["class"]
+        self.layer = plugin["layer"]
+        self.startup_timer = startup_timer
+        self.shared = shared
+
+        self.instance = None
+        self.quality = None  # Ultimul nivel QualityGovernor, aplicat și la încărcare
+        self.failed = False
+        self.load_seconds = 0.0
+        self._thread = None
+
+    @property
+    def loaded(self):
+        return self.instance is not None
+
+    def load(self):
+        """Importă modulul și construiește filtrul (blocant). Returnează instanța sau None la eroare."""
+        if self.instance is not None or self.failed:
+            return self.instance
+
+        with _load_lock:
+            if self.instance is not None or self.failed:
+                return self.instance
+            missing = missing_assets(self.plugin)
+            if missing:
+                self.failed = True
+                print(f"❌ Filter '{self.name}' needs missing assets: {', '.join(missing)}")
+                return None
+            start = time.perf_counter()
+            try:
+                cls = load_class(self.module_name, self.class_name)
+                instance = cls(**self._shared_kwargs(cls))
+            except Exception:
+                self.failed = True
+                print(f"❌ Failed to load filter '{self.name}' ({self.module_name}.{self.class_name}):")
+                traceback.print_exc()
+                return None
+
+            self.load_seconds = time.perf_counter() - start
+            if self.quality is not None and hasattr(instance, "set_quality"):
+                instance.set_quality(self.quality)
+            self.instance = instance
+
+        if self.startup_timer is not None:
+            self.startup_timer.add(f"load {self.name}", self.load_seconds)
+        print(f"🧠 Filter '{self.name}' ready in {self.load_seconds * 1000:.0f} ms")
+        return instance
+
+    def _shared_kwargs(self, cls):
+        if self.shared is None:
+            return {}
+        accepted = inspect.signature(cls).parameters
+        return {key: value() for key, value in self.shared.items() if key in accepted}
+
+    def prefetch(self):
+        """Pornește încărcarea pe un thread daemon, dacă nu e deja încărcat sau în curs."""
+        if self.instance is not None or self.failed:
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.load, daemon=True)
+            self._thread.start()
+
+    def set_quality(self, settings):
+        self.quality = settings
+        instance = self.instance
+        if instance is not None and hasattr(instance, "set_quality"):
+            instance.set_quality(settings)
+
+    def apply(self, frame, ctx=None, dst=None, **kwargs):
+        # Nu blocăm bucla de randare: până e gata modelul, frame-ul trece neschimbat
+        if self.instance is None:
+            self.prefetch()
+            return frame
+        return self.instance.apply(frame, ctx=ctx, dst=dst, **kwargs)
+
+
+def prefetch_all(filters):
+    """Încarcă secvențial toate filtrele pe un singur thread daemon (după primul frame)."""
+    def run():
+        for lazy in filters:
+            lazy.load()
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def import_targets():
+    """Modulele care contează pentru --startup-profile, în ordinea în care le încarcă aplicația."""
+    modules = ['cv2', 'numpy', 'dotenv', 'core.OutputManager', 'core.MetricsServer']
+    modules += [module for module, _ in LISTENERS.values()]
+    modules += ['mediapipe']
+    modules += list(dict.fromkeys(plugin["module"] for plugin in discover_filters().values()))
+    return modules
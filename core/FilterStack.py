@@ -0,0 +1,134 @@
+"""
+Filter Stack
+Rulează mai multe filtre din coadă în același timp, fiecare cu timer-ul lui.
+Filtrele active se aplică în ordinea layer-ului declarat (warp -> skin -> mesh ->
+stickers -> particles -> hud) pe același FrameContext, deci landmark-urile și celelalte
+produse comune se calculează o singură dată per frame, oricâte filtre le folosesc.
+Un filtru din coadă pornește doar dacă costul estimat al stivei (media timpului de
+randare per filtru, până la prima măsurătoare costul declarat) rămâne sub plafonul
+per frame; altfel așteaptă, ca înainte.
+Filtrele care împart o instanță (ex. stickerele din același manifest) se randează
+într-un singur apel, cu numele variantelor active, iar filtrele din layer-ul "warp"
+își adună deformările într-un WarpField comun, aplicat cu un singur remap.
+"""
+from collections import deque
+import time
+
+from core.WarpField import WarpField
+
+LAYERS = ("warp", "skin", "mesh", "stickers", "particles", "hud")
+
+
+class FilterStack:
+    def __init__(self, max_cost=None, smoothing=0.2):
+        """
+        Args:
+            max_cost (float): Secunde de randare per frame pentru toate filtrele active;
+                              None = oricâte filtre simultan
+            smoothing (float): Ponderea ultimei măsurători în costul mediu al unui filtru
+        """
+        self.max_cost = max_cost
+        self.smoothing = smoothing
+        # {"name", "user", "duration", "instance", "trace", plus din declarația PLUGIN: "layer",
+        #  "landmarks" (bool), "in_place", "cost" (secunde), "variant" (opțional)};
+        #  listener-ele adaugă din thread-urile lor
+        self.queue = deque()
+        self.active = []   # Intrările care rulează, în ordinea layer-elor; fiecare are "end_time"
+        self.costs = {}    # nume filtru -> secunde per frame (medie exponențială)
+
+    def push(self, item):
+        self.queue.append(item)
+
+    def cost(self, item):
+        """Costul per frame măsurat al unui filtru, sau cel declarat dacă n-a rulat încă."""
+        return self.costs.get(item["name"], item["cost"])
+
+    def estimated_cost(self):
+        """Costul estimat per frame al filtrelor active."""
+        return sum(self.cost(entry) for entry in self.active)
+
+    @property
+    def in_place(self):
+        """Toate filtrele active pot scrie direct în frame-ul primit (dst=frame)."""
+        return all(entry["in_place"] for entry in self.active)
+
+    def update(self, now=None):
+        """
+        Scoate filtrele expirate și pornește din coadă, în ordine, cât încap sub max_cost.
+        Un tip pentru un filtru deja activ îi prelungește timer-ul (același filtru nu
+        se randează de două ori pe frame).
+
+        Args:
+            now (float): time.time(); implicit acum
+
+        Returns:
+            list: Intrările din coadă pornite (sau care au prelungit un filtru activ) acum
+        """
+        now = time.time() if now is None else now
+        self.active = [entry for entry in self.active if now <= entry["end_time"]]
+
+        started = []
+        cost = self.estimated_cost()
+        while self.queue:
+            item = self.queue[0]
+            running = next((entry for entry in self.active if entry["name"] == item["name"]), None)
+            if running is not None:
+                running["end_time"] += item["duration"]
+                running["duration"] += item["duration"]
+            else:
+                item_cost = self.cost(item)
+                # Primul filtru pornește oricum; coada rămâne FIFO (un filtru scump nu e depășit)
+                if self.active and self.max_cost is not None and cost + item_cost > self.max_cost:
+                    break
+                cost += item_cost
+                self.active.append(dict(item, end_time=now + item["duration"]))
+                self.active.sort(key=lambda entry: LAYERS.index(entry["layer"]))
+            self.queue.popleft()
+            started.append(item)
+        return started
+
+    def render(self, frame, ctx, dst):
+        """
+        Aplică filtrele active în ordinea layer-elor; fiecare pornește de la rezultatul celui
+        anterior, scris în același buffer dst.
+
+        Args:
+            frame: Frame-ul BGR
+            ctx: FrameContext-ul frame-ului (actualizat după fiecare filtru)
+            dst: Bufferul de ieșire comun
+
+        Returns:
+            Frame-ul randat; durata fiecărui filtru rămâne în entry["render_seconds"]
+        """
+        if len(self.active) > 1 and any(entry["landmarks"] for entry in self.active):
+            # Landmark-urile se calculează pe captură, nu pe ce a desenat un filtru anterior;
+            # fără filtre care le cer (ex. doar Sparkles) nu rulează deloc inferența
+            ctx.landmarks
+        warps = list({id(entry["instance"]): entry for entry in self.active if entry["layer"] == "warp"}.values())
+        if len(warps) > 1:
+            # Deformările tuturor filtrelor warp se adună și se aplică după ultimul dintre ele
+            ctx.warp = WarpField()
+        rendered = set()
+        for entry in self.active:
+            instance = entry["instance"]
+            if id(instance) in rendered:
+                continue
+            rendered.add(id(instance))
+            # Variantele active ale aceleiași instanțe (din același layer) se compun într-un apel
+            batch = [other for other in self.active if other["instance"] is instance]
+            kwargs = {"variants": [other["variant"] for other in batch]} if entry.get("variant") else {}
+            loaded = getattr(instance, "loaded", True)
+            start = time.perf_counter()
+            frame = instance.apply(frame, ctx=ctx, dst=dst, **kwargs)
+            if ctx.warp is not None and instance is warps[-1]["instance"]:
+                frame = ctx.warp.apply(frame)  # Remap-ul comun intră în costul ultimului filtru warp
+                ctx.warp = None
+            ctx.update(frame)
+            seconds = (time.perf_counter() - start) / len(batch)
+            for other in batch:
+                other["render_seconds"] = seconds
+                if loaded:  # Cât se încarcă modelul frame-ul trece neschimbat: nu e un cost real
+                    previous = self.costs.get(other["name"])
+                    self.costs[other["name"]] = seconds if previous is None else \
+                        previous + self.smoothing * (seconds - previous)
+        return frame
@@ -0,0 +1,179 @@
+"""
+Frame Context
+Contextul unui frame care trece prin filtre și output: frame-ul BGR plus produse
+derivate calculate leneș și memorate (RGB, grayscale, piramidă, landmarks ca rezultat
+FaceMesh și ca array-uri NumPy, bbox-ul feței).
+Fiecare produs se calculează cel mult o dată per frame, indiferent câți consumatori are.
+Array-urile de landmarks au fețele în ordinea priorității (mărime și cât de aproape sunt
+de centru): fața principală e prima, iar filtrele o randează pe ea înainte de celelalte.
+"""
+import cv2
+import numpy as np
+
+from core.FaceTracker import FaceTracker
+from core.LandmarkReplay import landmarks_array
+
+_MISSING = object()
+
+
+def face_priority(points):
+    """
+    Ordinea fețelor după importanță: aria bbox-ului, redusă cu până la jumătate
+    pentru fețele de la marginea imaginii.
+
+    Args:
+        points: (n_faces, n_points, 3) landmarks normalizate
+
+    Returns:
+        np.ndarray: Indicii fețelor, cea principală prima
+    """
+    low, high = points[..., :2].min(axis=1), points[..., :2].max(axis=1)
+    area = np.prod(high - low, axis=1)
+    center_distance = np.hypot(*((low + high) / 2 - 0.5).T) / np.sqrt(0.5)
+    return np.argsort(-area * (1 - 0.5 * center_distance), kind="stable")
+
+
+class FrameContext:
+    def __init__(self, frame, index=None, tracker=None, pool=None):
+        """
+        Args:
+            frame (np.ndarray): Frame-ul BGR curent
+            index (int): Numărul frame-ului (FaceTracker îl folosește ca să știe dacă a pierdut frame-uri)
+            tracker: FaceTracker (sau orice obiect cu process(rgb)) pentru landmarks
+            pool (BufferPool): Dacă e dat, RGB/gray/piramida se scriu în buffere din pool,
+                               returnate la invalidate()
+        """
+        self.frame = frame
+        self.index = index
+        self.tracker = tracker
+        self.pool = pool
+        # WarpField comun filtrelor din layer-ul "warp" când FilterStack le randează împreună
+        # (deformările lor se aplică într-un singur remap); None = fiecare filtru își face remap-ul
+        self.warp = None
+
+        self._rgb = None
+        self._gray = None
+        self._pyramid = None
+        self._landmarks = _MISSING
+        self._points = _MISSING
+        self._order = None
+        self._pixels = _MISSING
+        self._bbox = _MISSING
+
+    def update(self, frame):
+        """
+        Frame-ul rezultat după un filtru (același array modificat in-place sau unul nou):
+        produsele de imagine trebuie recalculate.
+        """
+        self.frame = frame
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Frame-ul a fost modificat in-place (HUD, overlay). Landmark-urile și bbox-ul rămân valide:
+        descriu fața din captura, nu pixelii desenați peste ea.
+        Bufferele produselor se întorc în pool: cine le-a primit nu le mai folosește după asta.
+        """
+        if self.pool is not None:
+            self.pool.release(self._rgb)
+            self.pool.release(self._gray)
+            for level in (self._pyramid or [])[1:]:
+                self.pool.release(level)
+        self._rgb = None
+        self._gray = None
+        self._pyramid = None
+
+    def _buffer(self, shape):
+        if self.pool is None:
+            return None  # cv2 alocă
+        return self.pool.acquire(shape)
+
+    @property
+    def rgb(self):
+        if self._rgb is None:
+            self._rgb = cv2.cvtColor(self.frame, cv2.COLOR_BGR2RGB, dst=self._buffer(self.frame.shape))
+        return self._rgb
+
+    @property
+    def gray(self):
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY, dst=self._buffer(self.frame.shape[:2]))
+        return self._gray
+
+    def pyramid(self, level):
+        """
+        Frame-ul BGR micșorat de 2**level ori (cv2.pyrDown); nivelele intermediare se refolosesc.
+
+        Args:
+            level (int): 0 = frame-ul original, 1 = jumătate, 2 = sfert...
+        """
+        if self._pyramid is None:
+            self._pyramid = [self.frame]
+        while len(self._pyramid) <= level:
+            previous = self._pyramid[-1]
+            shape = ((previous.shape[0] + 1) // 2, (previous.shape[1] + 1) // 2) + previous.shape[2:]
+            self._pyramid.append(cv2.pyrDown(previous, dst=self._buffer(shape)))
+        return self._pyramid[level]
+
+    @property
+    def landmarks(self):
+        """Rezultatul FaceMesh pentru frame (multi_face_landmarks), o singură inferență per frame."""
+        if self._landmarks is _MISSING:
+            if self.tracker is None:
+                self._landmarks = None
+            elif self.index is not None and isinstance(self.tracker, FaceTracker):
+                self._landmarks = self.tracker.process(self.rgb, frame_index=self.index)
+            else:
+                self._landmarks = self.tracker.process(self.rgb)
+        return self._landmarks
+
+    @property
+    def landmark_points(self):
+        """
+        (n_faces, n_points, 3) float32 normalizat (x, y, z) sau None; convertit o dată per frame.
+        Fețele sunt în ordinea priorității (vezi face_order), nu în cea a modelului.
+        """
+        if self._points is _MISSING:
+            points = landmarks_array(self.landmarks)
+            if points is not None:
+                self._order = face_priority(points)
+                points = points[self._order]
+            self._points = points
+        return self._points
+
+    @property
+    def face_order(self):
+        """Indicii din landmarks.multi_face_landmarks pentru fiecare față din array-uri, sau None."""
+        self.landmark_points
+        return self._order
+
+    @property
+    def landmark_pixels(self):
+        """
+        (n_faces, n_points, 2) coordonate x, y în pixelii frame-ului sau None.
+        float64, ca int() pe ele să dea exact ce dădea int(landmark.x * w).
+        """
+        if self._pixels is _MISSING:
+            points = self.landmark_points
+            h, w = self.frame.shape[:2]
+            self._pixels = None if points is None else points[..., :2] * np.array([w, h], dtype=np.float64)
+        return self._pixels
+
+    @property
+    def landmarks_age(self):
+        """Vârsta landmark-urilor în frame-uri: 0 = din frame-ul curent, >0 cu AsyncFaceTracker."""
+        self.landmarks
+        return getattr(self.tracker, "result_age", 0)
+
+    @property
+    def face_bbox(self):
+        """(x1, y1, x2, y2) în pixeli pentru fața principală sau None."""
+        if self._bbox is _MISSING:
+            self._bbox = None
+            pixels = self.landmark_pixels
+            if pixels is not None:
+                h, w = self.frame.shape[:2]
+                x1, y1 = pixels[0].min(axis=0)
+                x2, y2 = pixels[0].max(axis=0)
+                self._bbox = (max(0, int(x1)), max(0, int(y1)), min(w, int(np.ceil(x2))), min(h, int(np.ceil(y2))))
+        return self._bbox
@@ -0,0 +1,148 @@
+"""
+Frame Profiler
+Records per-stage durations of the main loop into fixed-size ring buffers
+and reports rolling p50/p95/p99 timings and effective FPS.
+"""
+import csv
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+
+class FrameProfiler:
+    # Stages measured in CameraFiltersAutomation.run(), in loop order
+    STAGES = ("capture", "preprocess", "update_queue", "filter", "hud", "overlay", "waitkey", "display")
+
+    def __init__(self, enabled=False, capacity=600, output_dir="profiles"):
+        """
+        Args:
+            enabled (bool): When False every method returns immediately
+            capacity (int): Number of frames kept in each ring buffer
+            output_dir (str): Folder where export() writes the CSV/JSON report
+        """
+        self.enabled = enabled
+        self.capacity = capacity
+        self.output_dir = output_dir
+
+        self._buffers = {name: np.zeros(capacity, dtype=np.int64) for name in self.STAGES + ("frame",)}
+        self._pending = dict.fromkeys(self.STAGES, 0)
+        self._count = 0
+        self._frame_start = 0
+        self._last_mark = 0
+
+        # The overlay only re-computes percentiles every few frames
+        self._summary_cache = None
+        self._summary_frame = -1
+        self.summary_interval = 15
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        self._frame_start = now
+        self._last_mark = now
+
+    def mark(self, stage):
+        """Closes the given stage: everything since the previous mark is charged to it."""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        self._pending[stage] += now - self._last_mark
+        self._last_mark = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        slot = self._count % self.capacity
+        for stage in self.STAGES:
+            self._buffers[stage][slot] = self._pending[stage]
+            self._pending[stage] = 0
+        self._buffers["frame"][slot] = time.perf_counter_ns() - self._frame_start
+        self._count += 1
+
+    def _window(self, name):
+        """Returns the valid part of a ring buffer (no ordering guarantees)."""
+        return self._buffers[name][:min(self._count, self.capacity)]
+
+    def summary(self):
+        """
+        Returns:
+            dict: {"frames": int, "fps": float, "stages": {stage: {"p50", "p95", "p99", "mean"}}} in ms
+        """
+        if self._count == 0:
+            return {"frames": 0, "fps": 0.0, "stages": {}}
+
+        stages = {}
+        for name in self.STAGES + ("frame",):
+            samples = self._window(name) / 1e6
+            p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+            stages[name] = {
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "mean": float(samples.mean()),
+            }
+
+        frame_ms = stages["frame"]["mean"]
+        return {
+            "frames": self._count,
+            "fps": 1000.0 / frame_ms if frame_ms > 0 else 0.0,
+            "stages": stages,
+        }
+
+    def draw_overlay(self, frame):
+        """Draws the rolling timings in the top-right corner (the menu overlay sits top-left, the HUD bottom-right)."""
+        if not self.enabled:
+            return
+        if self._summary_cache is None or self._count - self._summary_frame >= self.summary_interval:
+            self._summary_cache = self.summary()
+            self._summary_frame = self._count
+
+        summary = self._summary_cache
+        if not summary["stages"]:
+            return
+
+        lines = [f"FPS {summary['fps']:5.1f}   p50 / p95 / p99 ms"]
+        for name in self.STAGES + ("frame",):
+            s = summary["stages"][name]
+            lines.append(f"{name:<13}{s['p50']:6.2f} {s['p95']:6.2f} {s['p99']:6.2f}")
+
+        line_h = 18
+        box_w, box_h = 330, line_h * len(lines) + 12
+        x, y = max(0, frame.shape[1] - box_w - 20), 20
+        roi = frame[y:y + box_h, x:x + box_w]
+        roi[:] = (roi * 0.35).astype(np.uint8)
+
+        for i, text in enumerate(lines):
+            cv2.putText(frame, text, (x + 8, y + 18 + i * line_h),
+                        cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 255, 0), 1, cv2.LINE_AA)
+
+    def export(self):
+        """Writes the raw samples (CSV) and the summary (JSON). Returns the written paths."""
+        if not self.enabled or self._count == 0:
+            return []
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        csv_path = os.path.join(self.output_dir, f"frame_timings_{stamp}.csv")
+        json_path = os.path.join(self.output_dir, f"frame_timings_{stamp}.json")
+
+        # Rows in chronological order, oldest first
+        n = min(self._count, self.capacity)
+        order = [(self._count - n + i) % self.capacity for i in range(n)]
+        columns = self.STAGES + ("frame",)
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + [f"{name}_ms" for name in columns])
+            for i, slot in enumerate(order):
+                frame_no = self._count - n + i
+                writer.writerow([frame_no] + [f"{self._buffers[name][slot] / 1e6:.3f}" for name in columns])
+
+        with open(json_path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+        print(f"📊 Frame timings saved: {csv_path}, {json_path}")
+        return [csv_path, json_path]
@@ -0,0 +1,176 @@
+"""
+Landmark Recording & Replay
+Salvează stream-ul de landmarks Face Mesh într-un fișier NumPy compact și îl
+redă prin aceeași interfață ca mp.solutions.face_mesh.FaceMesh.process(),
+astfel încât filtrele pot randa fără inferență MediaPipe.
+"""
+import time
+
+import cv2
+import numpy as np
+
+
+class ReplayLandmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class ReplayFaceLandmarks:
+    """Echivalentul NormalizedLandmarkList: expune .landmark[idx].x/.y/.z"""
+
+    def __init__(self, points):
+        self.points = points  # (n_points, 3) float32, coordonate normalizate
+        self._landmark = None
+
+    @property
+    def landmark(self):
+        # Construită doar la cerere: filtrele citesc direct array-ul points
+        if self._landmark is None:
+            self._landmark = [ReplayLandmark(float(x), float(y), float(z)) for x, y, z in self.points]
+        return self._landmark
+
+
+class ReplayResults:
+    """Echivalentul rezultatului FaceMesh.process(): expune .multi_face_landmarks"""
+
+    def __init__(self, faces):
+        self.multi_face_landmarks = faces or None
+
+
+def landmarks_array(results):
+    """(n_faces, n_points, 3) float32 din rezultatul FaceMesh, sau None fără fețe."""
+    if results is None or not results.multi_face_landmarks:
+        return None
+    faces = []
+    for face in results.multi_face_landmarks:
+        points = getattr(face, "points", None)  # ReplayFaceLandmarks are deja array-ul
+        if points is None:
+            points = [(lm.x, lm.y, lm.z) for lm in face.landmark]
+        faces.append(points)
+    return np.asarray(faces, dtype=np.float32)
+
+
+class LandmarkRecorder:
+    def __init__(self, path, video_path=None, fps=30, max_faces=1):
+        """
+        Args:
+            path (str): Fișierul .npz în care se salvează landmarks
+            video_path (str): Opțional, video-ul sincronizat cu landmarks (mp4)
+            fps (int): FPS-ul video-ului înregistrat
+            max_faces (int): Numărul maxim de fețe păstrate per frame
+        """
+        self.path = path
+        self.video_path = video_path
+        self.fps = fps
+        self.max_faces = max_faces
+        self.writer = None
+
+        self._frames = []
+        self._counts = []
+        self._timestamps = []
+        self._n_points = 0
+
+    def __len__(self):
+        return len(self._counts)
+
+    def add(self, results, frame=None):
+        """
+        Înregistrează un frame.
+
+        Args:
+            results: Rezultatul FaceMesh.process() pentru acest frame
+            frame: Frame-ul BGR corespunzător (scris în video dacă video_path e setat)
+        """
+        faces = results.multi_face_landmarks or []
+        faces = faces[:self.max_faces]
+
+        if faces and not self._n_points:
+            self._n_points = len(faces[0].landmark)
+
+        data = np.full((self.max_faces, max(self._n_points, 1), 3), np.nan, dtype=np.float32)
+        for i, face_landmarks in enumerate(faces):
+            data[i] = [(lm.x, lm.y, lm.z) for lm in face_landmarks.landmark]
+
+        self._frames.append(data)
+        self._counts.append(len(faces))
+        self._timestamps.append(time.time())
+
+        if frame is not None and self.video_path:
+            if self.writer is None:
+                h, w = frame.shape[:2]
+                fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+                self.writer = cv2.VideoWriter(self.video_path, fourcc, self.fps, (w, h))
+            self.writer.write(frame)
+
+    def save(self):
+        """Scrie fișierul .npz și închide video-ul. Returnează numărul de frame-uri salvate."""
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+
+        n_points = max(self._n_points, 1)
+        landmarks = np.full((len(self._frames), self.max_faces, n_points, 3), np.nan, dtype=np.float32)
+        for i, data in enumerate(self._frames):
+            # Frame-urile fără față dinaintea primei detecții au doar 1 punct placeholder
+            if data.shape[1] == n_points:
+                landmarks[i] = data
+
+        np.savez_compressed(
+            self.path,
+            landmarks=landmarks,
+            face_counts=np.array(self._counts, dtype=np.uint8),
+            timestamps=np.array(self._timestamps, dtype=np.float64),
+        )
+        print(f"💾 Saved {len(self._frames)} landmark frames to {self.path}")
+        return len(self._frames)
+
+
+class ReplayFaceMesh:
+    def __init__(self, path, loop=True, max_frames=None):
+        """
+        Înlocuitor pentru FaceMesh care redă landmarks înregistrate cu LandmarkRecorder.
+
+        Args:
+            path (str): Fișierul .npz înregistrat
+            loop (bool): Reia de la început după ultimul frame
+            max_frames (int): Limitează redarea la primele N frame-uri (sincronizare cu video)
+        """
+        with np.load(path) as data:
+            self.landmarks = data["landmarks"]
+            self.face_counts = data["face_counts"]
+            self.timestamps = data["timestamps"]
+
+        if max_frames is not None:
+            self.landmarks = self.landmarks[:max_frames]
+            self.face_counts = self.face_counts[:max_frames]
+            self.timestamps = self.timestamps[:max_frames]
+
+        self.loop = loop
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.face_counts)
+
+    def seek(self, index):
+        self.cursor = index
+
+    def process(self, rgb_frame=None):
+        """Returnează landmarks pentru frame-ul următor; imaginea primită e ignorată."""
+        if self.cursor >= len(self):
+            if not self.loop or len(self) == 0:
+                return ReplayResults([])
+            self.cursor = 0
+
+        index = self.cursor
+        self.cursor += 1
+
+        count = int(self.face_counts[index])
+        faces = [ReplayFaceLandmarks(self.landmarks[index, i]) for i in range(count)]
+        return ReplayResults(faces)
+
+    def close(self):
+        pass
@@ -0,0 +1,125 @@
+"""
+Metrics Server
+Endpoint HTTP local (format text Prometheus) servit dintr-un thread de fundal.
+Valorile sunt colectate doar la fiecare scrape, deci bucla video nu plătește nimic în plus.
+Opțional acceptă comenzi locale prin POST (ex. /profile).
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def format_metrics(families):
+    """
+    Transformă o listă de familii de metrici în formatul text Prometheus.
+
+    Args:
+        families (list): [(name, type, help, [(labels_dict, value), ...]), ...]
+                         Pentru histograme sample-urile sunt (suffix, labels_dict, value),
+                         ex. ("_bucket", {"le": "0.5"}, 3)
+
+    Returns:
+        str: Textul expus pe /metrics
+    """
+    lines = []
+    for name, metric_type, help_text, samples in families:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for sample in samples:
+            suffix, labels, value = sample if len(sample) == 3 else ("", *sample)
+            lines.append(f"{name}{suffix}{_format_labels(labels)} {float(value)!r}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    def __init__(self, collect_callback, host="127.0.0.1", port=9108, actions=None):
+        """
+        Args:
+            collect_callback (callable): Returnează lista de familii pentru format_metrics()
+            host (str): Adresa pe care ascultă (implicit doar local)
+            port (int): Portul HTTP
+            actions (dict): Comenzi locale POST, {"/path": callable(params) -> str}
+        """
+        self.collect = collect_callback
+        self.actions = actions or {}
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    def _make_handler(self):
+        collect = self.collect
+        actions = self.actions
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                try:
+                    body = format_metrics(collect()).encode("utf-8")
+                except Exception as e:
+                    self.send_error(500, str(e))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                action = actions.get(url.path)
+                if action is None:
+                    self.send_error(404)
+                    return
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                try:
+                    body = (str(action(params)) + "\n").encode("utf-8")
+                except Exception as e:
+                    self.send_error(400, str(e))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Fără log per request în consola aplicației
+
+        return Handler
+
+    def start(self):
+        """Pornește serverul într-un thread daemon"""
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        except OSError as e:
+            print(f"⚠️ Metrics server failed to start on {self.host}:{self.port}: {e}")
+            self.server = None
+            return False
+
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        print(f"✅ Metrics available at http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        """Oprește serverul"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.thread:
+            self.thread.join(timeout=2)
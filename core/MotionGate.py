@@ -0,0 +1,66 @@
+"""
+Motion Gate
+Estimator ieftin de mișcare pe un thumbnail grayscale mic: dacă imaginea nu s-a
+schimbat față de frame-ul ultimei inferențe, landmark-urile anterioare sunt refolosite.
+După `max_age` frame-uri refolosite se forțează oricum o inferență nouă.
+"""
+import cv2
+
+THUMB_SIZE = (64, 36)
+
+
+class MotionGate:
+    def __init__(self, threshold=0.0, max_age=10, pixel_delta=8):
+        """
+        Args:
+            threshold (float): Fracțiunea de pixeli din thumbnail care trebuie să se schimbe
+                               ca frame-ul să fie considerat "în mișcare"; 0 = dezactivat
+            max_age (int): Câte frame-uri consecutive pot refolosi același rezultat
+            pixel_delta (int): Diferența minimă (0-255) ca un pixel să conteze ca schimbat
+        """
+        self.threshold = threshold
+        self.max_age = max_age
+        self.pixel_delta = pixel_delta
+
+        self.reference = None  # Thumbnail-ul frame-ului la ultima inferență
+        self.thumbnail = None  # Thumbnail-ul frame-ului curent
+        self.age = 0
+        self.last_score = 0.0
+
+    @property
+    def enabled(self):
+        return self.threshold > 0
+
+    def is_still(self, rgb_frame):
+        """
+        Calculează thumbnail-ul frame-ului curent (o dată per frame) și decide dacă poate fi sărită inferența.
+
+        Returns:
+            bool: True = se poate refolosi ultimul rezultat
+        """
+        if not self.enabled:
+            return False
+
+        small = cv2.resize(rgb_frame, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        self.thumbnail = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+        if self.reference is None or self.age >= self.max_age:
+            return False
+
+        diff = cv2.absdiff(self.thumbnail, self.reference)
+        changed = cv2.countNonZero(cv2.threshold(diff, self.pixel_delta, 255, cv2.THRESH_BINARY)[1])
+        self.last_score = changed / diff.size
+        if self.last_score >= self.threshold:
+            return False
+
+        self.age += 1
+        return True
+
+    def refreshed(self):
+        """Apelat după o inferență: frame-ul curent devine referința."""
+        self.reference = self.thumbnail
+        self.age = 0
+
+    def reset(self):
+        self.reference = None
+        self.thumbnail = None
+        self.age = 0
@@ -1,3 +1,5 @@
+import time
+
 import cv2
 
 try:
@@ -10,6 +12,11 @@ class OutputManager:
     def __init__(self, mode="window", quality="1080p"):
         self.mode = mode
         self.vcam = None
+
+        # Stats for the metrics endpoint
+        self.frames_sent = 0
+        self.last_display_seconds = 0.0  # send/imshow time
+        self.last_pacing_seconds = 0.0   # time spent in sleep_until_next_frame()
         if quality == "4K":
             self.width, self.height, self.fps = 3840, 2160, 30
         elif quality == "720p":
@@ -34,18 +41,29 @@ class OutputManager:
             cv2.namedWindow("AR_STREAM_WINDOW", cv2.WINDOW_NORMAL)
             print("Using Window Capture mode. Target 'AR_STREAM_WINDOW' in OBS.")
 
-    def display(self, frame):
+    def display(self, frame, ctx=None):
+        """
+        Args:
+            frame: Final BGR frame
+            ctx: FrameContext of the frame; its memoized RGB is reused for the vcam
+        """
+        start = time.perf_counter()
         if self.mode == "vcam":
             # Virtual camera expects RGB
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            frame_rgb = ctx.rgb if ctx is not None else cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             self.vcam.send(frame_rgb)
+            sent = time.perf_counter()
             self.vcam.sleep_until_next_frame()
+            self.last_pacing_seconds = time.perf_counter() - sent
+            start += self.last_pacing_seconds
 
             # Optional: Still show a local preview window so you can see yourself
             cv2.imshow("Preview (Hidden from OBS)", frame)
         else:
             # Standard Window mode
             cv2.imshow("AR_STREAM_WINDOW", frame)
+        self.last_display_seconds = time.perf_counter() - start
+        self.frames_sent += 1
 
     def stop(self):
         if self.vcam:
@@ -0,0 +1,187 @@
+"""
+Process Face Mesh
+FaceMesh într-un proces separat, ca inferența să nu concureze pentru GIL cu bucla de
+randare, HUD-ul și thread-urile listener-elor. Frame-urile trec prin sloturi
+multiprocessing.shared_memory (fără pickling), iar landmark-urile se întorc ca array
+float32 compact (n_faces, n_points, 3). Are același process() ca FaceMesh, deci e un
+înlocuitor direct în FaceTracker / AsyncFaceTracker; dacă procesul moare sau nu mai
+răspunde, e repornit la următorul frame (cu backoff dacă pică din nou). Pornirea nu
+blochează apelantul (bucla video, fără ASYNC_LANDMARKS): până când worker-ul anunță că
+e gata, process() returnează fără fețe.
+"""
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.LandmarkReplay import ReplayFaceLandmarks, ReplayResults, landmarks_array
+
+
+def _serve(conn, shm_name, slot_bytes, max_faces=1):
+    """Bucla procesului worker: citește frame-ul din slot, răspunde cu landmark-urile."""
+    from core.FaceTracker import create_face_mesh
+
+    face_mesh = create_face_mesh(max_faces)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    conn.send("ready")
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break  # Procesul principal a ieșit
+            if message is None:
+                break
+            if message[0] == "ring":
+                # Frame-urile au crescut: procesul principal a alocat un ring nou
+                shm.close()
+                shm = shared_memory.SharedMemory(name=message[1])
+                slot_bytes = message[2]
+                continue
+            _, slot, shape = message
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes)
+            conn.send(landmarks_array(face_mesh.process(frame)))
+            del frame  # Altfel shm.close() refuză (buffer exportat)
+    finally:
+        face_mesh.close()
+        shm.close()
+
+
+class ProcessFaceMesh:
+    def __init__(self, slots=2, timeout=2.0, startup_timeout=60.0, max_backoff=30.0, max_faces=1):
+        """
+        Args:
+            slots (int): Sloturi de frame în ring; frame-ul următor nu suprascrie slotul
+                         pe care un worker blocat (timeout) încă îl poate citi
+            timeout (float): Cât se așteaptă un răspuns pentru un frame înainte de restart
+            startup_timeout (float): Cât poate dura pornirea procesului (import + model);
+                                     între timp process() returnează fără fețe
+            max_backoff (float): Pauza maximă între reporniri când worker-ul pică repetat
+            max_faces (int): max_num_faces al modelului din worker
+        """
+        self.slots = slots
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.max_backoff = max_backoff
+        self.max_faces = max_faces
+
+        # spawn și pe Linux: fork după ce MediaPipe și listener-ele au pornit thread-uri nu e sigur
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._ready = False
+        self._ready_deadline = 0.0
+        self._shm = None
+        self._slot_bytes = 0
+        self._next_slot = 0
+        self._backoff = 1.0
+        self._retry_at = 0.0
+
+        self.starts_total = 0
+        self.restarts_total = 0
+
+    def _ensure_ring(self, nbytes):
+        if self._shm is not None and nbytes <= self._slot_bytes:
+            return
+        old = self._shm
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes * self.slots)
+        self._slot_bytes = nbytes
+        if self._conn is not None:
+            self._conn.send(("ring", self._shm.name, nbytes))
+        if old is not None:
+            old.close()
+            old.unlink()
+
+    def _start(self):
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(target=_serve, name="facemesh", daemon=True,
+                                              args=(child_conn, self._shm.name, self._slot_bytes, self.max_faces))
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        # Nu așteptăm aici "ready": importul și modelul pot dura secunde bune
+        self._ready = False
+        self._ready_deadline = time.monotonic() + self.startup_timeout
+
+    def _poll_ready(self):
+        """True după ce worker-ul a trimis "ready"; nu blochează."""
+        if self._conn.poll(0):
+            self._conn.recv()  # "ready"
+            self._ready = True
+            self.starts_total += 1
+            print(f"🧠 FaceMesh worker process started (pid {self._process.pid})")
+        elif time.monotonic() > self._ready_deadline:
+            raise TimeoutError(f"no answer after {self.startup_timeout:.0f}s")
+        return self._ready
+
+    def _stop(self):
+        self._ready = False
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.kill()
+            self._process.join(timeout=1.0)
+            self._process = None
+
+    def process(self, rgb_frame):
+        """
+        Args:
+            rgb_frame: Imaginea RGB uint8
+
+        Returns:
+            ReplayResults: Rezultat compatibil FaceMesh (.multi_face_landmarks);
+                           fără fețe cât timp worker-ul e indisponibil
+        """
+        if self._process is None and time.monotonic() < self._retry_at:
+            return ReplayResults([])
+
+        frame = np.ascontiguousarray(rgb_frame, dtype=np.uint8)
+        try:
+            self._ensure_ring(frame.nbytes)
+            if self._process is None:
+                self._start()
+            if not self._ready and not self._poll_ready():
+                return ReplayResults([])  # Worker-ul încă pornește
+            slot = self._next_slot
+            self._next_slot = (slot + 1) % self.slots
+            view = np.ndarray(frame.shape, dtype=np.uint8, buffer=self._shm.buf, offset=slot * self._slot_bytes)
+            np.copyto(view, frame)
+            del view
+            self._conn.send(("frame", slot, frame.shape))
+            if not self._conn.poll(self.timeout):
+                raise TimeoutError(f"no landmarks after {self.timeout:.1f}s")
+            points = self._conn.recv()
+        except (EOFError, OSError, TimeoutError) as e:
+            self._restart(e)
+            return ReplayResults([])
+
+        self._backoff = 1.0
+        if points is None:
+            return ReplayResults([])
+        return ReplayResults([ReplayFaceLandmarks(face) for face in points])
+
+    def _restart(self, error):
+        exit_code = self._process.exitcode if self._process is not None else None
+        self._stop()
+        self.restarts_total += 1
+        self._retry_at = time.monotonic() + self._backoff
+        print(f"⚠️ FaceMesh worker failed ({type(error).__name__}: {error}, exit code {exit_code}); "
+              f"restarting in {self._backoff:.0f}s")
+        self._backoff = min(self._backoff * 2, self.max_backoff)
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+        if self._process is not None:
+            self._process.join(timeout=1.0)
+        self._stop()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
@@ -0,0 +1,104 @@
+"""
+Profile Capture
+Capturează la cerere o fereastră de N secunde din bucla principală cu cProfile
+și un diff de snapshot-uri tracemalloc, apoi se oprește singur.
+Poate fi pornit din tastatură, semnal (SIGUSR1 / SIGBREAK) sau POST /profile.
+"""
+import cProfile
+import io
+import os
+import pstats
+import signal
+import time
+import tracemalloc
+
+
+class ProfileCapture:
+    def __init__(self, duration=10, output_dir="profiles"):
+        """
+        Args:
+            duration (float): Secunde profilate după fiecare cerere
+            output_dir (str): Folder-ul în care se scriu rapoartele
+        """
+        self.duration = duration
+        self.output_dir = output_dir
+
+        # Setat din alte thread-uri / signal handler, citit doar în bucla principală
+        self._requested = None
+        self._profiler = None
+        self._snapshot = None
+        self._started_tracemalloc = False
+        self._end_time = 0.0
+        self._stamp = ""
+
+    @property
+    def active(self):
+        return self._profiler is not None
+
+    def request(self, duration=None):
+        """Cere o captură; pornește la următorul frame. Sigur de apelat din orice thread."""
+        if self.active:
+            return False
+        self._requested = duration or self.duration
+        return True
+
+    def install_signal_handler(self):
+        """SIGUSR1 pe Linux/macOS, SIGBREAK (Ctrl+Break) pe Windows."""
+        sig = getattr(signal, "SIGUSR1", None) or getattr(signal, "SIGBREAK", None)
+        if sig is None:
+            return False
+        try:
+            signal.signal(sig, lambda signum, frame: self.request())
+        except ValueError:
+            return False  # Nu suntem în main thread
+        return True
+
+    def tick(self):
+        """Apelat o dată per frame din bucla principală."""
+        if self._profiler is not None:
+            if time.perf_counter() >= self._end_time:
+                self._stop()
+        elif self._requested:
+            self._start(self._requested)
+
+    def _start(self, duration):
+        self._requested = None
+        self._stamp = time.strftime("%Y%m%d_%H%M%S")
+        self._end_time = time.perf_counter() + duration
+
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start(10)
+        self._snapshot = tracemalloc.take_snapshot()
+
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        print(f"🔬 Profiling the next {duration:g}s...")
+
+    def _stop(self):
+        profiler, self._profiler = self._profiler, None
+        profiler.disable()
+
+        after = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"profile_{self._stamp}")
+
+        # Raw stats (snakeviz / pstats) + sumar text
+        profiler.dump_stats(base + ".prof")
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(40)
+        with open(base + ".txt", "w") as f:
+            f.write(text.getvalue())
+
+        # Diferența de memorie între începutul și sfârșitul ferestrei
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        diff = after.filter_traces(filters).compare_to(self._snapshot.filter_traces(filters), "lineno")
+        with open(base + ".mem.txt", "w") as f:
+            for stat in diff[:30]:
+                f.write(f"{stat}\n")
+        self._snapshot = None
+
+        print(f"🔬 Profile saved: {base}.prof, {base}.txt, {base}.mem.txt")
@@ -0,0 +1,115 @@
+"""
+Quality Governor
+Urmărește timpul de procesare per frame față de bugetul dat de target FPS și,
+cât timp un filtru e activ, coboară pe nivele de degradare; urcă înapoi cu
+histerezis când apare din nou marjă. Fiecare tranziție e logată.
+"""
+import time
+from collections import deque
+
+# warp_faces: câte fețe (în ordinea priorității) primesc efectele scumpe; None = toate
+FULL_QUALITY = {"inference_scale": 1.0, "landmark_skip": 0, "glow": True,
+                "cheap_smoothing": False, "simple_hud": False, "warp_faces": None}
+
+
+def _cumulative_levels(steps):
+    """Fiecare nivel păstrează degradările celui anterior."""
+    settings = dict(FULL_QUALITY)
+    levels = []
+    for name, change in steps:
+        settings = dict(settings, **change)
+        levels.append(dict(settings, name=name))
+    return levels
+
+
+# Ordinea: întâi ce nu se vede (inferență, HUD), apoi efectele vizibile
+QUALITY_LEVELS = _cumulative_levels([
+    ("full", {}),
+    ("inference 75%", {"inference_scale": 0.75}),
+    ("simple HUD", {"simple_hud": True}),
+    ("primary face warps only", {"warp_faces": 1}),
+    ("skip landmark frames", {"landmark_skip": 1}),
+    ("no mask glow", {"glow": False}),
+    ("cheap smoothing", {"cheap_smoothing": True}),
+    ("inference 50%", {"inference_scale": 0.5, "landmark_skip": 2}),
+])
+
+
+class QualityGovernor:
+    def __init__(self, target_fps, enabled=True, window=30, degrade_ratio=1.0, recover_ratio=0.7,
+                 degrade_hold=1.0, recover_hold=3.0):
+        """
+        Args:
+            target_fps (int): FPS-ul cerut; bugetul per frame este 1/target_fps
+            enabled (bool): False = rămâne mereu pe nivelul "full"
+            window (int): Frame-uri din media timpului de procesare
+            degrade_ratio (float): Coboară când media depășește buget * degrade_ratio
+            recover_ratio (float): Urcă doar când media scade sub buget * recover_ratio
+            degrade_hold, recover_hold (float): Secunde minime între tranziții în fiecare direcție
+        """
+        self.enabled = enabled
+        self.frame_budget = 1.0 / target_fps if target_fps else 0
+        self.degrade_ratio = degrade_ratio
+        self.recover_ratio = recover_ratio
+        self.degrade_hold = degrade_hold
+        self.recover_hold = recover_hold
+
+        self.level = 0
+        self.transitions_total = 0
+        self._samples = deque(maxlen=window)
+        self._last_change = time.perf_counter()
+
+    @property
+    def settings(self):
+        return QUALITY_LEVELS[self.level]
+
+    @property
+    def average_seconds(self):
+        samples = self._samples
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def update(self, frame_seconds, active):
+        """
+        Apelat o dată per frame cu timpul de procesare (fără așteptarea camerei / pacing).
+
+        Args:
+            frame_seconds (float): Durata procesării frame-ului curent
+            active (bool): Dacă rulează un filtru; fără filtru se revine la "full"
+
+        Returns:
+            bool: True dacă nivelul s-a schimbat (setările trebuie reaplicate)
+        """
+        if not self.enabled or not self.frame_budget:
+            return False
+
+        if not active:
+            self._samples.clear()
+            if self.level:
+                return self._set_level(0, "no active filter")
+            return False
+
+        self._samples.append(frame_seconds)
+        if len(self._samples) < self._samples.maxlen:
+            return False  # Așteptăm o fereastră completă după fiecare schimbare
+
+        average = self.average_seconds
+        held = time.perf_counter() - self._last_change
+        if average > self.frame_budget * self.degrade_ratio and held >= self.degrade_hold:
+            if self.level < len(QUALITY_LEVELS) - 1:
+                return self._set_level(self.level + 1, self._reason(average, ">"))
+        elif average < self.frame_budget * self.recover_ratio and held >= self.recover_hold:
+            if self.level > 0:
+                return self._set_level(self.level - 1, self._reason(average, "<"))
+        return False
+
+    def _reason(self, average, op):
+        return f"avg {average * 1000:.1f} ms {op} budget {self.frame_budget * 1000:.1f} ms"
+
+    def _set_level(self, level, reason):
+        arrow = "↓" if level > self.level else "↑"
+        self.level = level
+        self.transitions_total += 1
+        self._samples.clear()
+        self._last_change = time.perf_counter()
+        print(f"⚙️ Quality {arrow} level {level} ({QUALITY_LEVELS[level]['name']}): {reason}")
+        return True
@@ -0,0 +1,71 @@
+"""
+Runtime Stats
+Contoare ieftine actualizate o dată per frame (FPS, frame-uri întârziate,
+timp de randare per filtru), citite de MetricsServer.
+"""
+import threading
+import time
+from collections import deque
+
+
+class RuntimeStats:
+    def __init__(self, target_fps, window=120):
+        """
+        Args:
+            target_fps (int): FPS-ul cerut camerei; un frame mai lent decât 1/target_fps e "dropped"
+            window (int): Numărul de frame-uri pentru FPS-ul mediu (rolling)
+        """
+        self.target_fps = target_fps
+        self.frame_budget = 1.0 / target_fps if target_fps else 0
+
+        self.frames_total = 0
+        self.frames_dropped = 0
+        self.capture_failures = 0
+        self.current_fps = 0.0
+
+        self._frame_stamps = deque(maxlen=window)
+        self._last_frame = None
+
+        # {filter_name: [frames, total_seconds, last_seconds]}
+        self.filter_render = {}
+        # Scrape-ul MetricsServer citește din alt thread decât cel de randare
+        self._lock = threading.Lock()
+
+    def frame_done(self):
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            interval = now - self._last_frame
+            if interval > 0:
+                self.current_fps = 1.0 / interval
+            if self.frame_budget and interval > self.frame_budget * 1.5:
+                self.frames_dropped += 1
+        self._last_frame = now
+        self._frame_stamps.append(now)
+        self.frames_total += 1
+
+    def filter_rendered(self, name, seconds):
+        with self._lock:
+            entry = self.filter_render.get(name)
+            if entry is None:
+                entry = self.filter_render[name] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = seconds
+
+    def snapshot(self):
+        """
+        Copie consistentă a timpilor de randare, sigură de citit din alt thread.
+
+        Returns:
+            dict: {filter_name: (frames, total_seconds, last_seconds)}
+        """
+        with self._lock:
+            return {name: tuple(entry) for name, entry in self.filter_render.items()}
+
+    @property
+    def rolling_fps(self):
+        stamps = self._frame_stamps
+        if len(stamps) < 2:
+            return 0.0
+        span = stamps[-1] - stamps[0]
+        return (len(stamps) - 1) / span if span > 0 else 0.0
@@ -0,0 +1,94 @@
+"""
+Startup Timer
+Măsoară bugetul de pornire (importuri, deschiderea camerei, primul frame,
+încărcarea modelelor) și produce breakdown-ul pentru --startup-profile.
+"""
+import re
+import subprocess
+import sys
+import threading
+import time
+
+
+class StartupTimer:
+    def __init__(self, t0=None):
+        """
+        Args:
+            t0 (float): time.perf_counter() de la începutul procesului; implicit acum
+        """
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self._last = self.t0
+        self._lock = threading.Lock()
+        self.phases = []  # [(name, seconds)]
+        self.reported = False
+
+    def mark(self, name):
+        """Încheie o etapă secvențială: tot timpul de la ultimul mark îi aparține."""
+        now = time.perf_counter()
+        with self._lock:
+            self.phases.append((name, now - self._last))
+            self._last = now
+
+    def add(self, name, seconds):
+        """Adaugă o durată măsurată separat (ex. încărcarea unui model pe alt thread)."""
+        with self._lock:
+            self.phases.append((name, seconds))
+
+    def report(self):
+        """Afișează bugetul de pornire o singură dată (la primul frame)."""
+        if self.reported:
+            return
+        self.reported = True
+        total = time.perf_counter() - self.t0
+        print("\n" + "—" * 45)
+        print(f"⏱️  STARTUP: first frame after {total:.2f}s")
+        print("—" * 45)
+        with self._lock:
+            for name, seconds in self.phases:
+                print(f"   {name:<28}{seconds * 1000:9.0f} ms")
+        print("—" * 45 + "\n")
+
+
+def import_breakdown(modules, top=15):
+    """
+    Rulează un interpretor nou cu -X importtime și returnează timpul cumulat per modul cerut
+    plus cele mai scumpe importuri individuale.
+
+    Returns:
+        tuple: ([(module, cumulative_seconds)], [(module, self_seconds)])
+    """
+    code = "; ".join(f"import {name}" for name in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True)
+
+    cumulative = {}
+    self_times = []
+    pattern = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+    for line in proc.stderr.splitlines():
+        match = pattern.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        self_times.append((name, int(self_us) / 1e6))
+        if name in modules:
+            cumulative[name] = int(cumulative_us) / 1e6
+
+    if proc.returncode != 0:
+        print(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+
+    ordered = [(name, cumulative.get(name, 0.0)) for name in modules]
+    heaviest = sorted(self_times, key=lambda item: item[1], reverse=True)[:top]
+    return ordered, heaviest
+
+
+def print_import_breakdown(modules):
+    ordered, heaviest = import_breakdown(modules)
+    print("\n" + "—" * 45)
+    print("📦 IMPORT TIME (cumulative, fresh interpreter)")
+    print("—" * 45)
+    for name, seconds in ordered:
+        print(f"   {name:<40}{seconds * 1000:9.0f} ms")
+    print("\n🐢 Heaviest individual modules (self time)")
+    for name, seconds in heaviest:
+        print(f"   {name:<40}{seconds * 1000:9.0f} ms")
+    print("—" * 45)
@@ -0,0 +1,119 @@
+"""
+Sticker Atlas
+Toate imaginile stickerelor (BGRA premultiplicat, din core.AssetCache) împachetate într-o
+textură comună, păstrată și ea în cache-ul de assets; fiecare sticker e un view în ea.
+Variantele scalate / rotite se calculează din view și se păstrează într-un cache LRU.
+"""
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class StickerAtlas:
+    PADDING = 2  # Pixeli transparenți între imagini
+
+    def __init__(self, images, cache_size=32, texture=None):
+        """
+        Args:
+            images (dict): nume -> imagine BGRA premultiplicată (core.AssetCache.premultiply)
+            cache_size (int): Variante scalate păstrate (pentru toate stickerele)
+            texture: Textura deja împachetată (din AssetCache); altfel se împachetează acum
+        """
+        self.rects, size = self.layout({name: image.shape[:2] for name, image in images.items()})
+        if texture is None or texture.shape[:2] != size:
+            texture = self.pack(images, self.rects, size)
+        self.texture = texture
+
+        self.cache_size = cache_size
+        self._variants = OrderedDict()  # (nume, lățime, unghi) -> (premultiplied BGR, 255 - alpha)
+
+    @classmethod
+    def layout(cls, shapes):
+        """
+        Rafturi: imaginile, de la cea mai înaltă, puse de la stânga la dreapta.
+
+        Args:
+            shapes (dict): nume -> (înălțime, lățime)
+
+        Returns:
+            tuple: ({nume: (x, y, w, h)}, (înălțimea, lățimea texturii))
+        """
+        pad = cls.PADDING
+        order = sorted(shapes, key=lambda name: shapes[name][0], reverse=True)
+        width = max(max(w for _, w in shapes.values()), int(np.sqrt(sum(h * w for h, w in shapes.values()))))
+        rects = {}
+        x = y = shelf_height = 0
+        for name in order:
+            h, w = shapes[name]
+            if x and x + w > width:
+                x, y, shelf_height = 0, y + shelf_height + pad, 0
+            rects[name] = (x, y, w, h)
+            x += w + pad
+            shelf_height = max(shelf_height, h)
+        return rects, (y + shelf_height, width)
+
+    @staticmethod
+    def pack(images, rects, size):
+        texture = np.zeros(size + (4,), dtype=np.uint8)
+        for name, (x, y, w, h) in rects.items():
+            texture[y:y + h, x:x + w] = images[name]
+        return texture
+
+    @classmethod
+    def load(cls, paths, assets, **kwargs):
+        """
+        Args:
+            paths (dict): nume -> fișier PNG (relativ la assets/ sau cale absolută)
+            assets (AssetCache): De unde vin imaginile decodate și textura împachetată
+        """
+        images = {name: assets.image(path) for name, path in paths.items()}
+        rects, size = cls.layout({name: image.shape[:2] for name, image in images.items()})
+        texture = assets.derived("sticker-atlas", list(paths.values()), lambda: cls.pack(images, rects, size))
+        return cls(images, texture=texture, **kwargs)
+
+    def image(self, name):
+        """Imaginea BGRA premultiplicată a stickerului (view în textură)."""
+        x, y, w, h = self.rects[name]
+        return self.texture[y:y + h, x:x + w]
+
+    def variant(self, name, width, angle=0):
+        """
+        Stickerul scalat la `width` și rotit cu `angle` grade (în sensul acelor de ceasornic,
+        pe un canvas mărit ca să nu fie tăiat), premultiplicat, plus inversul alpha (3 canale).
+
+        Args:
+            name (str): Numele stickerului
+            width (int): Lățimea înainte de rotire (rotunjită de apelant, ca tremurul să nu forțeze resize)
+            angle (int): Unghiul, deja cuantizat de apelant
+
+        Returns:
+            tuple: (premultiplied BGR, 255 - alpha) ca uint8
+        """
+        key = (name, width, angle)
+        cached = self._variants.get(key)
+        if cached is not None:
+            self._variants.move_to_end(key)
+            return cached
+
+        image = self.image(name)
+        img_h, img_w = image.shape[:2]
+        height = int(img_h * width / img_w)
+        # Textura e deja premultiplicată: resize-ul și rotirea amestecă marginile cu transparent corect
+        scaled = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+
+        if angle:
+            matrix = cv2.getRotationMatrix2D((width / 2, height / 2), -angle, 1.0)
+            cos, sin = abs(matrix[0, 0]), abs(matrix[0, 1])
+            box_w, box_h = int(height * sin + width * cos) + 1, int(height * cos + width * sin) + 1
+            matrix[0, 2] += (box_w - width) / 2
+            matrix[1, 2] += (box_h - height) / 2
+            scaled = cv2.warpAffine(scaled, matrix, (box_w, box_h))
+
+        premultiplied = cv2.cvtColor(scaled, cv2.COLOR_BGRA2BGR)
+        alpha = cv2.cvtColor(scaled[:, :, 3], cv2.COLOR_GRAY2BGR)
+        cached = (premultiplied, cv2.bitwise_not(alpha))
+        self._variants[key] = cached
+        if len(self._variants) > self.cache_size:
+            self._variants.popitem(last=False)
+        return cached
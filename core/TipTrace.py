@@ -0,0 +1,87 @@
+"""
+Tip Latency Tracing
+Fiecare tip poartă timestamp-uri de la primirea în listener până la predarea
+frame-ului către OutputManager; duratele intră în histograme per platformă.
+"""
+import threading
+import time
+
+# Etapele, în ordinea în care le parcurge un tip
+STAGES = ("received", "normalized", "processed", "queued", "activated", "rendered", "displayed")
+
+# (segment, etapa de start, etapa de final)
+SEGMENTS = (
+    ("normalize", "received", "normalized"),
+    ("process_tip", "normalized", "processed"),
+    ("queue_insert", "processed", "queued"),
+    ("queue_wait", "queued", "activated"),
+    ("first_render", "activated", "rendered"),
+    ("display", "rendered", "displayed"),
+    ("total", "received", "displayed"),
+)
+
+
+class TipTrace:
+    __slots__ = ("platform", "stamps")
+
+    def __init__(self, platform, received=None):
+        """
+        Args:
+            platform (str): Platforma de pe care a venit tipul (sau "keyboard")
+            received (float): time.perf_counter() la primirea răspunsului API; implicit acum
+        """
+        self.platform = platform
+        self.stamps = {"received": received if received is not None else time.perf_counter()}
+
+    def mark(self, stage):
+        """Notează momentul unei etape; doar prima apariție contează."""
+        if stage not in self.stamps:
+            self.stamps[stage] = time.perf_counter()
+
+    def has(self, stage):
+        return stage in self.stamps
+
+    def segments(self):
+        """Returnează {segment: secunde} pentru etapele deja atinse."""
+        stamps = self.stamps
+        return {name: stamps[end] - stamps[start]
+                for name, start, end in SEGMENTS if start in stamps and end in stamps}
+
+
+class TipLatencyHistograms:
+    # Limitele bucket-urilor în secunde: de la operații in-process până la așteptare lungă în coadă
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}  # (platform, segment) -> [bucket_counts, sum, count]
+
+    def record(self, trace):
+        """Adaugă toate segmentele unui trace complet în histograme."""
+        segments = trace.segments()
+        with self._lock:
+            for segment, seconds in segments.items():
+                key = (trace.platform, segment)
+                entry = self._data.get(key)
+                if entry is None:
+                    entry = self._data[key] = [[0] * len(self.BUCKETS), 0.0, 0]
+                for i, bound in enumerate(self.BUCKETS):
+                    if seconds <= bound:
+                        entry[0][i] += 1
+                entry[1] += seconds
+                entry[2] += 1
+        return segments
+
+    def metric_families(self):
+        """Familii pentru MetricsServer.format_metrics(), cu sample-uri _bucket/_sum/_count."""
+        samples = []
+        with self._lock:
+            for (platform, segment), (buckets, total, count) in sorted(self._data.items()):
+                labels = {"platform": platform, "segment": segment}
+                for bound, bucket_count in zip(self.BUCKETS, buckets):
+                    samples.append(("_bucket", dict(labels, le=f"{bound:g}"), bucket_count))
+                samples.append(("_bucket", dict(labels, le="+Inf"), count))
+                samples.append(("_sum", labels, total))
+                samples.append(("_count", labels, count))
+        return [("ar_tip_latency_seconds", "histogram",
+                 "Time between tip pipeline stages, from listener receipt to output", samples)]
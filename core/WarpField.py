@@ -0,0 +1,142 @@
+"""
+Warp Field
+Deformări locale ancorate pe landmarks (bulge, pinch, shift, slim) adunate într-un singur
+câmp de deplasare rar și aplicate cu un singur cv2.remap per grup de zone care se suprapun.
+Hărțile de remap acoperă doar cutiile deformărilor, nu tot frame-ul: ochii mari, fața
+subțiată și gura mare ale aceleiași fețe costă împreună o singură trecere.
+"""
+import cv2
+import numpy as np
+
+
+def _bulge(map_x, map_y, cx, cy, radius, strength):
+    """Mărește (strength > 0) sau micșorează (strength < 0) conținutul din cerc."""
+    dx, dy = map_x - cx, map_y - cy
+    distance = np.sqrt(dx ** 2 + dy ** 2)
+    mask = distance < radius
+    ratio = distance / radius
+    if strength < 0:
+        np.maximum(ratio, 1e-3, out=ratio)  # Pinch: fără 0 ** negativ în centru
+    rescale = np.power(ratio, strength)
+    map_x[mask] = cx + dx[mask] * rescale[mask]
+    map_y[mask] = cy + dy[mask] * rescale[mask]
+
+
+def _shift(map_x, map_y, cx, cy, radius, vx, vy):
+    """Mută conținutul din cerc cu (vx, vy) în centru, cu atenuare netedă spre margine."""
+    dx, dy = map_x - cx, map_y - cy
+    distance = (dx ** 2 + dy ** 2) / radius ** 2
+    mask = distance < 1
+    falloff = (1 - distance[mask]) ** 2
+    map_x[mask] -= vx * falloff
+    map_y[mask] -= vy * falloff
+
+
+class WarpField:
+    def __init__(self):
+        # (cutie x1, y1, x2, y2 în coordonatele frame-ului, funcție, parametri), în ordinea adăugării;
+        # fiecare deformare se aplică peste hărțile lăsate de cele dinainte
+        self.deformations = []
+
+    def __len__(self):
+        return len(self.deformations)
+
+    def bulge(self, center, radius, strength):
+        """
+        Lentilă convexă (ex. ochii mari): conținutul din centru se mărește.
+
+        Args:
+            center: (x, y) în pixeli
+            radius (float): Raza în pixeli
+            strength (float): Exponentul distanței; 0 = fără efect, negativ = pinch
+        """
+        cx, cy = float(center[0]), float(center[1])
+        box = (int(cx - radius), int(cy - radius), int(cx + radius) + 2, int(cy + radius) + 2)
+        self.deformations.append((box, _bulge, (cx, cy, radius, strength)))
+
+    def pinch(self, center, radius, strength):
+        """Opusul lui bulge: conținutul din cerc se strânge spre centru (0 < strength < 1)."""
+        self.bulge(center, radius, -strength)
+
+    def shift(self, center, radius, vector):
+        """
+        Împinge conținutul din jurul centrului cu `vector` pixeli (efect de liquify).
+
+        Args:
+            center: (x, y) în pixeli
+            radius (float): Raza zonei afectate
+            vector: (vx, vy), deplasarea în centru (mai mică decât raza)
+        """
+        cx, cy = float(center[0]), float(center[1])
+        vx, vy = float(vector[0]), float(vector[1])
+        # Cutia acoperă și de unde se citește (centru - vector), pentru deformările care urmează
+        reach = radius + max(abs(vx), abs(vy))
+        box = (int(cx - reach), int(cy - reach), int(cx + reach) + 2, int(cy + reach) + 2)
+        self.deformations.append((box, _shift, (cx, cy, radius, vx, vy)))
+
+    def slim(self, center, target, radius, amount):
+        """
+        Trage conturul din `center` spre `target` (ex. obrazul spre nas) cu fracțiunea `amount`
+        din distanța dintre ele.
+        """
+        self.shift(center, radius, ((target[0] - center[0]) * amount, (target[1] - center[1]) * amount))
+
+    @staticmethod
+    def _clusters(boxes):
+        """Grupuri de cutii care se suprapun (indici în ordinea adăugării) și cutia fiecărui grup."""
+        clusters = [([index], box) for index, box in enumerate(boxes)]
+        # Cutia unui grup crește la fiecare unire și poate ajunge peste un grup deja verificat:
+        # se repetă până nu se mai unește nimic
+        changed = True
+        while changed:
+            changed = False
+            merged = []
+            for members, (x1, y1, x2, y2) in clusters:
+                for position, (other, (cx1, cy1, cx2, cy2)) in enumerate(merged):
+                    if cx1 < x2 and x1 < cx2 and cy1 < y2 and y1 < cy2:
+                        merged[position] = (other + members,
+                                            (min(x1, cx1), min(y1, cy1), max(x2, cx2), max(y2, cy2)))
+                        changed = True
+                        break
+                else:
+                    merged.append((members, (x1, y1, x2, y2)))
+            clusters = merged
+        return [(sorted(members), box) for members, box in clusters]
+
+    def apply(self, frame):
+        """
+        Aplică toate deformările, in-place, cu câte un remap per grup de cutii suprapuse.
+
+        Args:
+            frame: Frame-ul BGR (modificat in-place)
+
+        Returns:
+            Frame-ul primit
+        """
+        h, w = frame.shape[:2]
+        boxes = [(max(0, x1), max(0, y1), min(w, x2), min(h, y2)) for (x1, y1, x2, y2), _, _ in self.deformations]
+        valid = [index for index, (x1, y1, x2, y2) in enumerate(boxes) if x2 > x1 and y2 > y1]
+
+        for members, (x1, y1, x2, y2) in self._clusters([boxes[index] for index in valid]):
+            map_x, map_y = np.meshgrid(np.arange(x1, x2, dtype=np.float32), np.arange(y1, y2, dtype=np.float32))
+            done = []
+            for member in members:
+                ex1, ey1, ex2, ey2 = boxes[valid[member]]
+                # În afară de cutia proprie, deformarea poate atinge pixelii mutați de una anterioară
+                # care o suprapune (hărțile lor au fost trase spre ea)
+                for bx1, by1, bx2, by2 in done:
+                    if bx1 < ex2 and ex1 < bx2 and by1 < ey2 and ey1 < by2:
+                        ex1, ey1, ex2, ey2 = min(ex1, bx1), min(ey1, by1), max(ex2, bx2), max(ey2, by2)
+                done.append((ex1, ey1, ex2, ey2))
+                _, function, params = self.deformations[valid[member]]
+                function(map_x[ey1 - y1:ey2 - y1, ex1 - x1:ex2 - x1], map_y[ey1 - y1:ey2 - y1, ex1 - x1:ex2 - x1],
+                         *params)
+
+            # Sursa e o copie a cutiei (remap-ul scrie înapoi în aceiași pixeli)
+            source = frame[y1:y2, x1:x2].copy()
+            map_x -= x1
+            map_y -= y1
+            cv2.remap(source, map_x, map_y, cv2.INTER_LINEAR, dst=frame[y1:y2, x1:x2],
+                      borderMode=cv2.BORDER_REPLICATE)
+        self.deformations = []
+        return frame
@@ -1,87 +1,142 @@
-import math
-
 import cv2
-import mediapipe as mp
 import numpy as np
 
-class BigEyeFilter:
-    def __init__(self):
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face_mesh.FaceMesh(refine_landmarks=True)
-        # Landmarks for left eye center (468) and right eye center (473)
-        self.eye_indices = [468, 473]
-
-    def _smooth_skin(self, frame, results):
-        if not results.multi_face_landmarks:
-            return frame
+from core.BufferPool import BufferPool
+from core.FaceBudget import FaceBudget
+from core.FaceLandmarks import EYE_CENTERS, FACE_OVAL, LEFT_EYE, LIPS, RIGHT_EYE
+from core.FaceTracker import FaceTracker, create_face_mesh
+from core.FrameContext import FrameContext
+from core.WarpField import WarpField
 
-        # 1. Create a strong blur of the whole image
-        # Bilateral is slow but beautiful; we use a faster approximation here:
-        # Gaussian blur + a high-pass filter trick
-        smooth = cv2.bilateralFilter(frame, 5, 75, 75)
 
-        # 2. Create a mask for the skin area only
+class BigEyeFilter:
+    # Read by core.FilterPlugin without importing this module (see the keys documented there)
+    PLUGIN = {
+        "name": "Big Eyes",
+        "tokens": 99,
+        "duration": 20,
+        "layer": "warp",
+        "landmarks": ("FACE_OVAL", "LEFT_EYE", "RIGHT_EYE", "LIPS", "EYE_CENTERS"),
+        "roi_only": True,   # Smoothing and remap only touch the face and eye boxes
+        "in_place": True,   # The remap reads from a copy of its box (see core.WarpField)
+        "cost_ms": 5.0,
+    }
+
+    # Pixels around the face box that the smoothing kernels need as real neighbours
+    SMOOTH_PAD = 4
+
+    def __init__(self, face_mesh=None, buffer_pool=None):
+        """
+        Args:
+            face_mesh: Optional landmark source with a FaceMesh-compatible process()
+                       (e.g. ReplayFaceMesh, or the app's shared FaceTracker);
+                       a MediaPipe FaceMesh is created otherwise
+            buffer_pool: BufferPool for the full-frame scratch buffers (the app shares one)
+        """
+        if face_mesh is None:
+            face_mesh = create_face_mesh()
+        self.face_mesh = face_mesh if isinstance(face_mesh, FaceTracker) else FaceTracker(face_mesh)
+        self.buffers = buffer_pool if buffer_pool is not None else BufferPool()
+        # Bilateral skin smoothing; the quality governor can swap it for a cheaper Gaussian blur
+        self.cheap_smoothing = False
+        # Kept sharp inside the smoothed skin
+        self.features = (LEFT_EYE, RIGHT_EYE, LIPS)
+        # Faces are rendered primary first while they fit the per-frame budget;
+        # under load only the first warp_faces of them get the eye warp (None = all)
+        self.face_budget = FaceBudget()
+        self.warp_faces = None
+
+    def set_quality(self, settings):
+        """Applies a QualityGovernor level (inference scale, landmark skipping, smoothing, face budget)."""
+        self.face_mesh.set_quality(settings)
+        self.cheap_smoothing = settings["cheap_smoothing"]
+        self.warp_faces = settings["warp_faces"]
+        self.face_budget.seconds = settings.get("face_budget")
+
+    def _smooth_skin(self, frame, pixels):
+        """Smooths the face ovals (minus eyes and mouth) in place, touching only the face box."""
         h, w = frame.shape[:2]
-        mask = np.zeros((h, w), dtype=np.uint8)
-
-        # This list of landmarks outlines the face "oval"
-        face_oval = [10, 338, 297, 332, 284, 251, 389, 356, 454, 323, 361, 288,
-                     397, 365, 379, 378, 400, 377, 152, 148, 176, 149, 150, 136,
-                     172, 58, 132, 93, 234, 127, 162, 21, 54, 103, 67, 109]
-
-        for face_landmarks in results.multi_face_landmarks:
-            points = []
-            for idx in face_oval:
-                lm = face_landmarks.landmark[idx]
-                points.append([int(lm.x * w), int(lm.y * h)])
-
-            # Fill the face oval with white on the mask
-            cv2.fillPoly(mask, [np.array(points)], 255)
-
+        faces = []
+        for face in pixels.astype(np.int32):
+            faces.append((face[FACE_OVAL], [face[feature] for feature in self.features]))
+
+        # Union of the face ovals, padded so the kernels see the same neighbours as on the full frame
+        ovals = np.concatenate([oval for oval, _ in faces])
+        pad = self.SMOOTH_PAD
+        x1, y1 = np.maximum(ovals.min(axis=0) - pad, 0)
+        x2, y2 = np.minimum(ovals.max(axis=0) + pad + 1, (w, h))
+        if x2 <= x1 or y2 <= y1:
+            return frame
+        offset = np.array([x1, y1], dtype=np.int32)
+
+        # 1. Smooth the face box only
+        # Bilateral is slow but beautiful; the quality governor can switch to a Gaussian blur
+        smooth = self.buffers.like(frame)
+        roi = frame[y1:y2, x1:x2]
+        smooth_roi = smooth[y1:y2, x1:x2]
+        if self.cheap_smoothing:
+            cv2.GaussianBlur(roi, (7, 7), 0, dst=smooth_roi)
+        else:
+            cv2.bilateralFilter(roi, 5, 75, 75, dst=smooth_roi)
+
+        # 2. Create a mask for the skin area only (face "oval" minus eyes and mouth)
+        mask = self.buffers.acquire((h, w))
+        mask_roi = mask[y1:y2, x1:x2]
+        mask_roi[:] = 0
+        for oval, features in faces:
+            cv2.fillPoly(mask_roi, [oval - offset], 255)
             # Subtract the eyes and mouth from the mask so they stay sharp
-            for feature in [self.mp_face_mesh.FACEMESH_LEFT_EYE,
-                            self.mp_face_mesh.FACEMESH_RIGHT_EYE,
-                            self.mp_face_mesh.FACEMESH_LIPS]:
-                feature_pts = []
-                for connection in feature:
-                    lm = face_landmarks.landmark[connection[0]]
-                    feature_pts.append([int(lm.x * w), int(lm.y * h)])
-                cv2.fillPoly(mask, [np.array(feature_pts)], 0)
-
-        # 3. Blend the smooth skin with the original
-        # This makes it look realistic rather than "plastic"
-        mask_3ch = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR) / 255.0
-        output = (frame * (1 - mask_3ch) + smooth * mask_3ch).astype(np.uint8)
-        return output
-
-    def apply(self, frame, strength=0.35, radius=70):
-        h, w = frame.shape[:2]
-        rgb_frame = np.ascontiguousarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), dtype=np.uint8)
-        results = self.face_mesh.process(rgb_frame)
-
-        if not results.multi_face_landmarks:
+            for feature_pts in features:
+                cv2.fillPoly(mask_roi, [feature_pts - offset], 0)
+
+        # 3. Copy the smooth skin over the original (the mask is binary, so this equals the blend)
+        cv2.copyTo(smooth_roi, mask_roi, roi)
+
+        self.buffers.release(mask)
+        self.buffers.release(smooth)
+        return frame
+
+    @staticmethod
+    def _warp_eyes(field, pixels, strength, radius):
+        """Adds a bulge around both eye centers of the face to the warp field."""
+        for center in pixels[:, EYE_CENTERS].reshape(-1, 2):
+            field.bulge(center, radius, strength)
+
+    def apply(self, frame, strength=0.35, radius=70, ctx=None, dst=None):
+        """
+        Args:
+            frame: BGR frame
+            strength, radius: Eye bulge strength and radius in pixels
+            ctx: FrameContext shared with the rest of the pipeline (RGB and landmarks computed once)
+            dst: Output buffer with the frame's shape (may be the frame itself); allocated if None
+
+        Returns:
+            The filtered frame (dst), or the input frame when no face is found
+        """
+        if ctx is None:
+            ctx = FrameContext(frame, tracker=self.face_mesh)
+        pixels = ctx.landmark_pixels
+
+        if pixels is None:
             return frame
 
-        # FIRST: Smooth the skin
-        frame = self._smooth_skin(frame, results)
-
-        # SECOND: Do the Big Eyes Remap
-        map_x, map_y = np.meshgrid(np.arange(w), np.arange(h))
-        map_x = map_x.astype(np.float32)
-        map_y = map_y.astype(np.float32)
-
-        for face_landmarks in results.multi_face_landmarks:
-            for idx in [468, 473]:
-                lm = face_landmarks.landmark[idx]
-                cx, cy = lm.x * w, lm.y * h
-                dx, dy = map_x - cx, map_y - cy
-                distance = np.sqrt(dx ** 2 + dy ** 2)
-                mask = distance < radius
-                rescale = np.power(distance / radius, strength)
-                map_x[mask] = cx + dx[mask] * rescale[mask]
-                map_y[mask] = cy + dy[mask] * rescale[mask]
-
-        final_map_x = np.ascontiguousarray(map_x, dtype=np.float32)
-        final_map_y = np.ascontiguousarray(map_y, dtype=np.float32)
-
-        return cv2.remap(frame, final_map_x, final_map_y, cv2.INTER_LINEAR)
+        if dst is None:
+            dst = frame.copy()
+        elif dst is not frame:
+            np.copyto(dst, frame)
+
+        # Faces come in priority order; the budget stops before the ones that no longer fit
+        for rank in self.face_budget.faces(len(pixels)):
+            face = pixels[rank:rank + 1]
+
+            # FIRST: Smooth the skin
+            self._smooth_skin(dst, face)
+
+            # SECOND: Do the Big Eyes Remap (the expensive part, primary faces only under load).
+            # Next to other warp filters the stack collects every bulge in ctx.warp and remaps once
+            if self.warp_faces is None or rank < self.warp_faces:
+                field = ctx.warp if ctx.warp is not None else WarpField()
+                self._warp_eyes(field, face, strength, radius)
+                if ctx.warp is None:
+                    field.apply(dst)
+        return dst
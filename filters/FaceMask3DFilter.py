@@ -1,59 +1,96 @@
-import math
 import time
 
 import cv2
-import mediapipe as mp
 import numpy as np
 
+from core.BufferPool import BufferPool
+from core.FaceBudget import FaceBudget
+from core.FaceLandmarks import TESSELATION
+from core.FaceTracker import FaceTracker, create_face_mesh
+from core.FrameContext import FrameContext
+
 
 class FaceMask3D:
-    def __init__(self):
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face_mesh.FaceMesh(refine_landmarks=True)
+    # Read by core.FilterPlugin without importing this module (see the keys documented there)
+    PLUGIN = {
+        "name": "Cyber Mask",
+        "tokens": 200,
+        "duration": 30,
+        "layer": "mesh",
+        "landmarks": ("TESSELATION",),
+        "in_place": True,   # Lines go to the trail canvas; the frame is only blended per pixel
+        "cost_ms": 18.0,
+    }
+
+    def __init__(self, face_mesh=None, buffer_pool=None):
+        """
+        Args:
+            face_mesh: Optional landmark source with a FaceMesh-compatible process()
+                       (e.g. ReplayFaceMesh, or the app's shared FaceTracker);
+                       a MediaPipe FaceMesh is created otherwise
+            buffer_pool: BufferPool for the glow scratch buffer (the app shares one)
+        """
+        if face_mesh is None:
+            face_mesh = create_face_mesh()
+        self.face_mesh = face_mesh if isinstance(face_mesh, FaceTracker) else FaceTracker(face_mesh)
+        self.buffers = buffer_pool if buffer_pool is not None else BufferPool()
+        self.glow_enabled = True  # Turned off by the quality governor under load
         self.trail_canvas = None
-        self.connections = self.mp_face_mesh.FACEMESH_TESSELATION
+        self.connections = TESSELATION
+        # Meshes are drawn primary face first while they fit the per-frame budget
+        self.face_budget = FaceBudget()
+
+    def set_quality(self, settings):
+        """Applies a QualityGovernor level (inference scale, landmark skipping, glow, face budget)."""
+        self.face_mesh.set_quality(settings)
+        self.glow_enabled = settings["glow"]
+        self.face_budget.seconds = settings.get("face_budget")
 
-    def apply(self, frame):
+    def apply(self, frame, ctx=None, dst=None):
+        """
+        Args:
+            frame: BGR frame
+            ctx: FrameContext shared with the rest of the pipeline (RGB and landmarks computed once)
+            dst: Output buffer with the frame's shape (may be the frame itself); allocated if None
+        """
         h, w, _ = frame.shape
-        if self.trail_canvas is None:
+        if self.trail_canvas is None or self.trail_canvas.shape != frame.shape:
             self.trail_canvas = np.zeros_like(frame)
 
-        # 1. Faster fade to keep it clean (0.65)
-        self.trail_canvas = cv2.addWeighted(self.trail_canvas, 0.65, self.trail_canvas, 0, 0)
+        # 1. Faster fade to keep it clean (0.65), in place
+        cv2.addWeighted(self.trail_canvas, 0.65, self.trail_canvas, 0, 0, dst=self.trail_canvas)
 
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.face_mesh.process(rgb_frame)
+        if ctx is None:
+            ctx = FrameContext(frame, tracker=self.face_mesh)
+        points, pixels = ctx.landmark_points, ctx.landmark_pixels
 
         # Use time to drive the color shift
         t = time.time() * 2  # Adjust the '2' to speed up or slow down the cycle
 
-        if results.multi_face_landmarks:
-            for face_landmarks in results.multi_face_landmarks:
-                for connection in self.connections:
-                    p1_idx, p2_idx = connection
-                    p1 = face_landmarks.landmark[p1_idx]
-                    p2 = face_landmarks.landmark[p2_idx]
+        if pixels is not None:
+            starts, ends = self.connections[:, 0], self.connections[:, 1]
+            for rank in self.face_budget.faces(len(pixels)):
+                face_points, face_pixels = points[rank], pixels[rank].astype(np.int32)
+                # 2. THE GRADIENT MATH, for every edge at once
+                # We create a shifting hue based on time and the vertical (y) position
+                # This makes the color "flow" down your face
+                hue_shift = face_points[starts, 1].astype(np.float64) * 3.14 + t
 
-                    pt1 = (int(p1.x * w), int(p1.y * h))
-                    pt2 = (int(p2.x * w), int(p2.y * h))
+                # Generate dynamic BGR colors using sine waves, dimmed for slimness
+                colors = ((np.sin(hue_shift[:, None] + (4, 2, 0)) * 127 + 128) * 0.6).astype(np.int32)
 
-                    # 2. THE GRADIENT MATH
-                    # We create a shifting hue based on time and the vertical (y) position
-                    # This makes the color "flow" down your face
-                    hue_shift = (p1.y * 3.14) + t
-
-                    # Generate dynamic RGB colors using sine waves
-                    r = int((math.sin(hue_shift) * 127 + 128) * 0.6)  # Dimmed for slimness
-                    g = int((math.sin(hue_shift + 2) * 127 + 128) * 0.6)
-                    b = int((math.sin(hue_shift + 4) * 127 + 128) * 0.6)
-
-                    cv2.line(self.trail_canvas, pt1, pt2, (b, g, r), 1, cv2.LINE_AA)
+                for pt1, pt2, color in zip(face_pixels[starts].tolist(), face_pixels[ends].tolist(), colors.tolist()):
+                    cv2.line(self.trail_canvas, pt1, pt2, color, 1, cv2.LINE_AA)
 
         # 3. Layering with lower opacity for face visibility
-        glow = cv2.GaussianBlur(self.trail_canvas, (5, 5), 0)
+        if dst is None:
+            dst = np.empty_like(frame)
+        if not self.glow_enabled:
+            return cv2.addWeighted(frame, 1.0, self.trail_canvas, 0.4, 0, dst=dst)
+        glow = self.buffers.like(self.trail_canvas)
+        cv2.GaussianBlur(self.trail_canvas, (5, 5), 0, dst=glow)
 
         # Additive blend: 0.5 intensity for glow, 0.4 for sharp lines
-        combined = cv2.addWeighted(frame, 1.0, glow, 0.5, 0)
-        result = cv2.addWeighted(combined, 1.0, self.trail_canvas, 0.4, 0)
-
-        return result
+        cv2.addWeighted(frame, 1.0, glow, 0.5, 0, dst=dst)
+        self.buffers.release(glow)
+        return cv2.addWeighted(dst, 1.0, self.trail_canvas, 0.4, 0, dst=dst)
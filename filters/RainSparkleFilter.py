@@ -2,25 +2,45 @@ import cv2
 import random
 import math
 
+import numpy as np
+
 class RainSparkleFilter:
-    def __init__(self):
+    # Read by core.FilterPlugin without importing this module; no landmarks, so no inference
+    PLUGIN = {
+        "name": "Sparkles",
+        "tokens": 33,
+        "duration": 10,
+        "layer": "particles",
+        "roi_only": True,   # Only the stars are drawn
+        "in_place": True,
+        "cost_ms": 0.5,
+    }
+
+    def __init__(self, seed=None):
         # List to hold all active sparkles: [x, y, size, speed, opacity]
         self.particles = []
         self.max_particles = 50
+        # Own RNG so benchmarks can replay the exact same downpour with a fixed seed
+        self.rng = random.Random(seed)
 
-    def apply(self, frame):
+    def apply(self, frame, ctx=None, dst=None):
+        # ctx (FrameContext) is accepted for pipeline uniformity; sparkles need no derived products.
+        # Sparkles draw in place; with dst they are drawn on a copy of the frame in dst
+        if dst is not None and dst is not frame:
+            np.copyto(dst, frame)
+            frame = dst
         h, w, _ = frame.shape
 
         # 1. Randomly spawn new sparkles at the top
         if len(self.particles) < self.max_particles:
-            if random.random() > 0.8:  # Control the "downpour" rate
+            if self.rng.random() > 0.8:  # Control the "downpour" rate
                 # [x, y, size, speed, rotation]
                 self.particles.append([
-                    random.randint(0, w),  # Random horizontal start
+                    self.rng.randint(0, w),  # Random horizontal start
                     -10,  # Start just above the screen
-                    random.randint(5, 16),  # Random size
-                    random.uniform(10, 20),  # Falling speed
-                    random.uniform(0, 360)  # Initial rotation
+                    self.rng.randint(5, 16),  # Random size
+                    self.rng.uniform(10, 20),  # Falling speed
+                    self.rng.uniform(0, 360)  # Initial rotation
                 ])
 
         # 2. Update and Draw particles
@@ -0,0 +1,200 @@
+import math
+import os
+
+import cv2
+import numpy as np
+
+from core.AssetCache import default_asset_cache
+from core.FaceBudget import FaceBudget
+from core.FaceLandmarks import LEFT_EYE_CENTER, RIGHT_EYE_CENTER
+from core.FaceTracker import FaceTracker, create_face_mesh
+from core.FilterPlugin import ASSETS_DIR, load_manifest
+from core.FrameContext import FrameContext
+from core.StickerAtlas import StickerAtlas
+
+
+class StickerFilter:
+    """
+    Stickere ancorate pe landmarks, descrise în assets/stickers.json (imagine, puncte de
+    ancorare, referința de scară, offset, rotire după linia ochilor). Fiecare intrare e un
+    tier separat, dar toate stickerele active se compun într-o singură trecere, din același
+    atlas și cu aceleași landmarks: un sticker nou înseamnă doar o intrare în manifest.
+    """
+
+    # Citit de core.FilterPlugin fără importul modulului; tokens / durata / costul vin din manifest
+    PLUGIN = {
+        "name": "Stickers",
+        "manifest": "stickers.json",
+        "layer": "stickers",
+        "roi_only": True,   # Doar zona stickerelor se amestecă
+        "in_place": True,
+        "cost_ms": 2.5,
+    }
+
+    SIZE_STEP = 4       # Pixeli între variantele scalate ale unui sticker
+    ROTATION_STEP = 3   # Grade între variantele rotite
+    MIN_SIZE = 10       # Stickerele mai mici de atât nu se desenează
+
+    def __init__(self, face_mesh=None, manifest=None, stickers=None, assets=None):
+        """
+        Citește manifestul și preîncarcă toate imaginile în atlas.
+
+        Args:
+            face_mesh: Opțional, sursă de landmarks cu process() compatibil FaceMesh
+                       (ex. ReplayFaceMesh sau FaceTracker-ul comun al aplicației);
+                       altfel se creează un FaceMesh MediaPipe
+            manifest (str): Calea manifestului; implicit assets/stickers.json
+            stickers: Opțional, doar intrările cu aceste nume
+            assets (AssetCache): Imaginile decodate (comune tuturor instanțelor); implicit cel al procesului
+        """
+        if face_mesh is None:
+            face_mesh = create_face_mesh()
+        self.face_mesh = face_mesh if isinstance(face_mesh, FaceTracker) else FaceTracker(face_mesh)
+
+        manifest = manifest or os.path.join(ASSETS_DIR, self.PLUGIN["manifest"])
+        self.stickers = {sticker["name"]: sticker for sticker in load_manifest(manifest)
+                         if stickers is None or sticker["name"] in stickers}
+        assets_dir = os.path.dirname(manifest)
+        self.assets = assets if assets is not None else default_asset_cache()
+        self.atlas = StickerAtlas.load({name: os.path.join(assets_dir, sticker["image"])
+                                        for name, sticker in self.stickers.items()}, self.assets)
+
+        # Fețele se randează în ordinea priorității, cât timp încap în bugetul per frame
+        self.face_budget = FaceBudget()
+
+    def set_quality(self, settings):
+        """
+        Aplică un nivel din QualityGovernor (rezoluția inferenței, frame-urile sărite,
+        bugetul pentru fețele secundare).
+
+        Args:
+            settings (dict): Un element din QUALITY_LEVELS
+        """
+        self.face_mesh.set_quality(settings)
+        self.face_budget.seconds = settings.get("face_budget")
+
+    @staticmethod
+    def _eye_angle(face_pixels):
+        """Unghiul liniei ochilor (grade, pozitiv în sensul acelor de ceasornic pe ecran)."""
+        left, right = face_pixels[LEFT_EYE_CENTER], face_pixels[RIGHT_EYE_CENTER]
+        if left[0] > right[0]:
+            left, right = right, left
+        return math.degrees(math.atan2(right[1] - left[1], right[0] - left[0]))
+
+    def _placement(self, sticker, face_pixels, angle):
+        """
+        Varianta din atlas și centrul unui sticker pe o față.
+
+        Args:
+            sticker (dict): Intrarea din manifest
+            face_pixels: Landmarks-urile feței în pixeli, (n_points, 2)
+            angle (float): Unghiul liniei ochilor
+
+        Returns:
+            tuple: ((premultiplied, 255 - alpha), x, y) sau None dacă stickerul e prea mic
+        """
+        image = self.atlas.image(sticker["name"])
+        img_h, img_w = image.shape[:2]
+
+        # Lățimea rotunjită la SIZE_STEP: tremurul landmark-urilor nu mai forțează un resize per frame
+        first, second = face_pixels[sticker["scale_reference"]]
+        scale_factor = float(np.hypot(*(second - first))) * sticker["width"] / img_w
+        width = int(img_w * scale_factor)
+        width = max(self.SIZE_STEP, round(width / self.SIZE_STEP) * self.SIZE_STEP)
+        height = int(img_h * width / img_w)
+        if width < self.MIN_SIZE or height < self.MIN_SIZE:
+            return None
+
+        anchor_x, anchor_y = face_pixels[sticker["anchor"]].mean(axis=0).astype(int).tolist()
+        offset_x, offset_y = sticker["offset"][0] * width, sticker["offset"][1] * height
+        rotation = 0
+        if sticker["rotate"]:
+            rotation = round(angle / self.ROTATION_STEP) * self.ROTATION_STEP
+            # Offset-ul se rotește odată cu fața (ex. urechile rămân deasupra capului înclinat)
+            cos, sin = math.cos(math.radians(rotation)), math.sin(math.radians(rotation))
+            offset_x, offset_y = offset_x * cos - offset_y * sin, offset_x * sin + offset_y * cos
+
+        overlay = self.atlas.variant(sticker["name"], width, rotation)
+        return overlay, anchor_x + int(offset_x), anchor_y + int(offset_y)
+
+    @staticmethod
+    def _overlay_image_alpha(frame, overlay, x, y):
+        """
+        Suprapune un sticker (premultiplicat) peste frame, in-place, doar în zona de overlap.
+
+        Args:
+            frame: Frame-ul (BGR), modificat in-place
+            overlay: (premultiplied BGR, 255 - alpha) din StickerAtlas.variant()
+            x: Coordonata x a centrului imaginii
+            y: Coordonata y a centrului imaginii
+        """
+        premultiplied, inverse_alpha = overlay
+        overlay_height, overlay_width = premultiplied.shape[:2]
+        frame_height, frame_width = frame.shape[:2]
+
+        # Colțul stânga-sus al imaginii overlay
+        x1 = x - overlay_width // 2
+        y1 = y - overlay_height // 2
+        x2 = x1 + overlay_width
+        y2 = y1 + overlay_height
+        if x1 >= frame_width or y1 >= frame_height or x2 <= 0 or y2 <= 0:
+            return  # Imaginea e complet în afara frame-ului
+
+        # Region în overlay image
+        overlay_x1 = max(0, -x1)
+        overlay_y1 = max(0, -y1)
+        overlay_x2 = overlay_width - max(0, x2 - frame_width)
+        overlay_y2 = overlay_height - max(0, y2 - frame_height)
+
+        # Region în frame (view: scrierile ajung direct în frame)
+        frame_roi = frame[max(0, y1):min(frame_height, y2), max(0, x1):min(frame_width, x2)]
+
+        # frame * (1 - alpha) + overlay * alpha, cu overlay-ul deja înmulțit cu alpha
+        cv2.multiply(frame_roi, inverse_alpha[overlay_y1:overlay_y2, overlay_x1:overlay_x2],
+                     dst=frame_roi, scale=1 / 255)
+        cv2.add(frame_roi, premultiplied[overlay_y1:overlay_y2, overlay_x1:overlay_x2], dst=frame_roi)
+
+    def apply(self, frame, ctx=None, dst=None, variants=None):
+        """
+        Compune stickerele cerute pe toate fețele, într-o singură trecere.
+
+        Args:
+            frame: Frame-ul video curent (BGR format)
+            ctx: FrameContext comun pipeline-ului (RGB și landmarks calculate o singură dată)
+            dst: Buffer de ieșire cu forma frame-ului (poate fi chiar frame-ul);
+                 dacă lipsește, se lucrează pe o copie
+            variants: Numele stickerelor active (din FilterStack); implicit toate
+
+        Returns:
+            np.array: Frame-ul cu stickerele aplicate
+        """
+        stickers = [self.stickers[name] for name in (variants or self.stickers) if name in self.stickers]
+        if not stickers:
+            return frame
+
+        # Landmarks din contextul frame-ului (RGB, Face Mesh și conversia în pixeli rulează o singură dată)
+        if ctx is None:
+            ctx = FrameContext(frame, tracker=self.face_mesh)
+        pixels = ctx.landmark_pixels
+        if pixels is None:
+            return frame
+
+        # Fără dst lucrăm pe o copie, ca să nu modificăm originalul direct
+        if dst is None:
+            output_frame = frame.copy()
+        else:
+            output_frame = dst
+            if dst is not frame:
+                np.copyto(dst, frame)
+
+        rotate = any(sticker["rotate"] for sticker in stickers)
+        # Procesează fețele detectate, de la cea principală, cât permite bugetul
+        for rank in self.face_budget.faces(len(pixels)):
+            face_pixels = pixels[rank]
+            angle = self._eye_angle(face_pixels) if rotate else 0.0
+            for sticker in stickers:
+                placement = self._placement(sticker, face_pixels, angle)
+                if placement is not None:
+                    self._overlay_image_alpha(output_frame, *placement)
+
+        return output_frame
@@ -1,40 +1,50 @@
 import os
 import sys
+import time
 
-os.environ["GLOG_minloglevel"] = "3"
-os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
-os.environ["OPENCV_LOG_LEVEL"] = "OFF"
+STARTUP_T0 = time.perf_counter()
 
-try:
-    null_fd = os.open(os.devnull, os.O_WRONLY)
-    old_stderr_fd = os.dup(sys.stderr.fileno())
-    os.dup2(null_fd, sys.stderr.fileno())
-except Exception:
-    pass
+# MediaPipe / TFLite log through glog and TF's own levels, read once on their first import:
+# hide INFO and WARNING, keep errors. Set these in the shell (e.g. GLOG_minloglevel=0) to see everything.
+os.environ.setdefault("GLOG_minloglevel", "2")
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+os.environ.setdefault("OPENCV_LOG_LEVEL", "OFF")
 
 import cv2
-import time
+import numpy as np
 import threading
-import requests
 from dotenv import load_dotenv
 from core.OutputManager import OutputManager
-from core.ChaturbateListener import ChaturbateListener
-from core.StripchatListener import StripchatListener
-from core.CamsodaListener import CamsodaListener
-from filters.FaceMask3DFilter import FaceMask3D
-from filters.BigEyeFilter import BigEyeFilter
-from filters.RainSparkleFilter import RainSparkleFilter
-from filters.RabbitEarsFilter import RabbitEarsFilter
-from collections import deque
-
-try:
-    os.dup2(old_stderr_fd, sys.stderr.fileno())
-    os.close(null_fd)
-except Exception:
-    pass
+from core.AssetCache import default_asset_cache
+from core.AsyncFaceTracker import AsyncFaceTracker
+from core.BufferPool import BufferPool
+from core.CameraDiscovery import CameraDiscovery
+from core.CaptureNegotiator import CaptureNegotiator
+from core.FaceTracker import FaceTracker, create_face_mesh
+from core.FrameContext import FrameContext
+from core.FilterPlugin import discover_filters
+from core.FilterRegistry import LISTENERS, LazyFilter, load_class, prefetch_all, import_targets
+from core.FilterStack import FilterStack
+from core.FramePreprocessor import FramePreprocessor
+from core.FrameProfiler import FrameProfiler
+from core.MetricsServer import MetricsServer
+from core.ProcessFaceMesh import ProcessFaceMesh
+from core.ProfileCapture import ProfileCapture
+from core.QualityGovernor import QualityGovernor
+from core.RuntimeStats import RuntimeStats
+from core.StartupTimer import StartupTimer, print_import_breakdown
+from core.TipTrace import TipTrace, TipLatencyHistograms
+
+# Listeners and filters (mediapipe + FaceMesh models) are imported lazily through core.FilterRegistry
+startup_timer = StartupTimer(STARTUP_T0)
+startup_timer.mark("imports")
 
 class CameraFiltersAutomation:
-    def __init__(self, output_mode="window", chaturbate_url=None, stripchat_url=None, camsoda_url=None, quality="1080p"):
+    def __init__(self, output_mode="window", chaturbate_url=None, stripchat_url=None, camsoda_url=None, quality="1080p", debug_mode=False, metrics_port=0, profile_seconds=10,
+                 camera_index=None, camera_prompt=True, camera_format="auto", camera_probe_seconds=1.0,
+                 preload_filters=True, adaptive_quality=True, motion_threshold=0.002, motion_max_age=10,
+                 async_landmarks=True, extrapolate_landmarks=False, landmark_backend="inprocess",
+                 roi_tracking=True, max_faces=1, face_budget_ms=None, filter_cost_ms=None, menu_overlay=None):
         if quality == "4K":
             self.width, self.height, self.fps = 3840, 2160, 30
         elif quality == "720p":
@@ -42,151 +52,307 @@ class CameraFiltersAutomation:
         else:  # Default 1080p
             self.width, self.height, self.fps = 1920, 1080, 60
 
-        selected_index = self.select_camera()
-        self.cap = cv2.VideoCapture(selected_index, cv2.CAP_DSHOW)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
-        self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        self.camera_discovery = CameraDiscovery()
+        selected_index = self.select_camera(camera_index, interactive=camera_prompt)
+        self.cap = cv2.VideoCapture(selected_index, CameraDiscovery.backend())
+        startup_timer.mark("camera open")
+
+        # Explicit FOURCC/buffer negotiation; "auto" measures MJPG and YUYV and keeps the faster one
+        camera_format = (camera_format or "auto").upper()
+        if camera_format == "AUTO":
+            formats = CaptureNegotiator.FORMATS
+        elif camera_format == "DEFAULT":
+            formats = ()
+        else:
+            formats = (camera_format,)
+        print("📷 Negotiating capture format...")
+        negotiator = CaptureNegotiator(self.cap, self.width, self.height, self.fps)
+        self.capture_format = negotiator.negotiate(formats, probe_seconds=camera_probe_seconds)
+        startup_timer.mark("capture negotiation")
         self.output = OutputManager(mode=output_mode, quality=quality)
-
-        self.queue = deque()  # Stores: {"name": "Sparkle", "user": "UserA", "duration": 30, "instance": obj}
-        self.current_filter = None
-        self.filter_end_time = 0
-
-        # Define Tiers: (Min_Tokens, Max_Tokens, Filter_Key, Duration)
+        # Frames always match the sink geometry, whatever the camera actually delivers
+        self.preprocessor = FramePreprocessor(self.output.width, self.output.height)
+        startup_timer.mark("output init")
+
+        # Per-stage frame timings (overlay + CSV/JSON report on exit) when DEBUG_MODE is on
+        self.profiler = FrameProfiler(enabled=debug_mode)
+        self.stats = RuntimeStats(self.fps)
+        self.tip_latency = TipLatencyHistograms()
+        # Steps filter/HUD quality down while an active filter misses the frame budget
+        self.governor = QualityGovernor(self.fps, enabled=adaptive_quality)
+        self.simple_hud = False
+        # Landmarks are reused while the thumbnail doesn't change (0 disables the gate)
+        self.motion_settings = {"motion_threshold": motion_threshold, "motion_max_age": motion_max_age}
+        # FaceMesh on a worker thread: filters render with the newest finished landmarks
+        self.async_landmarks = async_landmarks
+        self.extrapolate_landmarks = extrapolate_landmarks
+        # "process": FaceMesh runs in its own process (frames through shared memory), off the GIL
+        self.landmark_backend = landmark_backend
+        # Once a face is found, inference runs on a crop around it instead of the whole frame
+        self.roi_tracking = roi_tracking
+        # Faces tracked by the one shared inference; filters render them primary first within
+        # face_budget per frame (default: half the frame budget), secondary ones only if they fit
+        self.max_faces = max(1, max_faces)
+        face_budget = face_budget_ms / 1000 if face_budget_ms is not None else 0.5 / self.fps
+        self.face_settings = {"face_budget": face_budget if face_budget > 0 else None}
+        self.pending_traces = []  # (trace, filter) of started tips until their first frame is displayed
+
+        # On-demand cProfile/tracemalloc window: key 'p', SIGUSR1/SIGBREAK or POST /profile
+        self.profile_capture = ProfileCapture(duration=profile_seconds)
+        self.profile_capture.install_signal_handler()
+
+        # Queued tips run concurrently, layered, while the stack's estimated render cost fits
+        # filter_cost per frame (default: the whole frame budget); the rest wait their turn
+        filter_cost = filter_cost_ms / 1000 if filter_cost_ms is not None else 1.0 / self.fps
+        self.filter_stack = FilterStack(max_cost=filter_cost if filter_cost > 0 else None)
+        self.queue = self.filter_stack.queue  # Stores: {"name": "Sparkle", "user": "UserA", "duration": 30, "instance": obj, ...}
+
+        # One FaceMesh graph for every landmark filter, fed through the per-frame FrameContext
+        self.face_tracker = None
+        # Full-frame scratch buffers (filter outputs, RGB for the vcam, masks) are recycled frame to frame
+        self.buffer_pool = BufferPool()
+        # Decoded images (stickers, menu) are built once and shared by every filter and overlay
+        self.assets = default_asset_cache()
+        shared = {"face_mesh": self.shared_face_tracker, "buffer_pool": lambda: self.buffer_pool,
+                  "assets": lambda: self.assets}
+
+        # Define Tiers: tokens -> (name, filter, duration), from the PLUGIN declarations in filters/
+        # (and "ar_filters" entry points), read without importing; filters are built on first use.
+        # Tiers declared by one class (e.g. every sticker in assets/stickers.json) share its instance
+        self.filter_plugins = discover_filters()
+        loaders = {}
+        for plugin in self.filter_plugins.values():
+            key = (plugin["module"], plugin["class"])
+            if key not in loaders:
+                loaders[key] = LazyFilter(plugin, startup_timer, shared)
+        self.filters = list(loaders.values())
         self.fixed_tips = {
-            33:  ('Sparkles', RainSparkleFilter(), 10),
-            50:  ('Rabbit Ears', RabbitEarsFilter(), 15),
-            99:  ('Big Eyes', BigEyeFilter(), 20),
-            200: ('Cyber Mask', FaceMask3D(), 30)
+            amount: (plugin["name"], loaders[(plugin["module"], plugin["class"])], plugin["duration"])
+            for amount, plugin in self.filter_plugins.items()
         }
+        startup_timer.mark("filter discovery")
+        # Load every filter in the background once the first frame is out
+        self.preload_filters = preload_filters
+        self.apply_quality(self.governor.settings)
 
-        # Initialize platform listeners
+        # Initialize platform listeners (each module is imported only when its URL is configured)
         self.listeners = []
-        
-        # Start Chaturbate listener
-        if chaturbate_url:
-            chaturbate_listener = ChaturbateListener(chaturbate_url, self.process_tip)
-            chaturbate_listener.start()
-            self.listeners.append(chaturbate_listener)
-        
-        # Start Stripchat listener
-        if stripchat_url:
-            stripchat_listener = StripchatListener(stripchat_url, self.process_tip)
-            stripchat_listener.start()
-            self.listeners.append(stripchat_listener)
-        
-        # Start Camsoda listener
-        if camsoda_url:
-            camsoda_listener = CamsodaListener(camsoda_url, self.process_tip)
-            camsoda_listener.start()
-            self.listeners.append(camsoda_listener)
+        for platform, url in (('chaturbate', chaturbate_url), ('stripchat', stripchat_url), ('camsoda', camsoda_url)):
+            if not url:
+                continue
+            listener = load_class(*LISTENERS[platform])(url, self.process_tip)
+            listener.start()
+            self.listeners.append(listener)
+        startup_timer.mark("listeners")
         
         if not self.listeners:
             print("⚠️ No platform APIs configured. Use keyboard shortcuts for testing.")
+
+        # Local Prometheus endpoint (disabled when METRICS_PORT is 0)
+        self.metrics_server = None
+        if metrics_port:
+            self.metrics_server = MetricsServer(self.collect_metrics, port=metrics_port,
+                                                actions={"/profile": self.request_profile})
+            self.metrics_server.start()
         
-        # # Load static menu overlay (one-time initialization for performance)
-        # menu_path = os.path.join("assets", "menu_overlay.png")
-        # self.menu_image = cv2.imread(menu_path, cv2.IMREAD_UNCHANGED)  # Load with alpha channel
-        # if self.menu_image is None:
-        #     print(f"⚠️ Warning: Could not load menu overlay from '{menu_path}'. Menu will not be displayed.")
-        # else:
-        #     h, w = self.menu_image.shape[:2] # Get height and width
-        #     channels = self.menu_image.shape[2] if len(self.menu_image.shape) > 2 else 1 # Get number of channels
-        #     print(f"✅ Menu overlay loaded: {w}x{h}px, {channels} channels from '{menu_path}'")
-        #     
-        #     # Resize menu if it's too large to fit in the frame
-        #     max_menu_height = int(self.height * 0.4)  # Max 25% of frame height
-        #     max_menu_width = int(self.width * 0.20)   # Max 20% of frame width
-        #     
-        #     if h > max_menu_height or w > max_menu_width:
-        #         # Calculate scaling factor to fit within limits
-        #         scale_h = max_menu_height / h
-        #         scale_w = max_menu_width / w
-        #         scale = min(scale_h, scale_w)
-        #         
-        #         new_w = int(w * scale)
-        #         new_h = int(h * scale)
-        #         
-        #         self.menu_image = cv2.resize(self.menu_image, (new_w, new_h), interpolation=cv2.INTER_AREA)
-        #         print(f"   Resized to: {new_w}x{new_h}px to fit frame ({self.width}x{self.height})")
-        
-        # Set menu_image to None when commented out
-        self.menu_image = None
+        # Static menu overlay (a PNG in assets/, off unless MENU_OVERLAY names one): decoded,
+        # premultiplied and fitted to the output once, memory-mapped from assets/.cache afterwards
+        self.menu_image = self.load_menu_overlay(menu_overlay) if menu_overlay else None
 
-    def select_camera(self):
-        """Finds camera names on both Windows and macOS."""
-        import os
-        import sys
-        import subprocess
+    def select_camera(self, configured_index=None, interactive=True):
+        """
+        Picks the capture device.
 
-        os.environ["OPENCV_LOG_LEVEL"] = "OFF"
-        camera_list = {}
+        Args:
+            configured_index: CAMERA_INDEX from the config; used as-is without probing
+            interactive: Ask on stdin; otherwise use the cached device or the first one found
+        """
+        if configured_index is not None:
+            print(f"🎥 Using configured camera index {configured_index}")
+            return configured_index
 
-        # --- WINDOWS LOGIC ---
-        if sys.platform == 'win32':
-            try:
-                from pygrabber.dshow_graph import FilterGraph
-                devices = FilterGraph().get_input_devices()
-                for i, name in enumerate(devices):
-                    camera_list[i] = name
-            except Exception: pass
-
-        # --- MACOS LOGIC ---
-        elif sys.platform == 'darwin':
-            try:
-                cmd = ["system_profiler", "SPCameraDataType"]
-                output = subprocess.check_output(cmd).decode('utf-8')
-                names = [line.strip().replace("Model ID: ", "") for line in output.split("\n") if "Model ID" in line or "Name" in line]
-                for i, name in enumerate(names[:5]):
-                    camera_list[i] = name.split(":")[-1].strip()
-            except Exception: pass
-
-        # --- FALLBACK (Linux) ---
+        discovery = self.camera_discovery
+        camera_list = discovery.list_devices()
+
+        # --- FALLBACK: parallel probe with timeout ---
         if not camera_list:
             print("🔍 Scanning hardware ports...")
-            for i in range(5):
-                cap = cv2.VideoCapture(i)
-                if cap.isOpened():
-                    camera_list[i] = f"Camera Device {i}"
-                    cap.release()
-
-        print("\n" + "—"*45)
-        print("🎥 AVAILABLE VIDEO DEVICES")
-        print("—"*45)
+            camera_list = discovery.probe(range(5))
 
         if not camera_list:
             print("⚠️ No cameras detected! Defaulting to index 0.")
             return 0
 
+        cached = discovery.cached_index(camera_list)
+        default = cached if cached is not None else list(camera_list.keys())[0]
+
+        if not interactive or not sys.stdin or not sys.stdin.isatty():
+            print(f"🎥 Selected {'cached' if cached is not None else 'first'} camera: [{default}] {camera_list[default]}")
+            discovery.remember(default, camera_list[default])
+            return default
+
+        print("\n" + "—"*45)
+        print("🎥 AVAILABLE VIDEO DEVICES")
+        print("—"*45)
+
         for idx, name in camera_list.items():
-            print(f"   [{idx}] -> {name}")
+            marker = " (last used)" if idx == cached else ""
+            print(f"   [{idx}] -> {name}{marker}")
         print("—"*45)
 
         while True:
-            choice = input(f"👉 Select Camera Index {list(camera_list.keys())}: ").strip()
-            if choice == "": return list(camera_list.keys())[0]
+            choice = input(f"👉 Select Camera Index {list(camera_list.keys())} [Enter = {default}]: ").strip()
+            if choice == "":
+                discovery.remember(default, camera_list[default])
+                return default
             try:
                 val = int(choice)
                 if val in camera_list:
                     print(f"✅ Selected: {camera_list[val]}")
+                    discovery.remember(val, camera_list[val])
                     return val
             except: pass
             print("Invalid selection.")
 
-    def process_tip(self, amount, username="Viewer"):
-        """Activates filters ONLY for specific tip amounts."""
+    def process_tip(self, amount, username="Viewer", trace=None):
+        """
+        Activates filters ONLY for specific tip amounts.
+
+        Args:
+            amount: Tip amount in tokens
+            username: Tipper name shown in logs
+            trace: TipTrace started by the listener; manual (keyboard) tips get a new one
+        """
+        if trace is None:
+            trace = TipTrace("keyboard")
+            trace.mark("normalized")
+        trace.mark("processed")
+
         if amount in self.fixed_tips:
             name, instance, duration = self.fixed_tips[amount]
             # Add to the sequence
-            self.queue.append({
+            plugin = self.filter_plugins[amount]
+            # Declared cost is per 1080p frame; the stack replaces it with the measured one
+            scale = self.output.width * self.output.height / (1920 * 1080)
+            self.filter_stack.push({
                 "name": name,
                 "user": username,
                 "duration": duration,
-                "instance": instance
+                "instance": instance,
+                "layer": plugin["layer"],
+                "landmarks": bool(plugin["landmarks"]),
+                "in_place": plugin["in_place"],
+                "cost": plugin["cost_ms"] / 1000 * scale,
+                "variant": plugin.get("variant"),
+                "trace": trace
             })
+            trace.mark("queued")
+            instance.prefetch()  # No-op once loaded; otherwise the model loads while the tip waits
             print(f"Added {name} to queue for {username}")
 
+    def request_profile(self, params):
+        """Local control command: POST /profile?seconds=N"""
+        seconds = float(params.get("seconds", 0)) or None
+        if self.profile_capture.request(seconds):
+            return "profiling started"
+        return "profile already running"
+
+    def finish_trace(self, trace):
+        """Records a tip's latency once its first filtered frame reached the output."""
+        trace.mark("displayed")
+        segments = self.tip_latency.record(trace)
+        if self.profiler.enabled:
+            print(f"⏱️ Tip latency ({trace.platform}): total {segments['total'] * 1000:.0f} ms, "
+                  f"queue wait {segments.get('queue_wait', 0) * 1000:.0f} ms, "
+                  f"first render {segments.get('first_render', 0) * 1000:.1f} ms")
+
+    def collect_metrics(self):
+        """Snapshot of runtime, queue, listener and output stats for the metrics endpoint."""
+        stats = self.stats
+        now = time.time()
+
+        queue_items = list(self.queue)
+        queued_seconds = sum(item["duration"] for item in queue_items)
+        active = list(self.filter_stack.active)
+        active_remaining = sum(max(0.0, entry["end_time"] - now) for entry in active)
+
+        # One copy taken under the stats lock: the render thread adds filters while we scrape
+        filter_render = stats.snapshot()
+        filter_samples = [({"filter": name}, total / frames if frames else 0)
+                          for name, (frames, total, _) in filter_render.items()]
+        filter_last = [({"filter": name}, last) for name, (_, _, last) in filter_render.items()]
+        filter_frames = [({"filter": name}, frames) for name, (frames, _, _) in filter_render.items()]
+
+        face_costs, faces_skipped = [], []
+        for instance in self.filters:
+            budget = getattr(instance.instance, "face_budget", None)
+            if budget is not None:
+                face_costs.extend(({"filter": instance.name, "face": str(rank)}, seconds)
+                                  for rank, seconds in sorted(budget.costs.items()))
+                faces_skipped.append(({"filter": instance.name}, budget.skipped_total))
+
+        listener_families = []
+        for metric, metric_type, help_text, attr in (
+            ("ar_listener_poll_latency_seconds", "gauge", "Duration of the last API poll", "last_poll_latency"),
+            ("ar_listener_polls_total", "counter", "Successful API polls", "polls_total"),
+            ("ar_listener_errors_total", "counter", "Failed API polls", "errors_total"),
+            ("ar_listener_consecutive_errors", "gauge", "Failed polls since the last success", "consecutive_errors"),
+            ("ar_listener_backoff_seconds", "gauge", "Current retry backoff (0 = polling normally)", "backoff_seconds"),
+            ("ar_listener_last_success_timestamp", "gauge", "Unix time of the last successful poll", "last_success"),
+        ):
+            samples = [({"platform": l.platform}, getattr(l, attr)) for l in self.listeners]
+            listener_families.append((metric, metric_type, help_text, samples))
+
+        inferences, skipped, ages, replaced, restarts, pixels, fallbacks = [], [], [], [], [], [], []
+        for name, tracker in self.landmark_trackers():
+            inferences.append(({"tracker": name}, tracker.inferences_total))
+            pixels.append(({"tracker": name}, tracker.inference_pixels_total))
+            fallbacks.append(({"tracker": name}, tracker.roi_fallbacks_total))
+            skipped.append(({"tracker": name, "reason": "motion"}, tracker.motion_skipped_total))
+            skipped.append(({"tracker": name, "reason": "quality"}, tracker.skipped_total))
+            if isinstance(tracker, AsyncFaceTracker):
+                ages.append(({"tracker": name}, tracker.result_age))
+                replaced.append(({"tracker": name}, tracker.dropped_total))
+            if isinstance(tracker.face_mesh, ProcessFaceMesh):
+                restarts.append(({"tracker": name}, tracker.face_mesh.restarts_total))
+
+        return [
+            ("ar_fps", "gauge", "Instantaneous frames per second", [({}, stats.current_fps)]),
+            ("ar_fps_rolling", "gauge", "Frames per second over the last frames", [({}, stats.rolling_fps)]),
+            ("ar_target_fps", "gauge", "Requested camera frame rate", [({}, self.fps)]),
+            ("ar_frames_total", "counter", "Frames processed", [({}, stats.frames_total)]),
+            ("ar_frames_dropped_total", "counter", "Frames that took longer than 1.5x the frame budget", [({}, stats.frames_dropped)]),
+            ("ar_capture_failures_total", "counter", "Failed camera reads", [({}, stats.capture_failures)]),
+            ("ar_capture_delivered_fps", "gauge", "Capture FPS measured at startup for the negotiated format",
+             [({"fourcc": self.capture_format["fourcc"] or "default"}, self.capture_format["delivered_fps"])]),
+            ("ar_filter_render_seconds_avg", "gauge", "Average apply() time per filter", filter_samples),
+            ("ar_filter_render_seconds_last", "gauge", "Last apply() time per filter", filter_last),
+            ("ar_filter_frames_total", "counter", "Frames rendered per filter", filter_frames),
+            ("ar_filter_face_render_seconds", "gauge", "Average render time per face (face 0 = primary)", face_costs),
+            ("ar_filter_faces_skipped_total", "counter", "Secondary faces left out to stay within the face budget", faces_skipped),
+            ("ar_filter_active", "gauge", "Filters running at once", [({}, len(active))]),
+            ("ar_filter_stack_cost_seconds", "gauge", "Estimated render time per frame of the running filters",
+             [({}, self.filter_stack.estimated_cost())]),
+            ("ar_queue_length", "gauge", "Filters waiting in the queue", [({}, len(queue_items))]),
+            ("ar_queue_seconds", "gauge", "Seconds of queued filters including the running ones", [({}, queued_seconds + active_remaining)]),
+            ("ar_quality_level", "gauge", "Quality governor degradation level (0 = full quality)",
+             [({"name": self.governor.settings["name"]}, self.governor.level)]),
+            ("ar_quality_transitions_total", "counter", "Quality level changes", [({}, self.governor.transitions_total)]),
+            ("ar_landmark_inferences_total", "counter", "FaceMesh inferences run per tracker", inferences),
+            ("ar_landmark_skipped_total", "counter", "Frames that reused the previous landmarks", skipped),
+            ("ar_landmark_age_frames", "gauge", "Frames between the rendered frame and its landmarks (async inference)", ages),
+            ("ar_landmark_replaced_total", "counter", "Frames superseded by a newer one before inference started", replaced),
+            ("ar_landmark_worker_restarts_total", "counter", "FaceMesh worker process restarts", restarts),
+            ("ar_landmark_inference_pixels_total", "counter", "Pixels handed to FaceMesh (face crop or full frame)", pixels),
+            ("ar_landmark_roi_fallbacks_total", "counter", "Face crops without a face that fell back to a full-frame search", fallbacks),
+            ("ar_frame_work_seconds_avg", "gauge", "Average processing time per frame seen by the governor", [({}, self.governor.average_seconds)]),
+            *listener_families,
+            ("ar_output_frames_total", "counter", "Frames handed to the output", [({"mode": self.output.mode}, self.output.frames_sent)]),
+            ("ar_output_display_seconds", "gauge", "Last send/imshow duration", [({"mode": self.output.mode}, self.output.last_display_seconds)]),
+            ("ar_output_pacing_seconds", "gauge", "Last virtual camera pacing sleep", [({"mode": self.output.mode}, self.output.last_pacing_seconds)]),
+            *self.tip_latency.metric_families(),
+        ]
+
     def draw_rounded_rect_with_glow(self, frame, x1, y1, x2, y2, corner_radius, bg_color, border_color, glow_thickness=8):
         """
         Draws a rounded rectangle with glassmorphism glow effect.
@@ -277,71 +443,146 @@ class CameraFiltersAutomation:
         return x, y
 
     def update_queue(self):
-        """Manages the transition between filters in the sequence."""
-        now = time.time()
-
-        # If nothing is running, grab the next item from queue
-        if self.current_filter is None and self.queue:
-            self.current_filter = self.queue.popleft()
-            self.filter_end_time = now + self.current_filter["duration"]
+        """Expires finished filters and starts the queued ones that fit next to those still running."""
+        for item in self.filter_stack.update():
+            trace = item.get("trace")
+            if trace:
+                trace.mark("activated")
+                self.pending_traces.append((trace, item["instance"]))
+
+    def load_menu_overlay(self, name):
+        """
+        Loads the menu overlay from the asset cache, fitted to 35% x 80% of the output frame.
 
-        # If something is running and time is up
-        elif self.current_filter and now > self.filter_end_time:
-            self.current_filter = None  # Clear it to trigger next one
+        Returns:
+            (premultiplied BGR, 255 - alpha) for overlay_image_alpha, or None if the file is missing
+        """
+        max_size = (int(self.output.width * 0.35), int(self.output.height * 0.8))
+        try:
+            menu = self.assets.image(name, fit=max_size)
+        except FileNotFoundError as e:
+            print(f"⚠️ Warning: {e}. Menu will not be displayed.")
+            return None
+        print(f"✅ Menu overlay loaded: {menu.shape[1]}x{menu.shape[0]}px from '{name}'")
+        return cv2.cvtColor(menu, cv2.COLOR_BGRA2BGR), cv2.cvtColor(255 - menu[:, :, 3], cv2.COLOR_GRAY2BGR)
 
     def overlay_image_alpha(self, img, overlay, pos):
         """
-        Efficiently overlay a transparent PNG image onto the frame using alpha blending.
-        
+        Blends a premultiplied overlay onto the frame, in place.
+
         Args:
             img: Background image (frame from video)
-            overlay: Foreground image with alpha channel (BGRA format)
+            overlay: (premultiplied BGR, 255 - alpha) from load_menu_overlay()
             pos: Tuple (x, y) for top-left position of overlay
-        
-        Performance: Uses proper alpha blending for semi-transparent pixels.
         """
         if overlay is None:
             return  # Skip if overlay image not loaded
-        
+
+        premultiplied, inverse_alpha = overlay
         x, y = pos
-        h, w = overlay.shape[:2]
-        
+        h, w = premultiplied.shape[:2]
+
         # Boundary check - ensure overlay fits within frame
         if x < 0 or y < 0 or x + w > img.shape[1] or y + h > img.shape[0]:
             return  # Skip if overlay would go out of bounds
-        
-        # Extract the region of interest (ROI) from the background
+
+        # result = background * (1 - alpha) + overlay * alpha, with the overlay already times alpha
         roi = img[y:y+h, x:x+w]
-        
-        # Check if overlay has alpha channel
-        if len(overlay.shape) == 3 and overlay.shape[2] == 4:
-            # BGRA image with alpha channel
-            overlay_bgr = overlay[:, :, :3].astype(float)  # Color channels (BGR)
-            alpha_mask = overlay[:, :, 3].astype(float) / 255.0  # Normalize alpha to 0-1
-            
-            # Expand alpha mask to 3 channels for broadcasting
-            alpha_3ch = cv2.merge([alpha_mask, alpha_mask, alpha_mask])
-            
-            # Blend: result = overlay * alpha + background * (1 - alpha)
-            blended = (overlay_bgr * alpha_3ch + roi.astype(float) * (1.0 - alpha_3ch)).astype('uint8')
-            
-            # Place the blended result back into the original image
-            img[y:y+h, x:x+w] = blended
-        elif len(overlay.shape) == 3 and overlay.shape[2] == 3:
-            # BGR image without alpha channel - direct copy
-            img[y:y+h, x:x+w] = overlay
-        else:
-            # Grayscale or other format - skip
-            pass
+        cv2.multiply(roi, inverse_alpha, dst=roi, scale=1 / 255)
+        cv2.add(roi, premultiplied, dst=roi)
+
+
+    def shared_face_tracker(self):
+        """Builds the shared FaceTracker on first use (called from the filter loader thread)."""
+        if self.face_tracker is None:
+            if self.landmark_backend == "process":
+                face_mesh = ProcessFaceMesh(max_faces=self.max_faces)
+            else:
+                face_mesh = create_face_mesh(self.max_faces)
+            if self.async_landmarks:
+                tracker = AsyncFaceTracker(face_mesh, extrapolate=self.extrapolate_landmarks,
+                                           roi_tracking=self.roi_tracking, max_faces=self.max_faces)
+            else:
+                tracker = FaceTracker(face_mesh, roi_tracking=self.roi_tracking, max_faces=self.max_faces)
+            tracker.set_quality(dict(self.governor.settings, **self.motion_settings))
+            self.face_tracker = tracker
+        return self.face_tracker
+
+    def apply_quality(self, settings):
+        """Pushes the governor's current level to the shared tracker, every filter and the HUD."""
+        settings = dict(settings, **self.motion_settings, **self.face_settings)
+        if self.face_tracker is not None:
+            self.face_tracker.set_quality(settings)
+        for instance in self.filters:
+            instance.set_quality(settings)
+        self.simple_hud = settings["simple_hud"]
+
+    def landmark_trackers(self):
+        """(name, FaceTracker): the shared tracker plus any filter that runs its own."""
+        if self.face_tracker is not None:
+            yield "shared", self.face_tracker
+        for instance in self.filters:
+            tracker = getattr(instance.instance, "face_mesh", None)
+            if isinstance(tracker, FaceTracker) and tracker is not self.face_tracker:
+                yield instance.name, tracker
+
+    def draw_queue_box_simple(self, frame):
+        """Flat HUD used under load: no blur, no full-frame copies, no per-pixel gradient."""
+        h, w, _ = frame.shape
+        box_w, box_h = 350, 90
+        x1, y1 = w - box_w - 20, h - box_h - 20
+        x2, y2 = w - 20, h - 20
+        CYBER_CYAN = (255, 255, 0)
 
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (20, 15, 10), -1)
+        cv2.rectangle(frame, (x1, y1), (x2, y2), CYBER_CYAN, 2)
+
+        current = self.hud_filter()
+        if not current:
+            cv2.putText(frame, "Waiting for tips...", (x1 + 20, y1 + 50),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (150, 150, 150), 2, cv2.LINE_AA)
+            return
+
+        remaining = max(0, int(current["end_time"] - time.time()))
+        total_duration = current['duration']
+        progress = min(1.0, (total_duration - remaining) / total_duration) if total_duration > 0 else 0
+
+        cv2.putText(frame, f"LIVE  {self.hud_label(current)}", (x1 + 20, y1 + 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2, cv2.LINE_AA)
+        bar_x1, bar_y, bar_w = x1 + 20, y1 + 45, box_w - 40
+        cv2.rectangle(frame, (bar_x1, bar_y), (bar_x1 + bar_w, bar_y + 10), (60, 60, 60), -1)
+        fill_w = int(bar_w * (1 - progress))
+        if fill_w > 0:
+            cv2.rectangle(frame, (bar_x1, bar_y), (bar_x1 + fill_w, bar_y + 10), CYBER_CYAN, -1)
+        cv2.putText(frame, f"{len(self.queue)} in queue   {remaining}s", (bar_x1, bar_y + 32),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, (180, 180, 180), 1, cv2.LINE_AA)
+
+    def hud_filter(self):
+        """The running filter whose timer the HUD shows: the one that ends first (None when idle)."""
+        active = self.filter_stack.active
+        return min(active, key=lambda entry: entry["end_time"]) if active else None
+
+    def hud_label(self, current):
+        """Name of the shown filter, plus how many others run on top of it."""
+        others = len(self.filter_stack.active) - 1
+        return f"{current['name']} +{others}" if others > 0 else current['name']
 
     def draw_queue_box(self, frame):
         """Draws the queue box on the right side with glassmorphism and progress bar."""
+        if self.simple_hud:
+            return self.draw_queue_box_simple(frame)
         h, w, _ = frame.shape
         box_w, box_h = 350, 170
         x1, y1 = w - box_w - 20, h - box_h - 20
         x2, y2 = w - 20, h - 20
         corner_radius = 20
+
+        # Draw into a view of the box area (plus room for the glow) instead of the whole frame:
+        # the semi-transparent layers below copy and blend this panel, not a full frame
+        margin = 12
+        px1, py1 = max(0, x1 - margin), max(0, y1 - margin)
+        frame = frame[py1:min(h, y2 + margin), px1:min(w, x2 + margin)]
+        x1, x2, y1, y2 = x1 - px1, x2 - px1, y1 - py1, y2 - py1
         
         # Neon colors (BGR format)
         NEON_MAGENTA = (255, 0, 255)
@@ -357,11 +598,12 @@ class CameraFiltersAutomation:
         # Draw rounded rectangle with glow
         self.draw_rounded_rect_with_glow(frame, x1, y1, x2, y2, corner_radius, DARK_BG, CYBER_CYAN, glow_thickness=8)
         
-        if self.current_filter:
-            remaining = max(0, int(self.filter_end_time - time.time()))
-            total_duration = self.current_filter['duration']
+        current = self.hud_filter()
+        if current:
+            remaining = max(0, int(current["end_time"] - time.time()))
+            total_duration = current['duration']
             elapsed = total_duration - remaining
-            progress = min(1.0, elapsed / total_duration) if total_duration > 0 else 0
+            progress = min(1.0, max(0.0, elapsed / total_duration)) if total_duration > 0 else 0
             
             # Pulsing LIVE indicator
             pulse = abs((time.time() * 2) % 2 - 1)  # Creates a 0->1->0 pulse
@@ -382,7 +624,7 @@ class CameraFiltersAutomation:
                         cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2, cv2.LINE_AA)
             
             # Filter name
-            filter_text = self.current_filter['name']
+            filter_text = self.hud_label(current)
             cv2.putText(frame, filter_text, (live_x + 70, live_y + 6),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.65, PURE_WHITE, 2, cv2.LINE_AA)
             
@@ -401,17 +643,11 @@ class CameraFiltersAutomation:
             # Progress fill (colored)
             fill_w = int(bar_w * (1 - progress))  # Shrinks as time elapses
             if fill_w > 0:
-                # Gradient from cyan to magenta
-                progress_overlay = frame.copy()
-                
-                # Create gradient effect
-                for i in range(fill_w):
-                    ratio = i / fill_w if fill_w > 0 else 0
-                    # Interpolate between CYBER_CYAN and NEON_MAGENTA
-                    color = tuple(int(CYBER_CYAN[j] * (1 - ratio) + NEON_MAGENTA[j] * ratio) for j in range(3))
-                    cv2.line(progress_overlay, (bar_x1 + i, bar_y), (bar_x1 + i, bar_y + bar_h), color, 1)
-                
-                cv2.addWeighted(progress_overlay, 0.9, frame, 0.1, 0, frame)
+                # Gradient from cyan to magenta, one column per pixel of the fill
+                ratio = np.arange(fill_w, dtype=np.float64)[:, None] / fill_w
+                gradient = (np.array(CYBER_CYAN) * (1 - ratio) + np.array(NEON_MAGENTA) * ratio).astype(np.uint8)
+                bar = frame[bar_y:bar_y + bar_h + 1, bar_x1:bar_x1 + fill_w]
+                cv2.addWeighted(np.broadcast_to(gradient, bar.shape), 0.9, bar, 0.1, 0, bar)
             
             # Time remaining text
             time_text = f"{remaining}s"
@@ -452,47 +688,58 @@ class CameraFiltersAutomation:
         cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
 
         print("--- APP RUNNING ---")
-        
-        first_frame = True  # Flag to resize menu on first frame
+
+
+        profiler = self.profiler
+        stats = self.stats
+        preprocessor = self.preprocessor
+        pool = self.buffer_pool
 
         while self.cap.isOpened():
-            ret, frame = self.cap.read()
-            if not ret: break
-            frame = cv2.flip(frame, 1)
-            
-            # On first frame, ensure menu fits actual frame dimensions
-            if first_frame and self.menu_image is not None:
-                actual_h, actual_w = frame.shape[:2]
-                menu_h, menu_w = self.menu_image.shape[:2]
-                
-                # Check if menu needs resizing for actual frame
-                max_menu_h = int(actual_h * 0.8)  # Max 80% of actual height
-                max_menu_w = int(actual_w * 0.35)  # Max 35% of actual width
-                
-                if menu_h > max_menu_h or menu_w > max_menu_w:
-                    scale_h = max_menu_h / menu_h
-                    scale_w = max_menu_w / menu_w
-                    scale = min(scale_h, scale_w)
-                    
-                    new_w = int(menu_w * scale)
-                    new_h = int(menu_h * scale)
-                    
-                    self.menu_image = cv2.resize(self.menu_image, (new_w, new_h), interpolation=cv2.INTER_AREA)
-                
-                first_frame = False
+            self.profile_capture.tick()
+            profiler.begin_frame()
+            ret, raw = preprocessor.read(self.cap)
+            if not ret:
+                stats.capture_failures += 1
+                break
+            profiler.mark("capture")
+            work_start = time.perf_counter()
+            # Mirror + resize to the output geometry, into a preallocated buffer
+            frame = preprocessor.process(raw)
+            # Derived products (RGB, gray, landmarks...) are computed at most once per frame
+            ctx = FrameContext(frame, index=stats.frames_total, tracker=self.face_tracker, pool=pool)
+            rendered = None  # Pooled filter output, returned after display
+            profiler.mark("preprocess")
             
             # Apply static menu overlay at top-left position (20, 20)
             self.overlay_image_alpha(frame, self.menu_image, (20, 20))
 
             self.update_queue()
-
-            if self.current_filter:
-                frame = self.current_filter["instance"].apply(frame)
+            profiler.mark("update_queue")
+
+            if self.filter_stack.active:
+                # Every running filter, in layer order, into the same buffer: the frame itself when
+                # they all declare in_place (no full-frame copy), a pooled one otherwise
+                if not self.filter_stack.in_place:
+                    rendered = pool.like(frame)
+                frame = self.filter_stack.render(frame, ctx, dst=frame if rendered is None else rendered)
+                for entry in self.filter_stack.active:
+                    stats.filter_rendered(entry["name"], entry["render_seconds"])
+                for trace, instance in self.pending_traces:
+                    if instance.loaded:
+                        trace.mark("rendered")
+            profiler.mark("filter")
 
             self.draw_queue_box(frame)
+            profiler.mark("hud")
+
+            profiler.draw_overlay(frame)
+            ctx.invalidate()  # HUD and overlay draw in place
+            profiler.mark("overlay")
 
             # Manual Testing Keys
             key = cv2.waitKey(1) & 0xFF
+            profiler.mark("waitkey")
             if key == ord('q'):
                 break
             elif key == ord('1'):
@@ -503,11 +750,44 @@ class CameraFiltersAutomation:
                 self.process_tip(99)   # Big Eyes - 99 tokens
             elif key == ord('4'):
                 self.process_tip(200)  # Cyber Mask - 200 tokens
-
-            self.output.display(frame)
+            elif key == ord('p'):
+                self.profile_capture.request()  # Profile the next PROFILE_SECONDS
+
+            # Processing time only: camera wait and vcam pacing don't count against the budget
+            if self.governor.update(time.perf_counter() - work_start, bool(self.filter_stack.active)):
+                self.apply_quality(self.governor.settings)
+            self.output.display(frame, ctx)
+            ctx.invalidate()
+            pool.release(rendered)
+            if not startup_timer.reported:
+                startup_timer.mark("first frame")
+                startup_timer.report()
+                if self.preload_filters:
+                    prefetch_all(self.filters)
+            for trace, _ in self.pending_traces:
+                if trace.has("rendered"):
+                    self.finish_trace(trace)
+            self.pending_traces = [(trace, instance) for trace, instance in self.pending_traces
+                                   if not trace.has("displayed")]
+            profiler.mark("display")
+            profiler.end_frame()
+            stats.frame_done()
 
         self.output.stop()
         self.cap.release()
+        if self.face_tracker is not None:
+            self.face_tracker.close()  # Stops the landmark worker (thread or process)
+        if self.metrics_server:
+            self.metrics_server.stop()
+        profiler.export()
+
+
+def parse_camera_index(value):
+    """CAMERA_INDEX: a number selects that device directly; empty or 'auto' means discovery."""
+    value = (value or '').strip().lower()
+    if value in ('', 'auto'):
+        return None
+    return int(value)
 
 
 def load_config_from_env():
@@ -534,8 +814,25 @@ def load_config_from_env():
         'camsoda_url': os.getenv('CAMSODA_URL') if str_to_bool(os.getenv('CAMSODA_ENABLED', 'true')) else None,
         'output_mode': os.getenv('OUTPUT_MODE', 'window'),
         'quality': os.getenv('QUALITY', '1080p'),
-        'camera_index': int(os.getenv('CAMERA_INDEX', '0')),
+        'camera_index': parse_camera_index(os.getenv('CAMERA_INDEX', '')),
+        'camera_prompt': str_to_bool(os.getenv('CAMERA_PROMPT', 'true')),
+        'camera_format': os.getenv('CAMERA_FORMAT', 'auto'),
+        'camera_probe_seconds': float(os.getenv('CAMERA_PROBE_SECONDS', '1.0') or 1.0),
         'debug_mode': str_to_bool(os.getenv('DEBUG_MODE', 'false')),
+        'metrics_port': int(os.getenv('METRICS_PORT', '0') or 0),
+        'profile_seconds': float(os.getenv('PROFILE_SECONDS', '10') or 10),
+        'preload_filters': str_to_bool(os.getenv('PRELOAD_FILTERS', 'true')),
+        'adaptive_quality': str_to_bool(os.getenv('ADAPTIVE_QUALITY', 'true')),
+        'motion_threshold': float(os.getenv('MOTION_THRESHOLD', '0.002') or 0),
+        'motion_max_age': int(os.getenv('MOTION_MAX_AGE', '10') or 10),
+        'async_landmarks': str_to_bool(os.getenv('ASYNC_LANDMARKS', 'true')),
+        'extrapolate_landmarks': str_to_bool(os.getenv('EXTRAPOLATE_LANDMARKS', 'false')),
+        'landmark_backend': os.getenv('LANDMARK_BACKEND', 'inprocess').lower(),
+        'roi_tracking': str_to_bool(os.getenv('ROI_TRACKING', 'true')),
+        'max_faces': int(os.getenv('MAX_FACES', '1') or 1),
+        'face_budget_ms': float(os.getenv('FACE_BUDGET_MS')) if os.getenv('FACE_BUDGET_MS') else None,
+        'filter_cost_ms': float(os.getenv('FILTER_COST_MS')) if os.getenv('FILTER_COST_MS') else None,
+        'menu_overlay': os.getenv('MENU_OVERLAY') or None,
         'verbose_logging': str_to_bool(os.getenv('VERBOSE_LOGGING', 'false'))
     }
     
@@ -543,6 +840,11 @@ def load_config_from_env():
 
 
 if __name__ == "__main__":
+    # python main.py --startup-profile: import-time breakdown in a fresh interpreter, then exit
+    if "--startup-profile" in sys.argv[1:]:
+        print_import_breakdown(import_targets())
+        sys.exit(0)
+
     # Încarcă configurația din .env
     config = load_config_from_env()
     
@@ -568,8 +870,10 @@ if __name__ == "__main__":
     
     print(f"\n⚙️  Settings:")
     print(f"   Output Mode: {config['output_mode']}")
-    print(f"   Quality: {config['quality']}")
+    print(f"   Quality: {config['quality']}{' (adaptive)' if config['adaptive_quality'] else ''}")
+    print(f"   Camera: {config['camera_index'] if config['camera_index'] is not None else 'auto'}")
     print(f"   Debug Mode: {'On' if config['debug_mode'] else 'Off'}")
+    print(f"   Metrics: {'http://127.0.0.1:%d/metrics' % config['metrics_port'] if config['metrics_port'] else 'Off'}")
     print("=" * 60 + "\n")
     
     # Inițializează aplicația cu configurația din .env
@@ -578,7 +882,26 @@ if __name__ == "__main__":
         stripchat_url=config['stripchat_url'],
         camsoda_url=config['camsoda_url'],
         output_mode=config['output_mode'],
-        quality=config['quality']
+        quality=config['quality'],
+        debug_mode=config['debug_mode'],
+        metrics_port=config['metrics_port'],
+        profile_seconds=config['profile_seconds'],
+        camera_index=config['camera_index'],
+        camera_prompt=config['camera_prompt'],
+        camera_format=config['camera_format'],
+        camera_probe_seconds=config['camera_probe_seconds'],
+        preload_filters=config['preload_filters'],
+        adaptive_quality=config['adaptive_quality'],
+        motion_threshold=config['motion_threshold'],
+        motion_max_age=config['motion_max_age'],
+        async_landmarks=config['async_landmarks'],
+        extrapolate_landmarks=config['extrapolate_landmarks'],
+        landmark_backend=config['landmark_backend'],
+        roi_tracking=config['roi_tracking'],
+        max_faces=config['max_faces'],
+        face_budget_ms=config['face_budget_ms'],
+        filter_cost_ms=config['filter_cost_ms'],
+        menu_overlay=config['menu_overlay']
     )
     app.run()
 
@@ -2,8 +2,10 @@ import cv2
 import numpy as np
 import os
 
+from core.AssetCache import AssetCache
+
 def overlay_image_alpha(img, overlay, pos):
-    """Test the alpha blending function"""
+    """Test the alpha blending function (premultiplied BGRA, as main.py blends it)"""
     if overlay is None:
         return
     
@@ -18,30 +20,14 @@ def overlay_image_alpha(img, overlay, pos):
     # Extract ROI
     roi = img[y:y+h, x:x+w]
     
-    # Check if overlay has alpha channel
-    if len(overlay.shape) == 3 and overlay.shape[2] == 4:
-        print("✅ Overlay has 4 channels (BGRA)")
-        
-        # Get alpha channel stats
-        alpha_channel = overlay[:, :, 3]
-        print(f"   Alpha min: {alpha_channel.min()}, max: {alpha_channel.max()}, mean: {alpha_channel.mean():.2f}")
-        
-        # BGRA image with alpha channel
-        overlay_bgr = overlay[:, :, :3].astype(float)
-        alpha_mask = overlay[:, :, 3].astype(float) / 255.0
-        
-        # Expand alpha mask to 3 channels
-        alpha_3ch = cv2.merge([alpha_mask, alpha_mask, alpha_mask])
-        
-        # Blend
-        blended = (overlay_bgr * alpha_3ch + roi.astype(float) * (1.0 - alpha_3ch)).astype('uint8')
-        
-        # Place result back
-        img[y:y+h, x:x+w] = blended
-        print("✅ Alpha blending completed")
-    else:
-        print(f"⚠️ Overlay has {overlay.shape[2] if len(overlay.shape) > 2 else 1} channels (expected 4)")
-        img[y:y+h, x:x+w] = overlay
+    alpha_channel = overlay[:, :, 3]
+    print(f"   Alpha min: {alpha_channel.min()}, max: {alpha_channel.max()}, mean: {alpha_channel.mean():.2f}")
+    
+    # Blend: background * (1 - alpha) + overlay, the overlay colors being already times alpha
+    inverse_alpha = cv2.cvtColor(255 - alpha_channel, cv2.COLOR_GRAY2BGR)
+    cv2.multiply(roi, inverse_alpha, dst=roi, scale=1 / 255)
+    cv2.add(roi, cv2.cvtColor(overlay, cv2.COLOR_BGRA2BGR), dst=roi)
+    print("✅ Alpha blending completed")
 
 # Test 1: Load the menu overlay
 print("=" * 60)
@@ -49,9 +35,10 @@ print("TEST 1: Loading Menu Overlay")
 print("=" * 60)
 
 menu_path = os.path.join("assets", "menu_overlay.png")
-menu_image = cv2.imread(menu_path, cv2.IMREAD_UNCHANGED)
-
-if menu_image is None:
+# Same path as the app: decoded once, premultiplied and fitted to a 1080p output, cached in assets/.cache
+try:
+    menu_image = AssetCache().image("menu_overlay.png", fit=(int(1920 * 0.35), int(1080 * 0.8)))
+except FileNotFoundError:
     print(f"❌ FAILED to load: {menu_path}")
     print(f"   Current directory: {os.getcwd()}")
     print(f"   File exists: {os.path.exists(menu_path)}")
@@ -125,10 +112,10 @@ while True:
     if key == ord('q'):
         break
     
-    # Show just the menu (BGR only)
+    # Show just the menu (premultiplied BGR)
     if channels == 4:
-        menu_bgr = menu_image[:, :, :3]
-        cv2.imshow("3. Menu Image (BGR only)", menu_bgr)
+        menu_bgr = cv2.cvtColor(menu_image, cv2.COLOR_BGRA2BGR)
+        cv2.imshow("3. Menu Image (premultiplied BGR)", menu_bgr)
         key = cv2.waitKey(0) & 0xFF
         if key == ord('q'):
             break
@@ -0,0 +1,60 @@
+"""
+Benchmark pentru throughput-ul de captură
+Măsoară FPS-ul livrat real de cameră pentru fiecare format (MJPG/YUYV) și rezoluție.
+
+Usage:
+    python tests/benchmark_capture.py --camera 0
+    python tests/benchmark_capture.py --camera 0 --seconds 3 --output capture.json
+"""
+import argparse
+import json
+import os
+import sys
+
+import cv2
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.CameraDiscovery import CameraDiscovery
+from core.CaptureNegotiator import CaptureNegotiator
+
+MODES = {
+    "720p": (1280, 720, 60),
+    "1080p": (1920, 1080, 60),
+    "4K": (3840, 2160, 30),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure delivered capture FPS per format and resolution")
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--seconds", type=float, default=2.0, help="Measurement time per format")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    cap = cv2.VideoCapture(args.camera, CameraDiscovery.backend())
+    if not cap.isOpened():
+        print("❌ Nu am putut accesa camera")
+        return 1
+
+    results = []
+    for mode in args.modes:
+        width, height, fps = MODES[mode]
+        print(f"\n🎥 {mode} ({width}x{height} @ {fps})")
+        result = CaptureNegotiator(cap, width, height, fps).negotiate(probe_seconds=args.seconds)
+        results.append({"mode": mode, "chosen": result["fourcc"], "candidates": result["candidates"]})
+    cap.release()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results saved to {args.output}")
+    else:
+        print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Benchmark offline pentru filtre și HUD
+Rulează apply() pentru fiecare filtru și draw_queue_box() pe frame-uri sintetice
+sau înregistrate la 720p, 1080p și 4K, fără cameră.
+
+Usage:
+    python tests/benchmark_filters.py
+    python tests/benchmark_filters.py --frames 120 --output bench.json
+    python tests/benchmark_filters.py --video recording.mp4 --resolutions 1080p
+    python tests/benchmark_filters.py --video session.mp4 --landmarks session.npz
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+# Adaugă path-ul proiectului
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+RESOLUTIONS = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4K": (3840, 2160),
+}
+
+# (name, module, class, constructor kwargs)
+FILTERS = [
+    ("Sparkles", "filters.RainSparkleFilter", "RainSparkleFilter", {"seed": 1234}),
+    ("Rabbit Ears", "filters.RabbitEarsFilter", "RabbitEarsFilter", {}),
+    ("Big Eyes", "filters.BigEyeFilter", "BigEyeFilter", {}),
+    ("Cyber Mask", "filters.FaceMask3DFilter", "FaceMask3D", {}),
+]
+
+SEED = 1234
+
+
+def synthetic_frames(width, height, count=8, seed=SEED):
+    """Generează frame-uri deterministe (gradient + zgomot) de dimensiunea cerută."""
+    rng = np.random.default_rng(seed)
+    base = np.zeros((height, width, 3), dtype=np.uint8)
+    base[:, :, 0] = np.linspace(40, 200, width, dtype=np.uint8)[None, :]
+    base[:, :, 1] = np.linspace(60, 180, height, dtype=np.uint8)[:, None]
+    base[:, :, 2] = 128
+    frames = []
+    for _ in range(count):
+        noise = rng.integers(0, 24, size=(height, width, 3), dtype=np.uint8)
+        frames.append(cv2.add(base, noise))
+    return frames
+
+
+def recorded_frames(path, width, height, count=60):
+    """Citește primele `count` frame-uri dintr-un video sau o imagine și le redimensionează."""
+    frames = []
+    image = cv2.imread(path, cv2.IMREAD_COLOR)
+    if image is not None:
+        frames.append(image)
+    else:
+        cap = cv2.VideoCapture(path)
+        while len(frames) < count:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+
+    if not frames:
+        raise ValueError(f"Could not read frames from {path}")
+    return [cv2.resize(f, (width, height), interpolation=cv2.INTER_AREA) for f in frames]
+
+
+def make_hud_host(active):
+    """
+    Construiește un CameraFiltersAutomation fără cameră/listeners, doar cu starea
+    necesară pentru draw_queue_box().
+    """
+    from core.FilterStack import FilterStack
+    from main import CameraFiltersAutomation
+
+    host = CameraFiltersAutomation.__new__(CameraFiltersAutomation)
+    host.filter_stack = FilterStack()
+    host.queue = host.filter_stack.queue
+    host.simple_hud = False
+    if active:
+        host.filter_stack.active.append({"name": "Big Eyes", "user": "Bench", "duration": 3600, "instance": None,
+                                         "layer": "warp", "end_time": time.time() + 3600})
+        for name in ("Sparkles", "Rabbit Ears", "Cyber Mask"):
+            host.queue.append({"name": name, "user": "Bench", "duration": 10, "instance": None})
+    return host
+
+
+def load_scenarios(only=None, landmarks=None, frame_count=None):
+    """
+    Returnează lista de (nume, factory) unde factory() creează un callable frame -> frame.
+    Cu `landmarks`, filtrele cu Face Mesh primesc un ReplayFaceMesh în loc de inferență MediaPipe.
+    """
+    scenarios = []
+    for name, module_name, class_name, kwargs in FILTERS:
+        def factory(name=name, module_name=module_name, class_name=class_name, kwargs=kwargs):
+            cls = getattr(importlib.import_module(module_name), class_name)
+            if landmarks and name != "Sparkles":
+                from core.LandmarkReplay import ReplayFaceMesh
+                kwargs = dict(kwargs, face_mesh=ReplayFaceMesh(landmarks, max_frames=frame_count))
+            return cls(**kwargs).apply
+        scenarios.append((name, factory))
+
+    for name, active in (("HUD idle", False), ("HUD active", True)):
+        def factory(active=active):
+            host = make_hud_host(active)
+
+            def draw(frame):
+                host.draw_queue_box(frame)
+                return frame
+            return draw
+        scenarios.append((name, factory))
+
+    if only:
+        wanted = {n.lower() for n in only}
+        scenarios = [s for s in scenarios if s[0].lower() in wanted]
+    return scenarios
+
+
+def run_scenario(render, frames, iterations, warmup):
+    """
+    Măsoară timpul per frame, apoi (într-o a doua trecere, cu tracemalloc pornit)
+    memoria alocată tranzitoriu per frame.
+    """
+    # Un singur contor pentru toate trecerile, ca un ReplayFaceMesh să rămână sincronizat cu frame-urile
+    n = len(frames)
+    k = 0
+    for _ in range(warmup):
+        render(frames[k % n].copy())
+        k += 1
+
+    times_ms = np.empty(iterations, dtype=np.float64)
+    for i in range(iterations):
+        work = frames[k % n].copy()
+        k += 1
+        t0 = time.perf_counter_ns()
+        render(work)
+        times_ms[i] = (time.perf_counter_ns() - t0) / 1e6
+
+    # Memory pass: peak bytes allocated above the baseline while rendering one frame
+    mem_iterations = min(iterations, 20)
+    tracemalloc.start()
+    start_current, _ = tracemalloc.get_traced_memory()
+    peaks = []
+    for _ in range(mem_iterations):
+        work = frames[k % n].copy()
+        k += 1
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        render(work)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+        del work
+    end_current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "ms_mean": float(times_ms.mean()),
+        "ms_p50": float(np.percentile(times_ms, 50)),
+        "ms_p95": float(np.percentile(times_ms, 95)),
+        "ms_min": float(times_ms.min()),
+        "ms_std": float(times_ms.std()),
+        "alloc_peak_mb_mean": float(np.mean(peaks) / 2 ** 20),
+        "alloc_peak_mb_max": float(np.max(peaks) / 2 ** 20),
+        "retained_kb": float((end_current - start_current) / 1024),
+    }
+
+
+def collect_meta():
+    """Informații despre mediu, pentru a compara rulări între commit-uri."""
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.node(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "seed": SEED,
+    }
+
+
+def run_benchmarks(resolutions=("720p", "1080p", "4K"), iterations=60, warmup=5, video=None, only=None,
+                   landmarks=None, log=print):
+    """Rulează toate scenariile și returnează raportul (dict serializabil JSON)."""
+    report = {"meta": collect_meta(), "results": []}
+    report["meta"]["landmarks"] = "replay" if landmarks else "mediapipe"
+
+    for res_name in resolutions:
+        width, height = RESOLUTIONS[res_name]
+        if video:
+            frames = recorded_frames(video, width, height)
+        else:
+            frames = synthetic_frames(width, height)
+
+        for name, factory in load_scenarios(only, landmarks, len(frames)):
+            entry = {"scenario": name, "resolution": res_name, "width": width, "height": height}
+            try:
+                render = factory()
+            except Exception as e:
+                entry.update({"status": "skipped", "reason": f"{type(e).__name__}: {e}"})
+                log(f"⏭️  {name:<12} {res_name:>6}  skipped ({entry['reason']})")
+                report["results"].append(entry)
+                continue
+
+            entry.update(run_scenario(render, frames, iterations, warmup))
+            entry["status"] = "ok"
+            log(f"⏱️  {name:<12} {res_name:>6}  {entry['ms_mean']:8.2f} ms/frame  "
+                f"p95 {entry['ms_p95']:8.2f}  peak alloc {entry['alloc_peak_mb_max']:7.1f} MB")
+            report["results"].append(entry)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for AR filters and the queue HUD")
+    parser.add_argument("--resolutions", nargs="+", default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument("--frames", type=int, default=60, help="Measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--video", help="Recorded video/image used instead of synthetic frames")
+    parser.add_argument("--landmarks", help="Recorded landmarks (.npz) replayed instead of running MediaPipe")
+    parser.add_argument("--only", nargs="+", help="Scenario names to run (e.g. Sparkles 'HUD active')")
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    args = parser.parse_args()
+
+    # Tabelul merge pe stderr ca stdout să rămână JSON curat
+    def log(msg):
+        print(msg, file=sys.stderr)
+
+    report = run_benchmarks(args.resolutions, args.frames, args.warmup, args.video, args.only,
+                            landmarks=args.landmarks, log=log)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        log(f"📄 Report saved to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
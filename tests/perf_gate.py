@@ -0,0 +1,225 @@
+"""
+Performance regression gate
+Compară un benchmark nou (tests/benchmark_filters.py) cu baseline-urile salvate în
+tests/perf_baselines.json și iese cu cod 1 dacă un scenariu (filtru × rezoluție)
+a devenit mai lent decât pragul configurat, lipsește sau nu a putut rula.
+Filtrele cu landmarks primesc fața înregistrată din tests/perf_landmarks.npz, ca
+benchmark-ul să măsoare randarea lor, nu doar ramura "nicio față detectată".
+Orice commit care schimbă performanța unui scenariu rulează și --update.
+
+Usage:
+    python tests/perf_gate.py                      # rulează benchmark-ul și compară
+    python tests/perf_gate.py --results bench.json # compară un raport existent, din
+        benchmark_filters.py --landmarks tests/perf_landmarks.npz --output bench.json
+    python tests/perf_gate.py --update             # rescrie baseline-urile (pe build box)
+"""
+import argparse
+import json
+import os
+import sys
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.benchmark_filters import RESOLUTIONS, run_benchmarks
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_baselines.json")
+DEFAULT_LANDMARKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_landmarks.npz")
+
+# Valori implicite, suprascrise de câmpurile cu același nume din fișierul de baseline
+DEFAULTS = {
+    "threshold_pct": 25.0,   # Încetinire maximă acceptată față de baseline
+    "noise_k": 1.0,          # Delta trebuie să depășească și noise_k * diferența dintre rulări
+    "min_delta_ms": 0.25,    # Ignoră diferențe sub acest prag absolut (scenarii foarte ieftine)
+}
+
+
+def scenario_key(entry):
+    return f"{entry['scenario']}@{entry['resolution']}"
+
+
+def merge_runs(reports):
+    """
+    Combină mai multe rulări (--repeat): cel mai mic p50 per scenariu (cel mai puțin afectat de
+    zgomot) și diferența max - min a p50 între rulări. Varianța din interiorul unei rulări nu
+    prinde încetinirile care țin o rulare întreagă (alt proces, frecvența CPU).
+
+    Returns:
+        tuple: ({cheie: valori}, {cheie: motivul pentru care scenariul nu a rulat})
+    """
+    runs = {}
+    skipped = {}
+    for report in reports:
+        for entry in report["results"]:
+            key = scenario_key(entry)
+            if entry.get("status") == "ok":
+                runs.setdefault(key, []).append(entry)
+            else:
+                skipped[key] = entry.get("reason", entry.get("status"))
+
+    merged = {}
+    for key, entries in runs.items():
+        best = min(entries, key=lambda entry: entry["ms_p50"])
+        p50 = [entry["ms_p50"] for entry in entries]
+        merged[key] = {
+            "ms_p50": best["ms_p50"],
+            "ms_min": best["ms_min"],
+            "ms_spread": max(p50) - min(p50),
+            "runs": len(entries),
+            "iterations": best["iterations"],
+            "alloc_peak_mb_max": max(entry.get("alloc_peak_mb_max", 0.0) for entry in entries),
+        }
+    return merged, skipped
+
+
+def compare(baseline, current, settings, skipped=None):
+    """
+    Args:
+        skipped (dict): Scenariile care nu au putut rula (din merge_runs)
+
+    Returns:
+        list: [(key, base_ms, new_ms, delta_pct, status), ...] cu status
+              OK/SLOWER/FASTER/NEW/MISSING/SKIPPED
+    """
+    overrides = settings.get("thresholds", {})
+    skipped = skipped or {}
+    rows = []
+    for key in sorted(set(baseline) | set(current) | set(skipped)):
+        base = baseline.get(key)
+        new = current.get(key)
+        if key in skipped:
+            # Un scenariu care nu mai poate fi construit nu trece doar pentru că nu a fost măsurat
+            rows.append((key, base["ms_p50"] if base else None, None, None, "SKIPPED"))
+            continue
+        if base is None:
+            rows.append((key, None, new["ms_p50"], None, "NEW"))
+            continue
+        if new is None:
+            rows.append((key, base["ms_p50"], None, None, "MISSING"))
+            continue
+
+        scenario = key.split("@")[0]
+        threshold = overrides.get(key, overrides.get(scenario, settings["threshold_pct"]))
+        delta = new["ms_p50"] - base["ms_p50"]
+        delta_pct = 100.0 * delta / base["ms_p50"] if base["ms_p50"] > 0 else 0.0
+        # Zgomotul dintre rulări, cel mai mare dintre baseline și rularea curentă
+        noise = settings["noise_k"] * max(base.get("ms_spread", 0.0), new.get("ms_spread", 0.0))
+
+        if delta_pct > threshold and delta > max(noise, settings["min_delta_ms"]):
+            status = "SLOWER"
+        elif delta_pct < -threshold and -delta > max(noise, settings["min_delta_ms"]):
+            status = "FASTER"
+        else:
+            status = "OK"
+        rows.append((key, base["ms_p50"], new["ms_p50"], delta_pct, status))
+    return rows
+
+
+def print_table(rows, settings):
+    print("\n" + "=" * 78)
+    print(f"  PERF GATE (threshold {settings['threshold_pct']:.0f}%, noise k={settings['noise_k']:g})")
+    print("=" * 78)
+    print(f"  {'scenario':<26}{'baseline ms':>13}{'current ms':>13}{'delta':>10}   status")
+    print("-" * 78)
+    icons = {"OK": "✅", "SLOWER": "❌", "FASTER": "🚀", "NEW": "🆕", "MISSING": "❌", "SKIPPED": "❌"}
+    for key, base, new, delta_pct, status in rows:
+        base_s = f"{base:.2f}" if base is not None else "-"
+        new_s = f"{new:.2f}" if new is not None else "-"
+        delta_s = f"{delta_pct:+.1f}%" if delta_pct is not None else "-"
+        print(f"  {key:<26}{base_s:>13}{new_s:>13}{delta_s:>10}   {icons[status]} {status}")
+    print("=" * 78)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail when a hot path got slower than its stored baseline")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--results", nargs="+", help="Existing benchmark_filters.py JSON report(s) to compare")
+    parser.add_argument("--update", action="store_true", help="Store the current run as the new baseline")
+    parser.add_argument("--threshold", type=float, help="Override threshold_pct from the baseline file")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Benchmark runs; the best p50 per scenario is used, the spread between runs is the noise")
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--resolutions", nargs="+", default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument("--only", nargs="+", help="Scenario names to run (or compare, with --results)")
+    parser.add_argument("--landmarks", default=DEFAULT_LANDMARKS,
+                        help="Recorded landmarks (.npz) replayed for the face filters")
+    args = parser.parse_args()
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+
+    settings = dict(DEFAULTS)
+    settings.update({k: stored[k] for k in ("threshold_pct", "noise_k", "min_delta_ms", "thresholds") if k in stored})
+    if args.threshold is not None:
+        settings["threshold_pct"] = args.threshold
+
+    if args.results:
+        reports = []
+        for path in args.results:
+            with open(path) as f:
+                reports.append(json.load(f))
+    else:
+        def log(msg):
+            print(msg, file=sys.stderr)
+        reports = [run_benchmarks(args.resolutions, args.frames, only=args.only, landmarks=args.landmarks, log=log)
+                   for _ in range(args.repeat)]
+
+    current, skipped = merge_runs(reports)
+
+    if args.update:
+        if skipped:
+            print(f"❌ Not updating, {len(skipped)} scenario(s) skipped: {skipped}")
+            return 1
+        stored.update({k: v for k, v in settings.items()})
+        stored["meta"] = reports[-1]["meta"]
+        stored["scenarios"] = current
+        with open(args.baseline, "w") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"💾 Baseline updated: {len(current)} scenarios -> {args.baseline}")
+        return 0
+
+    if not stored.get("scenarios"):
+        print(f"❌ No baselines in {args.baseline}. Run with --update on the build box first.")
+        return 2
+
+    meta = stored.get("meta", {})
+    machine = meta.get("machine")
+    if machine and machine != reports[-1]["meta"].get("machine"):
+        print(f"⚠️  Baseline was recorded on '{machine}', comparing on '{reports[-1]['meta'].get('machine')}'")
+    if meta.get("landmarks") != reports[-1]["meta"].get("landmarks"):
+        print(f"❌ Baseline landmarks '{meta.get('landmarks')}' vs current '{reports[-1]['meta'].get('landmarks')}': "
+              f"the face filters render different paths, re-run with --update")
+        return 2
+
+    baseline = stored["scenarios"]
+    baseline = {k: v for k, v in baseline.items() if k.split("@")[1] in args.resolutions}
+    if args.only:
+        # Și pentru --results: un raport parțial se compară doar cu --only / --resolutions
+        wanted = {name.lower() for name in args.only}
+        baseline = {k: v for k, v in baseline.items() if k.split("@")[0].lower() in wanted}
+
+    rows = compare(baseline, current, settings, skipped)
+    print_table(rows, settings)
+
+    regressions = [row for row in rows if row[4] == "SLOWER"]
+    if regressions:
+        print(f"\n❌ {len(regressions)} scenario(s) slower than {settings['threshold_pct']:.0f}%:")
+        for key, base, new, delta_pct, _ in regressions:
+            print(f"   {key}: {base:.2f} ms -> {new:.2f} ms ({delta_pct:+.1f}%)")
+    not_measured = [row for row in rows if row[4] in ("MISSING", "SKIPPED")]
+    if not_measured:
+        print(f"\n❌ {len(not_measured)} scenario(s) not measured:")
+        for key, _, _, _, status in not_measured:
+            print(f"   {key}: {status.lower()}" + (f" ({skipped[key]})" if key in skipped else ""))
+    if regressions or not_measured:
+        return 1
+
+    print("\n✅ No performance regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
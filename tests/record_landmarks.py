@@ -0,0 +1,70 @@
+"""
+Înregistrează landmarks Face Mesh + video dintr-o sesiune live cu camera.
+Fișierele rezultate pot fi redate cu core.LandmarkReplay.ReplayFaceMesh
+(ex. în tests/benchmark_filters.py --video ... --landmarks ...).
+
+Usage:
+    python tests/record_landmarks.py --output session.npz --video session.mp4
+    Apasă 'q' pentru a opri înregistrarea.
+"""
+import argparse
+import os
+import sys
+
+import cv2
+import mediapipe as mp
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.LandmarkReplay import LandmarkRecorder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record a landmark stream with the matching video")
+    parser.add_argument("--output", default="landmarks.npz", help="Landmark file (.npz)")
+    parser.add_argument("--video", default="landmarks.mp4", help="Matching video file")
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--max-faces", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=0, help="Stop automatically after N seconds (0 = until 'q')")
+    args = parser.parse_args()
+
+    face_mesh = mp.solutions.face_mesh.FaceMesh(refine_landmarks=True, max_num_faces=args.max_faces)
+    recorder = LandmarkRecorder(args.output, video_path=args.video, fps=args.fps, max_faces=args.max_faces)
+
+    cap = cv2.VideoCapture(args.camera)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, args.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, args.height)
+    cap.set(cv2.CAP_PROP_FPS, args.fps)
+    if not cap.isOpened():
+        print("❌ Nu am putut accesa camera")
+        return 1
+
+    print("🔴 Recording... press 'q' to stop")
+    max_frames = int(args.seconds * args.fps) if args.seconds else None
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frame = cv2.flip(frame, 1)  # Același mirror ca în main.py
+
+        results = face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        recorder.add(results, frame)
+
+        cv2.imshow("Landmark Recorder", frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+        if max_frames and len(recorder) >= max_frames:
+            break
+
+    cap.release()
+    cv2.destroyAllWindows()
+    recorder.save()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Test script pentru AssetCache
+Verifică premultiplicarea și scalarea, bufferul comun între consumatori, citirea din
+.npy (memory map) la o pornire nouă și invalidarea când se schimbă imaginea sursă
+"""
+import os
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.AssetCache import AssetCache
+
+
+def write_image(path, color, alpha):
+    image = np.zeros((200, 400, 4), dtype=np.uint8)
+    image[:] = color + (alpha,)
+    cv2.imwrite(path, image)
+
+
+def test_shared_variants():
+    """Aceeași variantă e un singur buffer; varianta scalată încape în cutie și e premultiplicată"""
+    print("=" * 60)
+    print("TEST 1: Premultiplicare, scalare, buffer comun")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp:
+        write_image(os.path.join(tmp, "menu.png"), (200, 100, 50), 128)
+        cache = AssetCache(tmp)
+        first, second = cache.image("menu.png"), cache.image("menu.png")
+        fitted = cache.image("menu.png", fit=(100, 100))
+
+        if first is not second or first.flags.writeable or cache.builds_total != 2:
+            print(f"❌ Trebuia un singur buffer read-only per variantă ({cache.builds_total} build-uri)")
+            return False
+        if fitted.shape != (50, 100, 4) or first[0, 0].tolist() != [100, 50, 25, 128]:
+            print(f"❌ Variantă greșită: {fitted.shape}, pixel {first[0, 0].tolist()}")
+            return False
+
+    print(f"✅ Un buffer comun, pixel premultiplicat {first[0, 0].tolist()}, scalat la {fitted.shape[1]}x{fitted.shape[0]}")
+    print()
+    return True
+
+
+def test_disk_cache_invalidation():
+    """O pornire nouă citește .npy fără decode; atingerea fișierului nu invalidează, modificarea da"""
+    print("=" * 60)
+    print("TEST 2: Cache pe disc și invalidare")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp:
+        path = os.path.join(tmp, "sticker.png")
+        write_image(path, (0, 0, 255), 255)
+        AssetCache(tmp).image("sticker.png")
+
+        restarted = AssetCache(tmp)
+        image = restarted.image("sticker.png")
+        if not isinstance(image, np.memmap) or restarted.builds_total or restarted.disk_loads_total != 1:
+            print(f"❌ La repornire trebuia citit memmap-ul ({restarted.builds_total} build-uri)")
+            return False
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        touched = AssetCache(tmp)
+        touched.image("sticker.png")
+        if touched.builds_total:
+            print("❌ Un fișier doar atins (același conținut) nu trebuie decodat din nou")
+            return False
+
+        write_image(path, (255, 0, 0), 255)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10 ** 9))
+        changed = AssetCache(tmp)
+        pixel = changed.image("sticker.png")[0, 0].tolist()
+        if changed.builds_total != 1 or pixel != [255, 0, 0, 255]:
+            print(f"❌ Imaginea modificată trebuia refăcută: pixel {pixel}")
+            return False
+
+    print("✅ Memmap la repornire, mtime schimbat fără rebuild, conținut nou refăcut")
+    print()
+    return True
+
+
+def main():
+    tests = [test_shared_variants, test_disk_cache_invalidation]
+    passed = sum(1 for test in tests if test())
+
+    print("=" * 60)
+    print(f"REZULTATE FINALE: {passed}/{len(tests)} teste reușite")
+    print("=" * 60)
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Test script pentru AsyncFaceTracker
+Verifică faptul că randarea nu așteaptă inferența, că worker-ul ia mereu cel mai nou frame
+și că rezultatele sunt etichetate (și extrapolate) corect
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.AsyncFaceTracker import AsyncFaceTracker
+from core.LandmarkReplay import ReplayFaceLandmarks, ReplayResults
+
+
+class SlowFaceMesh:
+    """Model fals lent: fața se mută spre dreapta cu 0.01 pe frame (frame-ul e codat în pixelul 0,0)."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.seen = []
+
+    def process(self, rgb_frame):
+        index = int(rgb_frame[0, 0, 0])
+        self.seen.append(index)
+        time.sleep(self.seconds)
+        points = np.full((478, 3), 0.5, dtype=np.float32)
+        points[:, 0] = 0.1 + 0.01 * index
+        return ReplayResults([ReplayFaceLandmarks(points)])
+
+
+def make_frame(index):
+    frame = np.zeros((36, 64, 3), dtype=np.uint8)
+    frame[0, 0, 0] = index
+    return frame
+
+
+def wait_for_result(tracker, index, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while tracker.result_index != index and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    return tracker.result_index == index
+
+
+def test_latest_wins():
+    """process() nu blochează, iar frame-urile trimise cât modelul e ocupat sunt înlocuite"""
+    print("=" * 60)
+    print("TEST 1: Inferență pe worker, cel mai nou frame câștigă")
+    print("=" * 60)
+
+    mesh = SlowFaceMesh(0.1)
+    tracker = AsyncFaceTracker(mesh)
+    try:
+        start = time.perf_counter()
+        first = tracker.process(make_frame(0), frame_index=0)
+        deadline = time.perf_counter() + 2.0
+        while not mesh.seen:  # modelul a preluat frame-ul 0 și e ocupat
+            if time.perf_counter() > deadline:
+                print("❌ Worker-ul nu a preluat niciun frame")
+                return False
+            time.sleep(0.001)
+        for index in range(1, 10):
+            tracker.process(make_frame(index), frame_index=index)
+        elapsed = time.perf_counter() - start
+        if elapsed > 0.05:
+            print(f"❌ process() a așteptat modelul ({elapsed * 1000:.0f} ms pentru 10 frame-uri)")
+            return False
+        if first is not None:
+            print("❌ Primul frame nu poate avea încă landmarks")
+            return False
+
+        if not wait_for_result(tracker, 9):
+            print(f"❌ Ultimul frame nu a fost procesat (model a văzut {mesh.seen})")
+            return False
+        if mesh.seen != [0, 9]:
+            print(f"❌ Expected frames [0, 9] to reach the model, got {mesh.seen}")
+            return False
+
+        results = tracker.process(make_frame(10), frame_index=10)
+        x = results.multi_face_landmarks[0].landmark[0].x
+        if tracker.result_age != 1 or abs(x - 0.19) > 1e-6:
+            print(f"❌ Rezultat greșit: age {tracker.result_age}, x {x:.3f}")
+            return False
+    finally:
+        tracker.close()
+
+    print(f"✅ 10 frame-uri trimise în {elapsed * 1000:.1f} ms, {tracker.dropped_total} înlocuite, age 1")
+    print()
+    return True
+
+
+def test_extrapolation_and_reset():
+    """Extrapolarea mută fața cu viteza dintre ultimele două inferențe; o pauză uită rezultatele"""
+    print("=" * 60)
+    print("TEST 2: Extrapolare și reset după pauză")
+    print("=" * 60)
+
+    mesh = SlowFaceMesh(0.0)
+    tracker = AsyncFaceTracker(mesh, extrapolate=True, max_extrapolation=3)
+    try:
+        for index in (0, 1):
+            tracker.process(make_frame(index), frame_index=index)
+            if not wait_for_result(tracker, index):
+                print(f"❌ Frame-ul {index} nu a fost procesat")
+                return False
+
+        # Modelul devine lent: cât lucrează la frame-ul 2, cel mai recent rezultat rămâne frame-ul 1
+        mesh.seconds = 0.5
+        results = tracker.process(make_frame(2), frame_index=2)
+        x = results.multi_face_landmarks[0].landmark[0].x
+        if abs(x - 0.12) > 1e-6:
+            print(f"❌ Extrapolat la x {x:.3f}, expected 0.120")
+            return False
+
+        # 1 + 3 frame-uri (limita), nu 1 + 4
+        for index in range(3, 6):
+            results = tracker.process(make_frame(index), frame_index=index)
+        x = results.multi_face_landmarks[0].landmark[0].x
+        if abs(x - 0.14) > 1e-6:
+            print(f"❌ Extrapolarea nu respectă max_extrapolation (x {x:.3f}, expected 0.140)")
+            return False
+
+        if tracker.process(make_frame(20), frame_index=20) is not None:
+            print("❌ După o pauză s-au returnat landmark-urile vechi")
+            return False
+    finally:
+        tracker.close()
+
+    print("✅ Extrapolare liniară limitată la 3 frame-uri, reset după pauză")
+    print()
+    return True
+
+
+def main():
+    tests = [test_latest_wins, test_extrapolation_and_reset]
+    passed = sum(1 for test in tests if test())
+
+    print("=" * 60)
+    print(f"REZULTATE FINALE: {passed}/{len(tests)} teste reușite")
+    print("=" * 60)
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Test script pentru BufferPool
+Verifică refolosirea bufferelor și că filtrele nu mai alocă frame-uri întregi în regim stabil
+"""
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.BufferPool import BufferPool
+from core.FrameContext import FrameContext
+from core.FramePreprocessor import FramePreprocessor
+from core.LandmarkReplay import ReplayFaceLandmarks, ReplayResults
+
+
+class StaticFaceMesh:
+    """Sursă de landmarks care returnează mereu aceeași față (fără inferență MediaPipe)."""
+
+    def __init__(self):
+        rng = np.random.default_rng(0)
+        points = np.zeros((478, 3), dtype=np.float32)
+        points[:, 0] = 0.38 + 0.24 * rng.random(478)
+        points[:, 1] = 0.3 + 0.4 * rng.random(478)
+        points[468] = (0.44, 0.42, 0)  # left eye center
+        points[473] = (0.56, 0.42, 0)  # right eye center
+        points[10] = (0.5, 0.25, 0)    # forehead
+        points[234] = (0.35, 0.5, 0)   # left temple
+        points[454] = (0.65, 0.5, 0)   # right temple
+        self.results = ReplayResults([ReplayFaceLandmarks(points)])
+
+    def process(self, rgb_frame=None):
+        return self.results
+
+
+def test_reuse():
+    """Un buffer eliberat trebuie refolosit pentru aceeași formă; view-urile nu intră în pool"""
+    print("=" * 60)
+    print("TEST 1: Refolosirea bufferelor")
+    print("=" * 60)
+
+    pool = BufferPool()
+    first = pool.acquire((1080, 1920, 3))
+    pool.release(first)
+    second = pool.acquire((1080, 1920, 3))
+    if second is not first:
+        print("❌ Bufferul eliberat nu a fost refolosit")
+        return False
+
+    pool.release(second[10:20])  # view: ignorat
+    if pool.free_bytes != 0:
+        print("❌ Un view a ajuns în pool")
+        return False
+
+    small = BufferPool(max_free_bytes=1000)
+    small.release(np.empty(800, dtype=np.uint8))
+    small.release(np.empty(900, dtype=np.uint8))
+    if small.free_bytes != 900:
+        print(f"❌ Limita de memorie nu e respectată ({small.free_bytes} bytes libere)")
+        return False
+
+    print(f"✅ Alocări: {pool.allocations}, refolosiri: {pool.reuses}")
+    print()
+    return True
+
+
+def test_steady_state_allocations():
+    """După încălzire, fiecare filtru + HUD trebuie să randeze fără alocări de mărimea unui frame"""
+    print("=" * 60)
+    print("TEST 2: Fără alocări per frame în regim stabil (1080p)")
+    print("=" * 60)
+
+    try:
+        from filters.BigEyeFilter import BigEyeFilter
+        from filters.FaceMask3DFilter import FaceMask3D
+        from filters.RabbitEarsFilter import RabbitEarsFilter
+        from filters.RainSparkleFilter import RainSparkleFilter
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    width, height = 1920, 1080
+    frame_bytes = width * height * 3
+    pool = BufferPool()
+    preprocessor = FramePreprocessor(width, height)
+    camera = np.random.default_rng(1).integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+
+    filters = {
+        "Sparkles": RainSparkleFilter(seed=0),
+        "Rabbit Ears": RabbitEarsFilter(face_mesh=StaticFaceMesh()),
+        "Big Eyes": BigEyeFilter(face_mesh=StaticFaceMesh(), buffer_pool=pool),
+        "Cyber Mask": FaceMask3D(face_mesh=StaticFaceMesh(), buffer_pool=pool),
+    }
+
+    all_passed = True
+    for name, instance in filters.items():
+        def render(index):
+            frame = preprocessor.process(camera)
+            ctx = FrameContext(frame, index=index, tracker=instance.face_mesh if hasattr(instance, "face_mesh") else None,
+                               pool=pool)
+            rendered = pool.like(frame)
+            frame = instance.apply(frame, ctx=ctx, dst=rendered)
+            ctx.update(frame)
+            ctx.rgb  # ce consumă camera virtuală
+            ctx.invalidate()
+            pool.release(rendered)
+
+        for index in range(5):  # încălzire: cache-uri, buffere, canvas-ul de trail
+            render(index)
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        for index in range(5, 15):
+            render(index)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+
+        limit = frame_bytes // 4
+        status = "✅" if peak < limit else "❌"
+        print(f"{status} {name:<12} peak {peak / 1024:8.0f} KiB (limit {limit / 1024:.0f} KiB)")
+        all_passed &= peak < limit
+
+    print()
+    return all_passed
+
+
+def main():
+    tests = [test_reuse, test_steady_state_allocations]
+    passed = sum(1 for test in tests if test())
+
+    print("=" * 60)
+    print(f"REZULTATE FINALE: {passed}/{len(tests)} teste reușite")
+    print("=" * 60)
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
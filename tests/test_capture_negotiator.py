@@ -0,0 +1,139 @@
+"""
+Test script pentru CaptureNegotiator
+Verifică alegerea formatului pe o cameră simulată: alias-uri FOURCC (YUY2 = YUYV),
+revenirea la formatul ales după un format refuzat, rezoluția coborâtă de driver și
+fallback-ul când niciun format nu are și rezoluția, și FPS-ul cerut
+"""
+import os
+import sys
+import time
+
+import cv2
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.CaptureNegotiator import CaptureNegotiator, fourcc_to_str
+
+
+class FakeCapture:
+    """
+    Cameră simulată: pentru fiecare FOURCC cerut, driverul raportează un nume (poate fi un
+    alias sau alt format, dacă îl refuză), rezoluția maximă și FPS-ul livrat de read().
+    """
+
+    def __init__(self, formats, default="MJPG"):
+        """
+        Args:
+            formats (dict): FOURCC cerut -> (FOURCC raportat, (lățime, înălțime) maximă, fps)
+        """
+        self.formats = formats
+        self.props = {cv2.CAP_PROP_FOURCC: cv2.VideoWriter_fourcc(*default)}
+
+    def mode(self):
+        requested = fourcc_to_str(self.props[cv2.CAP_PROP_FOURCC])
+        reported, (max_w, max_h), fps = self.formats[requested]
+        # Un format refuzat lasă camera în formatul raportat, cu limitele lui
+        if reported != requested and reported in self.formats:
+            _, (max_w, max_h), fps = self.formats[reported]
+        width = min(self.props.get(cv2.CAP_PROP_FRAME_WIDTH, max_w), max_w)
+        height = min(self.props.get(cv2.CAP_PROP_FRAME_HEIGHT, max_h), max_h)
+        return reported, width, height, fps
+
+    def set(self, prop, value):
+        self.props[prop] = value
+        return True
+
+    def get(self, prop):
+        reported, width, height, fps = self.mode()
+        if prop == cv2.CAP_PROP_FOURCC:
+            return cv2.VideoWriter_fourcc(*reported)
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return width
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return height
+        if prop == cv2.CAP_PROP_FPS:
+            return self.props.get(cv2.CAP_PROP_FPS, fps)
+        return self.props.get(prop, 0)
+
+    def read(self):
+        time.sleep(1.0 / self.mode()[3])
+        return True, None
+
+
+def negotiate(cap):
+    return CaptureNegotiator(cap, 1920, 1080, 30).negotiate(probe_seconds=0.3)
+
+
+def test_rejected_last_format():
+    """Ultimul format refuzat de driver nu rămâne activ: camera revine la formatul ales"""
+    print("=" * 60)
+    print("TEST 1: Format refuzat la final")
+    print("=" * 60)
+
+    cap = FakeCapture({"MJPG": ("MJPG", (1920, 1080), 30), "YUYV": ("NV12", (1920, 1080), 5),
+                       "NV12": ("NV12", (1920, 1080), 5)})
+    result = negotiate(cap)
+    active = cap.mode()[0]
+    if result["fourcc"] != "MJPG" or active != "MJPG" or len(result["candidates"]) != 1:
+        print(f"❌ Trebuia MJPG activ: ales {result['fourcc']}, camera pe {active}")
+        return False
+
+    print(f"✅ YUYV refuzat (NV12), camera readusă pe {active}")
+    print()
+    return True
+
+
+def test_alias_and_lowered_resolution():
+    """YUY2 e acceptat ca YUYV; 640x480 mai rapid nu bate 1080p care are FPS-ul cerut"""
+    print("=" * 60)
+    print("TEST 2: Alias YUY2 și rezoluție coborâtă de driver")
+    print("=" * 60)
+
+    cap = FakeCapture({"MJPG": ("MJPG", (1920, 1080), 30), "YUYV": ("YUY2", (640, 480), 60)})
+    result = negotiate(cap)
+    measured = [c["requested"] for c in result["candidates"]]
+    if measured != ["MJPG", "YUYV"]:
+        print(f"❌ YUYV (raportat YUY2) trebuia măsurat: {measured}")
+        return False
+    active = cap.mode()
+    if result["requested"] != "MJPG" or active[:3] != ("MJPG", 1920, 1080):
+        print(f"❌ Trebuia MJPG 1920x1080: ales {result['requested']}, camera pe {active[:3]}")
+        return False
+
+    print(f"✅ Măsurate {measured}, ales MJPG {result['width']}x{result['height']} "
+          f"@ {result['delivered_fps']:.1f} fps")
+    print()
+    return True
+
+
+def test_fallback_without_usable_format():
+    """Fără format cu rezoluția și FPS-ul cerute, câștigă cel mai mare FPS livrat"""
+    print("=" * 60)
+    print("TEST 3: Fallback la cel mai mare FPS")
+    print("=" * 60)
+
+    cap = FakeCapture({"MJPG": ("MJPG", (1920, 1080), 10), "YUYV": ("YUY2", (640, 480), 30)})
+    result = negotiate(cap)
+    active = cap.mode()
+    if result["requested"] != "YUYV" or result["fourcc"] != "YUY2" or active[:3] != ("YUY2", 640, 480):
+        print(f"❌ Trebuia YUYV 640x480: ales {result['requested']}, camera pe {active[:3]}")
+        return False
+
+    print(f"✅ Ales {result['fourcc']} {result['width']}x{result['height']} @ {result['delivered_fps']:.1f} fps")
+    print()
+    return True
+
+
+def main():
+    tests = [test_rejected_last_format, test_alias_and_lowered_resolution, test_fallback_without_usable_format]
+    passed = sum(1 for test in tests if test())
+
+    print("=" * 60)
+    print(f"REZULTATE FINALE: {passed}/{len(tests)} teste reușite")
+    print("=" * 60)
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Test script pentru FaceTracker cu roi_tracking
+Verifică inferența pe crop-ul feței: coordonatele mapate înapoi, recentrarea când fața
+se mută și revenirea la tot frame-ul când fața dispare
+"""
+import os
+import sys
+
+import numpy as np
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.FaceTracker import FaceTracker
+from core.LandmarkReplay import ReplayFaceLandmarks, ReplayResults, landmarks_array
+
+
+class SquareFaceMesh:
+    """Model fals care "găsește" pătratul alb din imagine; landmark-urile acoperă pătratul."""
+
+    def __init__(self):
+        grid = np.linspace(0, 1, 22)
+        self.layout = np.array([(x, y) for y in grid for x in grid][:478])
+        self.shapes = []
+
+    def process(self, rgb_frame):
+        self.shapes.append(rgb_frame.shape[:2])
+        ys, xs = np.nonzero(rgb_frame[:, :, 0])
+        if len(xs) == 0:
+            return ReplayResults([])
+        h, w = rgb_frame.shape[:2]
+        points = np.zeros((478, 3), dtype=np.float32)
+        points[:, 0] = (xs.min() + self.layout[:, 0] * (xs.max() - xs.min())) / w
+        points[:, 1] = (ys.min() + self.layout[:, 1] * (ys.max() - ys.min())) / h
+        return ReplayResults([ReplayFaceLandmarks(points)])
+
+
+def make_frame(x, y, size=120, w=1920, h=1080):
+    frame = np.zeros((h, w, 3), dtype=np.uint8)
+    if x is not None:
+        frame[y:y + size, x:x + size] = 255
+    return frame
+
+
+def test_crop_matches_full_frame():
+    """Pe crop, landmark-urile mapate înapoi trebuie să coincidă cu cele de pe tot frame-ul"""
+    print("=" * 60)
+    print("TEST 1: Inferență pe crop, coordonate identice cu frame-ul întreg")
+    print("=" * 60)
+
+    mesh = SquareFaceMesh()
+    tracker = FaceTracker(mesh, roi_tracking=True)
+    reference = FaceTracker(SquareFaceMesh())
+
+    for index, x in enumerate([800, 805, 812, 818, 830]):
+        frame = make_frame(x, 400)
+        got = landmarks_array(tracker.process(frame, frame_index=index))
+        expected = landmarks_array(reference.process(frame, frame_index=index))
+        error = np.abs((got[..., :2] - expected[..., :2]) * (1920, 1080)).max()
+        if error > 0.01:
+            print(f"❌ Frame {index}: eroare {error:.3f}px față de inferența pe tot frame-ul")
+            return False
+
+    if tracker.roi_inferences_total != 4 or any(shape != mesh.shapes[1] for shape in mesh.shapes[2:]):
+        print(f"❌ Crop-ul trebuia folosit (și ținut pe loc) după primul frame: {mesh.shapes}")
+        return False
+    ratio = reference.inference_pixels_total / tracker.inference_pixels_total
+    print(f"✅ Crop {mesh.shapes[1][1]}x{mesh.shapes[1][0]}, de {ratio:.1f}x mai puțini pixeli")
+    print()
+    return True
+
+
+def test_recenter_and_fallback():
+    """Crop-ul se mută după față, iar când fața dispare se caută din nou pe tot frame-ul"""
+    print("=" * 60)
+    print("TEST 2: Recentrare și revenire la tot frame-ul")
+    print("=" * 60)
+
+    tracker = FaceTracker(SquareFaceMesh(), roi_tracking=True)
+    tracker.process(make_frame(800, 400), frame_index=0)
+    first_roi = tracker.roi
+
+    results = tracker.process(make_frame(1400, 600), frame_index=1)  # sare în afara crop-ului
+    if tracker.roi_fallbacks_total != 1 or landmarks_array(results) is None:
+        print("❌ Fața ieșită din crop trebuia găsită pe tot frame-ul")
+        return False
+    if tracker.roi == first_roi or not (tracker.roi[0] <= 1400 and 1520 <= tracker.roi[2]):
+        print(f"❌ Crop-ul nu s-a mutat pe față: {tracker.roi}")
+        return False
+    moved_roi = tracker.roi
+
+    if tracker.process(make_frame(None, None), frame_index=2).multi_face_landmarks:
+        print("❌ Fără față nu trebuie returnate landmarks")
+        return False
+    if tracker.roi is not None:
+        print("❌ Crop-ul trebuia uitat când fața s-a pierdut")
+        return False
+
+    print(f"✅ Crop mutat la {moved_roi}, {tracker.roi_fallbacks_total} căutări pe tot frame-ul")
+    print()
+    return True
+
+
+def main():
+    tests = [test_crop_matches_full_frame, test_recenter_and_fallback]
+    passed = sum(1 for test in tests if test())
+
+    print("=" * 60)
+    print(f"REZULTATE FINALE: {passed}/{len(tests)} teste reușite")
+    print("=" * 60)
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Test script pentru descoperirea filtrelor (core.FilterPlugin)
+Verifică citirea declarațiilor PLUGIN fără importul modulelor, valorile implicite,
+sărirea pluginurilor invalide și a celor cu assets lipsă
+"""
+import os
+import sys
+import tempfile
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.FilterPlugin import DEFAULT_REQUIREMENTS, discover_filters
+from core.FilterRegistry import LazyFilter
+
+PLUGIN_SOURCE = '''
+raise RuntimeError("modulul nu trebuie importat la descoperire")
+
+
+class GlowFilter:
+    PLUGIN = {"name": "Glow", "tokens": 77, "duration": 5, "assets": ("missing_glow.png",)}
+
+    def apply(self, frame, ctx=None, dst=None):
+        return frame
+'''
+
+
+def test_builtin_filters():
+    """Filtrele din filters/ se descoperă fără să fie importate (nici mediapipe)"""
+    print("=" * 60)
+    print("TEST 1: Filtrele incluse, fără import")
+    print("=" * 60)
+
+    before = set(sys.modules)
+    filters = discover_filters(group=None)
+    imported = [name for name in set(sys.modules) - before if name.startswith(("filters", "mediapipe"))]
+
+    if imported:
+        print(f"❌ Descoperirea a importat: {imported}")
+        return False
+    names = {tokens: plugin["name"] for tokens, plugin in filters.items()}
+    if names != {33: "Sparkles", 50: "Rabbit Ears", 99: "Big Eyes", 200: "Cyber Mask"}:
+        print(f"❌ Filtre greșite: {names}")
+        return False
+    if filters[33]["landmarks"] or not filters[99]["landmarks"] or filters[50]["assets"] != ("rabbit_ears.png",):
+        print("❌ Cerințele declarate nu au fost citite")
+        return False
+
+    print(f"✅ {len(filters)} filtre: " + ", ".join(f"{p['name']} ({p['layer']}, {p['cost_ms']}ms)"
+                                               for p in filters.values()))
+    print()
+    return True
+
+
+def test_external_plugins():
+    """Un plugin valid primește valorile implicite; cele invalide sau duplicate sunt sărite"""
+    print("=" * 60)
+    print("TEST 2: Pluginuri externe, invalide și assets lipsă")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = os.path.join(tmp, "extra_filters")
+        os.makedirs(directory)
+        with open(os.path.join(directory, "GlowFilter.py"), "w") as f:
+            f.write(PLUGIN_SOURCE)
+        with open(os.path.join(directory, "BrokenFilter.py"), "w") as f:
+            f.write('class Broken:\n    PLUGIN = {"name": "Broken", "duration": 5}\n')
+        with open(os.path.join(directory, "SecondGlowFilter.py"), "w") as f:
+            f.write('class Copy:\n    PLUGIN = {"name": "Copy", "tokens": 77, "duration": 5}\n')
+
+        filters = discover_filters(directory, group=None)
+
+    glow = filters.get(77)
+    if list(filters) != [77] or glow["name"] != "Glow" or glow["module"] != "extra_filters.GlowFilter":
+        print(f"❌ Trebuia găsit doar Glow: {filters}")
+        return False
+    if any(glow[key] != value for key, value in DEFAULT_REQUIREMENTS.items() if key != "assets"):
+        print(f"❌ Valorile implicite lipsesc: {glow}")
+        return False
+
+    lazy = LazyFilter(glow)
+    if lazy.load() is not None or not lazy.failed:
+        print("❌ Un filtru fără assets nu trebuie încărcat")
+        return False
+
+    print("✅ Glow găsit (cu valori implicite), Broken și duplicatul sărite, assets lipsă detectate înainte de import")
+    print()
+    return True
+
+
+def main():
+    tests = [test_builtin_filters, test_external_plugins]
+    passed = sum(1 for test in tests if test())
+
+    print("=" * 60)
+    print(f"REZULTATE FINALE: {passed}/{len(tests)} teste reușite")
+    print("=" * 60)
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
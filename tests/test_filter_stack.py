@@ -0,0 +1,138 @@
+"""
+Test script pentru FilterStack
+Verifică pornirea mai multor filtre simultan sub plafonul de cost, timer-ele separate,
+ordinea layer-elor și faptul că landmark-urile se calculează o dată, pe captură
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.FilterStack import FilterStack
+from core.FrameContext import FrameContext
+
+
+class FakeFilter:
+    """Filtru care își notează ordinea, scrie valoarea lui în dst și durează `seconds`."""
+
+    loaded = True
+
+    def __init__(self, value, seconds=0.0, log=None):
+        self.value = value
+        self.seconds = seconds
+        self.log = log if log is not None else []
+
+    def apply(self, frame, ctx=None, dst=None):
+        ctx.landmarks
+        self.log.append(self.value)
+        time.sleep(self.seconds)
+        dst[:] = frame
+        dst[0, 0] = self.value
+        return dst
+
+
+def item(name, instance, duration, layer, cost=0.0):
+    return {"name": name, "user": "Test", "duration": duration, "instance": instance, "layer": layer,
+            "landmarks": True, "in_place": True, "cost": cost}
+
+
+def test_concurrent_admission():
+    """Filtrele ieftine rulează împreună, cel scump așteaptă loc sub plafon"""
+    print("=" * 60)
+    print("TEST 1: Filtre simultane, timer-e separate, plafon de cost")
+    print("=" * 60)
+
+    stack = FilterStack(max_cost=0.010)
+    stack.costs = {"Big Eyes": 0.006, "Sparkles": 0.001, "Cyber Mask": 0.008}
+    big_eyes, sparkles, mask = FakeFilter(1), FakeFilter(2), FakeFilter(3)
+
+    stack.push(item("Big Eyes", big_eyes, 20, "warp"))
+    stack.push(item("Sparkles", sparkles, 10, "particles"))
+    stack.push(item("Cyber Mask", mask, 30, "mesh"))
+    stack.push(item("Sparkles", sparkles, 10, "particles"))
+    started = stack.update(now=0)
+
+    names = [entry["name"] for entry in stack.active]
+    if names != ["Big Eyes", "Sparkles"] or len(started) != 2 or len(stack.queue) != 2:
+        print(f"❌ Trebuiau să ruleze Big Eyes + Sparkles, cu masca în coadă: {names}")
+        return False
+
+    started = stack.update(now=10.5)  # Sparkles a expirat, Big Eyes încă rulează
+    if [entry["name"] for entry in stack.active] != ["Big Eyes"] or started:
+        print("❌ Masca nu încape lângă Big Eyes; Sparkles din spatele ei trebuie să aștepte (FIFO)")
+        return False
+
+    started = stack.update(now=20.5)
+    names = [entry["name"] for entry in stack.active]
+    if names != ["Cyber Mask", "Sparkles"] or stack.queue:
+        print(f"❌ După Big Eyes trebuiau să pornească masca și Sparkles: {names}")
+        return False
+
+    stack.push(item("Sparkles", sparkles, 10, "particles"))
+    stack.update(now=21)
+    entry = stack.active[1]
+    if len(stack.active) != 2 or entry["end_time"] != 40.5 or entry["duration"] != 20:
+        print(f"❌ Un tip pentru un filtru activ trebuie să-i prelungească timer-ul: {entry}")
+        return False
+
+    print(f"✅ Activ: {names}, Sparkles prelungit până la t={entry['end_time']}")
+    print()
+    return True
+
+
+def test_layered_render():
+    """Filtrele se aplică în ordinea layer-elor, pe același buffer, cu o singură inferență"""
+    print("=" * 60)
+    print("TEST 2: Randare în ordinea layer-elor")
+    print("=" * 60)
+
+    log, seen = [], []
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    frame[10, 10] = 7
+
+    def process(rgb):
+        seen.append(rgb.copy())
+        return None
+    tracker = type("Tracker", (), {"process": staticmethod(process)})()
+
+    stack = FilterStack()
+    stack.push(item("Sparkles", FakeFilter(2, 0.002, log), 10, "particles"))
+    stack.push(item("Big Eyes", FakeFilter(1, 0.004, log), 10, "warp"))
+    stack.push(item("Rabbit Ears", FakeFilter(4, 0.001, log), 10, "stickers"))
+    stack.update(now=0)
+
+    dst = np.empty_like(frame)
+    output = stack.render(frame, FrameContext(frame, tracker=tracker), dst)
+
+    if log != [1, 4, 2] or output is not dst or output[0, 0, 0] != 2 or output[10, 10, 0] != 7:
+        print(f"❌ Ordine {log}, trebuia warp -> stickers -> particles în același buffer")
+        return False
+    if len(seen) != 1 or seen[0][0, 0, 0] != 0:
+        print(f"❌ {len(seen)} inferențe; landmark-urile trebuie calculate o dată, pe captură")
+        return False
+    if not stack.costs["Big Eyes"] > stack.costs["Rabbit Ears"] > 0:
+        print(f"❌ Costurile per filtru nu au fost măsurate: {stack.costs}")
+        return False
+
+    costs = ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in stack.costs.items())
+    print(f"✅ Ordine {log}, o inferență, cost estimat {stack.estimated_cost() * 1000:.1f}ms ({costs})")
+    print()
+    return True
+
+
+def main():
+    tests = [test_concurrent_admission, test_layered_render]
+    passed = sum(1 for test in tests if test())
+
+    print("=" * 60)
+    print(f"REZULTATE FINALE: {passed}/{len(tests)} teste reușite")
+    print("=" * 60)
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Test script pentru LandmarkRecorder / ReplayFaceMesh
+Verifică round-trip-ul landmarks și randarea filtrelor fără inferență MediaPipe
+"""
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.FrameContext import FrameContext
+from core.LandmarkReplay import LandmarkRecorder, ReplayFaceMesh
+
+
+def make_results(offset, n_faces=1, n_points=478):
+    """Creează un rezultat FaceMesh fals cu o față centrată în frame."""
+    rng = np.random.default_rng(offset)
+    faces = []
+    for _ in range(n_faces):
+        points = 0.3 + 0.4 * rng.random((n_points, 3))
+        landmark = [SimpleNamespace(x=x, y=y, z=z) for x, y, z in points]
+        faces.append(SimpleNamespace(landmark=landmark))
+    return SimpleNamespace(multi_face_landmarks=faces or None)
+
+
+def test_round_trip():
+    """Landmarks înregistrate trebuie redate identic (float32), inclusiv frame-urile fără față"""
+    print("=" * 60)
+    print("TEST 1: Round-trip LandmarkRecorder -> ReplayFaceMesh")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.npz")
+        recorder = LandmarkRecorder(path, max_faces=2)
+        recorded = [make_results(0, 0), make_results(1, 1), make_results(2, 2), make_results(3, 1)]
+        for results in recorded:
+            recorder.add(results)
+        recorder.save()
+
+        replay = ReplayFaceMesh(path, loop=True)
+        if len(replay) != len(recorded):
+            print(f"❌ Expected {len(recorded)} frames, got {len(replay)}")
+            return False
+
+        for i, expected in enumerate(recorded + recorded[:1]):  # ultimul verifică loop-ul
+            got = replay.process()
+            expected_faces = expected.multi_face_landmarks or []
+            got_faces = got.multi_face_landmarks or []
+            if len(got_faces) != len(expected_faces):
+                print(f"❌ Frame {i}: expected {len(expected_faces)} faces, got {len(got_faces)}")
+                return False
+            for e, g in zip(expected_faces, got_faces):
+                for idx in (0, 10, 234, 454, 468, 477):
+                    if abs(e.landmark[idx].x - g.landmark[idx].x) > 1e-6 or abs(e.landmark[idx].y - g.landmark[idx].y) > 1e-6:
+                        print(f"❌ Frame {i}: landmark {idx} differs")
+                        return False
+
+    print("✅ Landmarks redate identic, loop-ul funcționează")
+    print()
+    return True
+
+
+def test_filter_with_replay():
+    """RabbitEarsFilter trebuie să randeze urechile folosind landmarks redate"""
+    print("=" * 60)
+    print("TEST 2: RabbitEarsFilter cu ReplayFaceMesh")
+    print("=" * 60)
+
+    try:
+        from filters.RabbitEarsFilter import RabbitEarsFilter
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.npz")
+        recorder = LandmarkRecorder(path)
+        points = np.full((478, 3), 0.5)
+        points[10] = (0.5, 0.4, 0)    # forehead
+        points[234] = (0.4, 0.5, 0)   # left temple
+        points[454] = (0.6, 0.5, 0)   # right temple
+        landmark = [SimpleNamespace(x=x, y=y, z=z) for x, y, z in points]
+        recorder.add(SimpleNamespace(multi_face_landmarks=[SimpleNamespace(landmark=landmark)]))
+        recorder.save()
+
+        rabbit_filter = RabbitEarsFilter(face_mesh=ReplayFaceMesh(path))
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        output = rabbit_filter.apply(frame)
+
+    if not output.any():
+        print("❌ Urechile nu au fost desenate")
+        return False
+
+    print("✅ Filtrul a randat urechile fără inferență MediaPipe")
+    print()
+    return True
+
+
+def test_context_arrays():
+    """FrameContext convertește landmarks o singură dată în array-uri (normalizate și în pixeli)"""
+    print("=" * 60)
+    print("TEST 3: FrameContext.landmark_points / landmark_pixels")
+    print("=" * 60)
+
+    results = make_results(4, n_faces=2)
+    tracker = SimpleNamespace(calls=0)
+
+    def process(rgb):
+        tracker.calls += 1
+        return results
+    tracker.process = process
+
+    h, w = 720, 1280
+    ctx = FrameContext(np.zeros((h, w, 3), dtype=np.uint8), tracker=tracker)
+    points, pixels = ctx.landmark_points, ctx.landmark_pixels
+    ctx.landmark_pixels
+
+    if points.shape != (2, 478, 3) or points.dtype != np.float32 or tracker.calls != 1:
+        print(f"❌ Array greșit: {points.shape} {points.dtype}, {tracker.calls} inferențe")
+        return False
+    # Fețele din array-uri sunt în ordinea priorității, face_order le leagă de rezultatul modelului
+    for f, face in enumerate(results.multi_face_landmarks[i] for i in ctx.face_order):
+        for idx in (0, 10, 234, 454, 468, 477):
+            lm = face.landmark[idx]
+            expected = (int(lm.x * w), int(lm.y * h))
+            got = tuple(int(v) for v in pixels[f, idx])
+            if got != expected:
+                print(f"❌ Fața {f}, punctul {idx}: {got} în loc de {expected}")
+                return False
+
+    x1, y1, x2, y2 = ctx.face_bbox
+    if not (x1 <= pixels[0, :, 0].min() and pixels[0, :, 0].max() <= x2 and y1 <= pixels[0, :, 1].min()):
+        print(f"❌ face_bbox {ctx.face_bbox} nu cuprinde fața")
+        return False
+
+    empty = FrameContext(np.zeros((h, w, 3), dtype=np.uint8),
+                         tracker=SimpleNamespace(process=lambda rgb: make_results(0, n_faces=0)))
+    if empty.landmark_points is not None or empty.landmark_pixels is not None:
+        print("❌ Fără fețe, array-urile trebuie să fie None")
+        return False
+
+    print("✅ Pixeli identici cu int(landmark.x * w), o singură inferență per frame")
+    print()
+    return True
+
+
+def main():
+    tests = [test_round_trip, test_filter_with_replay, test_context_arrays]
+    passed = sum(1 for test in tests if test())
+
+    print("=" * 60)
+    print(f"REZULTATE FINALE: {passed}/{len(tests)} teste reușite")
+    print("=" * 60)
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
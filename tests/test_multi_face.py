@@ -0,0 +1,146 @@
+"""
+Test script pentru mai multe fețe
+Verifică ordinea priorității din FrameContext, bugetul per față (FaceBudget) și
+căutarea periodică pe tot frame-ul care găsește o față nouă apărută în afara crop-ului
+"""
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.FaceBudget import FaceBudget
+from core.FaceTracker import FaceTracker
+from core.FrameContext import FrameContext
+from core.LandmarkReplay import ReplayFaceLandmarks, ReplayResults
+
+
+class SquaresFaceMesh:
+    """Model fals: fiecare pătrat alb e o "față" (cel mult max_faces, în ordinea etichetelor)."""
+
+    def __init__(self, max_faces=2):
+        self.max_faces = max_faces
+        grid = np.linspace(0, 1, 22)
+        self.layout = np.array([(x, y) for y in grid for x in grid][:478])
+
+    def process(self, rgb_frame):
+        h, w = rgb_frame.shape[:2]
+        count, _, boxes, _ = cv2.connectedComponentsWithStats(rgb_frame[:, :, 0])
+        faces = []
+        for x, y, bw, bh, _ in boxes[1:count][:self.max_faces]:
+            points = np.zeros((478, 3), dtype=np.float32)
+            points[:, 0] = (x + self.layout[:, 0] * (bw - 1)) / w
+            points[:, 1] = (y + self.layout[:, 1] * (bh - 1)) / h
+            faces.append(ReplayFaceLandmarks(points))
+        return ReplayResults(faces)
+
+
+def make_frame(squares, w=1920, h=1080):
+    frame = np.zeros((h, w, 3), dtype=np.uint8)
+    for x, y, size in squares:
+        frame[y:y + size, x:x + size] = 255
+    return frame
+
+
+def test_priority_order():
+    """Fața mare și centrală e prima în array-uri, indiferent de ordinea modelului"""
+    print("=" * 60)
+    print("TEST 1: Ordinea fețelor după mărime și poziție")
+    print("=" * 60)
+
+    # Modelul le dă de sus în jos: mică în colț, mare în centru, mare la margine
+    frame = make_frame([(40, 40, 100), (860, 400, 200), (1700, 420, 200)])
+    ctx = FrameContext(frame, tracker=SquaresFaceMesh(max_faces=3))
+
+    if ctx.face_order.tolist() != [1, 2, 0]:
+        print(f"❌ Ordine greșită: {ctx.face_order.tolist()}")
+        return False
+    x1, y1, x2, y2 = ctx.face_bbox
+    if abs(x1 - 860) > 1 or abs(y1 - 400) > 1:
+        print(f"❌ face_bbox trebuia să fie fața principală: {ctx.face_bbox}")
+        return False
+
+    print(f"✅ Ordine {ctx.face_order.tolist()}, fața principală la {ctx.face_bbox}")
+    print()
+    return True
+
+
+def test_budget_skips_secondary():
+    """Fața principală se randează mereu, cele secundare doar cât încap în buget"""
+    print("=" * 60)
+    print("TEST 2: FaceBudget")
+    print("=" * 60)
+
+    budget = FaceBudget(seconds=0.05)
+    for _ in range(3):
+        rendered = []
+        for rank in budget.faces(4):
+            time.sleep(0.02)
+            rendered.append(rank)
+
+    if rendered != [0, 1]:
+        print(f"❌ Cu 20ms per față și 50ms buget trebuiau randate 2 fețe, nu {rendered}")
+        return False
+    if budget.skipped_total != 6 or set(budget.costs) != {0, 1}:
+        print(f"❌ Contoare greșite: {budget.skipped_total} sărite, costuri {budget.costs}")
+        return False
+
+    budget.seconds = 0.001
+    if list(budget.faces(3)) != [0]:
+        print("❌ Fața principală trebuie randată chiar și peste buget")
+        return False
+
+    costs = ", ".join(f"fața {rank}: {seconds * 1000:.1f}ms" for rank, seconds in budget.costs.items())
+    print(f"✅ {budget.rendered_total} fețe randate, {budget.skipped_total} sărite ({costs})")
+    print()
+    return True
+
+
+def test_rescan_finds_new_face():
+    """Cu roi_tracking și loc pentru încă o față, tot frame-ul se recitește periodic"""
+    print("=" * 60)
+    print("TEST 3: Față nouă în afara crop-ului")
+    print("=" * 60)
+
+    tracker = FaceTracker(SquaresFaceMesh(max_faces=2), roi_tracking=True, max_faces=2, roi_rescan=5)
+    tracker.process(make_frame([(800, 400, 120)]), frame_index=0)
+    if tracker.roi is None:
+        print("❌ Crop-ul trebuia pornit pe prima față")
+        return False
+
+    found = None
+    for index in range(1, 12):
+        results = tracker.process(make_frame([(800, 400, 120), (1200, 300, 120)]), frame_index=index)
+        if len(results.multi_face_landmarks or []) == 2:
+            found = index
+            break
+
+    if found is None or tracker.roi_rescans_total != 1:
+        print(f"❌ A doua față nu a fost găsită ({tracker.roi_rescans_total} căutări pe tot frame-ul)")
+        return False
+    x1, y1, x2, y2 = tracker.roi or (0, 0, 0, 0)
+    if not (x1 <= 800 and 1320 <= x2 and y1 <= 300 and 520 <= y2):
+        print(f"❌ Crop-ul trebuia să cuprindă ambele fețe: {tracker.roi}")
+        return False
+
+    print(f"✅ A doua față găsită la frame-ul {found}, crop {tracker.roi}")
+    print()
+    return True
+
+
+def main():
+    tests = [test_priority_order, test_budget_skips_secondary, test_rescan_finds_new_face]
+    passed = sum(1 for test in tests if test())
+
+    print("=" * 60)
+    print(f"REZULTATE FINALE: {passed}/{len(tests)} teste reușite")
+    print("=" * 60)
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Test script pentru StickerFilter
+Verifică manifestul (un tier per sticker), atlasul comun, compunerea stickerelor active
+într-o singură trecere și rotirea după linia ochilor
+"""
+import json
+import os
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.AssetCache import AssetCache
+from core.FilterPlugin import discover_filters
+from core.FilterStack import FilterStack
+from core.FrameContext import FrameContext
+from core.LandmarkReplay import ReplayFaceLandmarks, ReplayResults
+
+
+class TiltedFaceMesh:
+    """O față sintetică, cu linia ochilor înclinată cu `angle` grade."""
+
+    def __init__(self, angle=0.0):
+        points = np.full((478, 3), 0.5, dtype=np.float32)
+        radians = np.radians(angle)
+        for index, side in ((468, -1), (473, 1), (234, -2), (454, 2)):
+            points[index, :2] = (0.5 + side * 0.05 * np.cos(radians), 0.5 + side * 0.05 * np.sin(radians) * 640 / 480)
+        self.results = ReplayResults([ReplayFaceLandmarks(points)])
+
+    def process(self, rgb_frame=None):
+        return self.results
+
+
+def write_manifest(directory):
+    """Două stickere pătrate opace (roșu, albastru); albastrul se rotește după ochi."""
+    stickers = []
+    for name, color, offset, rotate in (("Red", (0, 0, 255), [0, -1], False), ("Blue", (255, 0, 0), [0, 1], True)):
+        image = np.zeros((40, 40, 4), dtype=np.uint8)
+        image[:] = color + (255,)
+        cv2.imwrite(os.path.join(directory, f"{name}.png"), image)
+        stickers.append({"name": name, "tokens": len(stickers) + 1, "duration": 5, "image": f"{name}.png",
+                         "anchor": [468, 473], "scale_reference": [234, 454], "width": 0.5,
+                         "offset": offset, "rotate": rotate})
+    path = os.path.join(directory, "stickers.json")
+    with open(path, "w") as f:
+        json.dump({"stickers": stickers}, f)
+    return path
+
+
+def test_manifest_tiers():
+    """Fiecare sticker din manifest e un tier; toate împart clasa StickerFilter"""
+    print("=" * 60)
+    print("TEST 1: Tier-uri din manifest")
+    print("=" * 60)
+
+    ears = discover_filters(group=None).get(50)
+    if ears is None or ears["class"] != "StickerFilter" or ears["variant"] != "Rabbit Ears" \
+            or ears["group"] != "Stickers" or ears["duration"] != 15 or 10 not in ears["landmarks"]:
+        print(f"❌ Rabbit Ears trebuia citit din assets/stickers.json: {ears}")
+        return False
+
+    print(f"✅ {ears['name']}: {ears['tokens']} tokens, {ears['duration']}s, landmarks {ears['landmarks']}")
+    print()
+    return True
+
+
+def test_single_pass():
+    """Stickerele active se compun dintr-un singur atlas, într-un apel, cu rotirea după ochi"""
+    print("=" * 60)
+    print("TEST 2: Atlas comun și o singură trecere")
+    print("=" * 60)
+
+    from filters.StickerFilter import StickerFilter
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp:
+        sticker_filter = StickerFilter(face_mesh=TiltedFaceMesh(30), manifest=write_manifest(tmp),
+                                       assets=AssetCache(tmp))
+
+    atlas = sticker_filter.atlas
+    if atlas.image("Red").base is not atlas.texture or atlas.image("Blue")[0, 0, 0] != 255:
+        print("❌ Stickerele trebuie să fie view-uri în aceeași textură")
+        return False
+
+    calls = []
+    original_apply = sticker_filter.apply
+
+    def apply(frame, ctx=None, dst=None, variants=None):
+        calls.append(variants)
+        return original_apply(frame, ctx=ctx, dst=dst, variants=variants)
+    sticker_filter.apply = apply
+
+    stack = FilterStack()
+    for name in ("Red", "Blue"):
+        stack.push({"name": name, "user": "Test", "duration": 5, "instance": sticker_filter, "layer": "stickers",
+                    "landmarks": True, "in_place": True, "cost": 0.001, "variant": name})
+    stack.update(now=0)
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    output = stack.render(frame, FrameContext(frame, tracker=sticker_filter.face_mesh), frame.copy())
+
+    if calls != [["Red", "Blue"]]:
+        print(f"❌ Trebuia un singur apel cu ambele variante: {calls}")
+        return False
+    red = np.argwhere(output[:, :, 2] > 200)
+    blue = np.argwhere(output[:, :, 0] > 200)
+    if not len(red) or not len(blue) or red[:, 0].mean() >= blue[:, 0].mean():
+        print("❌ Roșul (offset în sus) și albastrul (offset în jos) trebuiau desenate amândouă")
+        return False
+
+    # Pătratul neînclinat are cutia egală cu latura; cel rotit cu ~30° are cutia mai mare
+    red_box = red.max(axis=0) - red.min(axis=0)
+    blue_box = blue.max(axis=0) - blue.min(axis=0)
+    if not blue_box[0] > red_box[0] * 1.2:
+        print(f"❌ Albastrul nu a fost rotit după ochi (cutii {red_box} vs {blue_box})")
+        return False
+
+    print(f"✅ Un apel pentru {calls[0]}, atlas {atlas.texture.shape[1]}x{atlas.texture.shape[0]}, "
+          f"cutie roșie {red_box.tolist()}, albastră (rotită) {blue_box.tolist()}")
+    print()
+    return True
+
+
+def main():
+    tests = [test_manifest_tiers, test_single_pass]
+    passed = sum(1 for test in tests if test())
+
+    print("=" * 60)
+    print(f"REZULTATE FINALE: {passed}/{len(tests)} teste reușite")
+    print("=" * 60)
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Test script pentru WarpField
+Verifică deformările locale (shift, bulge), că pixelii din afara cutiilor rămân neatinși
+și că filtrele warp din FilterStack împart un singur câmp, aplicat o dată
+"""
+import os
+import sys
+
+import numpy as np
+
+# Adaugă path-ul proiectului
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.FilterStack import FilterStack
+from core.FrameContext import FrameContext
+from core.WarpField import WarpField
+
+
+def noise_frame():
+    return np.random.default_rng(0).integers(0, 255, (240, 320, 3), dtype=np.uint8)
+
+
+class FakeWarpFilter:
+    """Filtru warp care adaugă o deformare în ctx.warp (sau își face singur remap-ul)."""
+
+    loaded = True
+
+    def __init__(self, add, log):
+        self.add = add
+        self.log = log
+
+    def apply(self, frame, ctx=None, dst=None):
+        self.log.append(ctx.warp)
+        np.copyto(dst, frame)
+        field = ctx.warp if ctx.warp is not None else WarpField()
+        self.add(field)
+        if ctx.warp is None:
+            field.apply(dst)
+        return dst
+
+
+def test_local_deformations():
+    """Shift-ul mută conținutul cu vectorul dat; în afara cutiilor frame-ul rămâne identic"""
+    print("=" * 60)
+    print("TEST 1: Deformări locale")
+    print("=" * 60)
+
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    frame[100, 90] = 255  # Punctul de la centru - vector ajunge în centru
+    field = WarpField()
+    field.shift((100, 100), 30, (10, 0))
+    field.apply(frame)
+    moved = np.argwhere(frame[:, :, 0] == frame[:, :, 0].max())[0].tolist()
+    if abs(moved[1] - 100) > 1 or moved[0] != 100 or len(field):
+        print(f"❌ Punctul trebuia mutat în (100, 100), e în {moved[::-1]}")
+        return False
+
+    original = noise_frame()
+    frame = original.copy()
+    field.bulge((60, 60), 20, 0.4)
+    field.pinch((250, 180), 20, 0.4)
+    field.apply(frame)
+    changed = np.argwhere(np.any(frame != original, axis=2))
+    inside = ((abs(changed[:, 1] - 60) <= 21) & (abs(changed[:, 0] - 60) <= 21)) | \
+             ((abs(changed[:, 1] - 250) <= 21) & (abs(changed[:, 0] - 180) <= 21))
+    if not len(changed) or not inside.all():
+        print(f"❌ {int((~inside).sum())} pixeli modificați în afara cutiilor")
+        return False
+
+    print(f"✅ Shift corect, {len(changed)} pixeli modificați, toți în cele două cutii")
+    print()
+    return True
+
+
+def test_shared_field():
+    """Două filtre warp din stivă își adună deformările și se aplică un singur câmp"""
+    print("=" * 60)
+    print("TEST 2: Câmp comun în FilterStack")
+    print("=" * 60)
+
+    log = []
+    stack = FilterStack()
+    for name, add in (("Big Eyes", lambda field: field.bulge((100, 100), 40, 0.4)),
+                      ("Slim Face", lambda field: field.slim((130, 100), (100, 100), 30, 0.2))):
+        stack.push({"name": name, "user": "Test", "duration": 10, "instance": FakeWarpFilter(add, log),
+                    "layer": "warp", "landmarks": False, "in_place": True, "cost": 0.001})
+    stack.update(now=0)
+
+    frame = noise_frame()
+    ctx = FrameContext(frame)
+    output = stack.render(frame, ctx, frame.copy())
+
+    expected = noise_frame()
+    field = WarpField()
+    field.bulge((100, 100), 40, 0.4)
+    field.slim((130, 100), (100, 100), 30, 0.2)
+    field.apply(expected)
+
+    if len(log) != 2 or log[0] is None or log[0] is not log[1] or ctx.warp is not None:
+        print(f"❌ Filtrele trebuiau să primească același câmp: {log}")
+        return False
+    if not np.array_equal(output, expected):
+        print("❌ Rezultatul diferă de aplicarea ambelor deformări într-un singur câmp")
+        return False
+
+    print("✅ Un câmp comun, aplicat o dată după ultimul filtru warp")
+    print()
+    return True
+
+
+def test_chained_clusters():
+    """Cutiile legate doar prin cutia unui grup deja unit ajung tot în același grup"""
+    print("=" * 60)
+    print("TEST 3: Grupuri de cutii suprapuse")
+    print("=" * 60)
+
+    # A treia cutie le atinge pe amândouă; grupul (1, 2) crește peste prima cutie, verificată deja
+    clusters = WarpField._clusters([(0, 0, 10, 10), (5, 20, 15, 30), (12, 5, 20, 25)])
+    if clusters != [([0, 1, 2], (0, 0, 20, 30))]:
+        print(f"❌ Trebuia un singur grup [0, 1, 2] cu cutia (0, 0, 20, 30): {clusters}")
+        return False
+
+    clusters = WarpField._clusters([(0, 0, 10, 10), (20, 20, 30, 30), (5, 5, 12, 12)])
+    if clusters != [([0, 2], (0, 0, 12, 12)), ([1], (20, 20, 30, 30))]:
+        print(f"❌ Cutia (20, 20, 30, 30) trebuia să rămână separată: {clusters}")
+        return False
+
+    print(f"✅ {clusters}")
+    print()
+    return True
+
+
+def main():
+    tests = [test_local_deformations, test_shared_field, test_chained_clusters]
+    passed = sum(1 for test in tests if test())
+
+    print("=" * 60)
+    print(f"REZULTATE FINALE: {passed}/{len(tests)} teste reușite")
+    print("=" * 60)
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())